@@ -0,0 +1,19 @@
+# benchmarks/__init__.py
+"""
+Замеры производительности Table и функций io_*.
+
+Запуск из корня проекта:
+    python -m benchmarks --rows 100000 --cols 10 --mix int=2,float=2,str=1,bool=1 --nulls 0.05 \
+        --output results.json
+    python -m benchmarks --output new.json --baseline results.json --threshold 0.2
+
+Данные генерируются синтетически (data.py), замеры описаны в cases.py,
+запуск, JSON-отчёт и сравнение с базовым отчётом — в __main__.py.
+"""
+import os
+import sys
+
+# The measured modules live in the project root next to this package
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
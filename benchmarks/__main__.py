@@ -0,0 +1,183 @@
+# benchmarks/__main__.py
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import vectorized
+from benchmarks.cases import CASES, Bench, Workload
+from benchmarks.data import DEFAULT_MIX, make_data, parse_mix
+
+# A case is a regression when it is this much slower (or uses this much more memory) than the baseline
+DEFAULT_THRESHOLD = 0.2
+
+
+def measure(bench: Bench, repeat: int, n_rows: int, memory: bool = True) -> Dict[str, Any]:
+    """
+    Время run лучшего из repeat повторов (и среднее), пропускная способность в строках
+    в секунду и, если memory, пик памяти Python за отдельный повтор под tracemalloc.
+    """
+    setup, run = bench
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+        del state
+    best = min(times)
+    result = {
+        'seconds': best,
+        'mean_seconds': sum(times) / len(times),
+        'rows_per_second': n_rows / best if best > 0 else None,
+    }
+    if memory:
+        # tracemalloc slows allocations down, so memory is measured apart from the timing
+        state = setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(state)
+            result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_cases(config: Dict[str, Any], names: List[str], memory: bool = True, verbose: bool = True) -> Dict[str, Any]:
+    """
+    Выполняет замеры names на данных по config и возвращает отчёт:
+    {'config': ..., 'environment': ..., 'results': {имя: замер или {'skipped': причина}}}.
+    """
+    columns, types, data = make_data(config['rows'], config['cols'], parse_mix(config['mix']),
+                                     config['nulls'], config['seed'])
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix='table-bench-') as tmp_dir:
+        workload = Workload(columns, types, data, config['columnar'], tmp_dir)
+        del data
+        for name in names:
+            bench = CASES[name](workload)
+            if bench is None:
+                results[name] = {'skipped': 'workload has no suitable columns'}
+            else:
+                results[name] = measure(bench, config['repeat'], workload.n_rows, memory)
+            del bench
+            if verbose:
+                print(_format_result(name, results[name]), file=sys.stderr)
+    return {
+        'config': config,
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'numpy': vectorized.available(),
+        },
+        'results': results,
+    }
+
+
+def _format_result(name: str, result: Dict[str, Any]) -> str:
+    if 'skipped' in result:
+        return f"{name:<26} skipped: {result['skipped']}"
+    line = f"{name:<26} {result['seconds']:10.4f} s"
+    if result['rows_per_second'] is not None:
+        line += f" {result['rows_per_second']:14,.0f} rows/s"
+    if 'peak_mb' in result:
+        line += f" {result['peak_mb']:10.1f} MB"
+    return line
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Сравнивает отчёт с базовым: печатает отношение времени и памяти по каждому
+    замеру, который есть в обоих, и возвращает описания регрессий — замеров,
+    где время или пик памяти больше базового более чем в (1 + threshold) раз.
+    """
+    regressions = []
+    if report['config'] != baseline.get('config'):
+        print(f"Warning: baseline config {baseline.get('config')} differs from {report['config']}")
+    print(f"{'case':<26} {'baseline s':>10} {'current s':>10} {'time':>7} {'memory':>7}")
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None or 'skipped' in result or 'skipped' in base:
+            continue
+        time_ratio = result['seconds'] / base['seconds'] if base['seconds'] > 0 else 1.0
+        memory_ratio = _ratio(result.get('peak_mb'), base.get('peak_mb'))
+        marks = []
+        if time_ratio > 1 + threshold:
+            marks.append(f"time x{time_ratio:.2f}")
+        if memory_ratio is not None and memory_ratio > 1 + threshold:
+            marks.append(f"memory x{memory_ratio:.2f}")
+        memory_text = f"{memory_ratio:7.2f}" if memory_ratio is not None else f"{'-':>7}"
+        print(f"{name:<26} {base['seconds']:10.4f} {result['seconds']:10.4f} {time_ratio:7.2f} {memory_text}"
+              + ("  REGRESSION" if marks else ""))
+        regressions.extend(f"{name}: {mark}" for mark in marks)
+    return regressions
+
+
+def _ratio(value: Optional[float], base: Optional[float]) -> Optional[float]:
+    if value is None or base is None:
+        return None
+    # Peaks under a few KB are noise, not a regression
+    return value / base if base > 0.01 else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Table benchmarks")
+    parser.add_argument('--rows', type=int, default=100_000, help="rows of the synthetic table")
+    parser.add_argument('--cols', type=int, default=10, help="columns of the synthetic table")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="column type weights, e.g. int=2,float=1,str=1,bool=1")
+    parser.add_argument('--nulls', type=float, default=0.0, help="share of None values in every column")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--columnar', action='store_true', help="measure tables with columnar storage")
+    parser.add_argument('--repeat', type=int, default=3, help="timed repetitions per case, the best one counts")
+    parser.add_argument('--cases', help=f"comma-separated cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak memory run")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--baseline', help="JSON report to compare with; regressions make the exit status 1")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown or memory growth over the baseline, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    names = list(CASES) if args.cases is None else [name.strip() for name in args.cases.split(',')]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"Unknown cases {unknown}. Available: {list(CASES)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be positive")
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    config = {'rows': args.rows, 'cols': args.cols, 'mix': args.mix, 'nulls': args.nulls,
+              'seed': args.seed, 'columnar': args.columnar, 'repeat': args.repeat}
+    report = run_cases(config, names, memory=not args.no_memory)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# benchmarks/cases.py
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import io_binary
+import io_csv
+import io_pickle
+import io_text
+from sorting import sort_csv
+from table import Table
+
+from benchmarks.data import as_text
+
+# A case returns (setup, run) or None if the workload has no columns it needs.
+# setup() runs before every repetition and is not timed, run(state) is timed
+Bench = Tuple[Callable[[], Any], Callable[[Any], Any]]
+
+
+class Workload:
+    """
+    Данные одного запуска замеров: типизированная таблица, те же значения строками
+    (как до set_column_types) и каталог для файлов.
+    """
+
+    def __init__(self, names: List[str], types: List[type], data: List[List[Any]],
+                 columnar: bool, tmp_dir: str):
+        self.names = names
+        self.types = types
+        self.columnar = columnar
+        self.tmp_dir = tmp_dir
+        self.data = data
+        self.n_rows = len(data[0]) if data else 0
+        self.table = self.fresh_table()
+        self.text = as_text(data)
+        self.text_rows = [list(row) for row in zip(*self.text)]
+        self.numeric = [name for name, t in zip(names, types) if t in (int, float)]
+        self.keys = [name for name, t in zip(names, types) if t in (int, str)]
+
+    def fresh_table(self) -> Table:
+        # Cases that add columns or indexes work on their own table, so the other cases
+        # measure the same table whichever cases are selected
+        return Table.from_columns(self.names, self.data, types=dict(enumerate(self.types)), columnar=self.columnar)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp_dir, name)
+
+    def median(self, column: str) -> Any:
+        values = sorted(v for v in self.table.get_values(column) if v is not None)
+        return values[len(values) // 2] if values else 0.0
+
+
+def _no_setup():
+    return None
+
+
+def construct_rows(w: Workload) -> Bench:
+    return _no_setup, lambda _: Table(columns=w.names, rows=w.text_rows, columnar=w.columnar)
+
+
+def construct_columns(w: Workload) -> Bench:
+    return _no_setup, lambda _: Table.from_columns(w.names, w.text, columnar=w.columnar)
+
+
+def set_column_types(w: Workload) -> Bench:
+    types = dict(enumerate(w.types))
+
+    def setup():
+        return Table.from_columns(w.names, w.text, columnar=w.columnar)
+    return setup, lambda table: table.set_column_types(types)
+
+
+def arithmetic_columns(w: Workload) -> Optional[Bench]:
+    if len(w.numeric) < 2:
+        return None
+    a, b = w.numeric[:2]
+    table = w.fresh_table()
+    return _no_setup, lambda _: table.add(a, b, 'bench_result')
+
+
+def arithmetic_scalar(w: Workload) -> Optional[Bench]:
+    if not w.numeric:
+        return None
+    table = w.fresh_table()
+    return _no_setup, lambda _: table.mul(w.numeric[0], 1.5, 'bench_result')
+
+
+def compare_columns(w: Workload) -> Optional[Bench]:
+    if len(w.numeric) < 2:
+        return None
+    a, b = w.numeric[:2]
+    return _no_setup, lambda _: w.table.gr(a, b)
+
+
+def compare_scalar(w: Workload) -> Optional[Bench]:
+    if not w.numeric:
+        return None
+    column = w.numeric[0]
+    # A float scalar is never taken for a column number
+    scalar = float(w.median(column))
+    return _no_setup, lambda _: w.table.gr(column, scalar)
+
+
+def filter_rows(w: Workload) -> Optional[Bench]:
+    if not w.numeric:
+        return None
+    mask = w.table.gr(w.numeric[0], float(w.median(w.numeric[0])))
+    return _no_setup, lambda _: w.table.filter_rows(mask)
+
+
+def _lookup_values(w: Workload, column: str) -> List[Any]:
+    values = [v for v in w.table.get_values(column)[:100] if v is not None]
+    return values[:10]
+
+
+def get_rows_by_index(w: Workload) -> Optional[Bench]:
+    if not w.keys:
+        return None
+    column = w.keys[0]
+    values = _lookup_values(w, column)
+    return _no_setup, lambda _: w.table.get_rows_by_index(*values, column=column)
+
+
+def get_rows_by_index_hashed(w: Workload) -> Optional[Bench]:
+    if not w.keys:
+        return None
+    column = w.keys[0]
+    values = _lookup_values(w, column)
+    table = w.fresh_table()
+    table.create_index(column)
+    return _no_setup, lambda _: table.get_rows_by_index(*values, column=column)
+
+
+def get_rows_by_number(w: Workload) -> Optional[Bench]:
+    if not w.n_rows:
+        return None
+    return _no_setup, lambda _: w.table.get_rows_by_number(0, w.n_rows - 1)
+
+
+def query_collect(w: Workload) -> Optional[Bench]:
+    if not w.numeric:
+        return None
+    column = w.numeric[0]
+    median = float(w.median(column))
+    return _no_setup, lambda _: w.table.query().gr(column, median).mul(column, 1.5, 'bench_result').collect()
+
+
+def group_by(w: Workload) -> Optional[Bench]:
+    if not w.keys:
+        return None
+    key = w.keys[0]
+    spec = {w.numeric[0]: ['sum', 'mean', 'count']} if w.numeric else {key: ['count']}
+    return _no_setup, lambda _: w.table.group_by(key).agg(spec)
+
+
+def join(w: Workload) -> Optional[Bench]:
+    if not w.keys:
+        return None
+    key = w.keys[0]
+    # Every distinct key once on the right, so the result has as many rows as the table
+    values = list(dict.fromkeys(v for v in w.table.get_values(key) if v is not None))
+    right = Table.from_columns([key, 'bench_payload'], [values, list(range(len(values)))],
+                               types={0: w.types[w.names.index(key)], 1: int}, columnar=w.columnar)
+    return _no_setup, lambda _: w.table.join(right, on=key)
+
+
+def sort_by(w: Workload) -> Optional[Bench]:
+    columns = (w.numeric or w.keys)[:2]
+    if not columns:
+        return None
+    return _no_setup, lambda _: w.table.sort_by(columns)
+
+
+def sort_csv_external(w: Workload) -> Optional[Bench]:
+    columns = (w.numeric or w.keys)[:1]
+    if not columns:
+        return None
+    src, dst = w.path('bench_sort_src.csv'), w.path('bench_sort_dst.csv')
+    io_csv.save_table(w.table, src)
+    # Four runs, so the merge is measured too
+    run_rows = max(1, -(-w.n_rows // 4))
+    return _no_setup, lambda _: sort_csv(src, dst, columns, run_rows=run_rows, tmp_dir=w.tmp_dir)
+
+
+def _save(save, w: Workload, name: str) -> Bench:
+    path = w.path(name)
+    return _no_setup, lambda _: save(w.table, path)
+
+
+def _load(save, load, w: Workload, name: str) -> Bench:
+    path = w.path(name)
+    save(w.table, path)
+    return _no_setup, lambda _: load(path)
+
+
+def csv_save(w: Workload) -> Bench:
+    return _save(io_csv.save_table, w, 'bench.csv')
+
+
+def csv_load(w: Workload) -> Bench:
+    return _load(io_csv.save_table, lambda path: io_csv.load_table(path, columnar=w.columnar), w, 'bench.csv')
+
+
+def pickle_save(w: Workload) -> Bench:
+    return _save(io_pickle.save_table, w, 'bench.pkl')
+
+
+def pickle_load(w: Workload) -> Bench:
+    return _load(io_pickle.save_table, io_pickle.load_table, w, 'bench.pkl')
+
+
+def text_save(w: Workload) -> Bench:
+    return _save(io_text.save_table, w, 'bench.txt')
+
+
+def binary_save(w: Workload) -> Bench:
+    return _save(io_binary.save_table, w, 'bench.bin')
+
+
+def binary_load(w: Workload) -> Bench:
+    # Opening maps the file; reading every row measures the decoding as well
+    return _load(io_binary.save_table, lambda path: sum(1 for _ in io_binary.load_table(path).iter_rows()),
+                 w, 'bench.bin')
+
+
+# Name -> case, in the order the report lists them
+CASES: Dict[str, Callable[[Workload], Optional[Bench]]] = {
+    'construct_rows': construct_rows,
+    'construct_columns': construct_columns,
+    'set_column_types': set_column_types,
+    'arithmetic_columns': arithmetic_columns,
+    'arithmetic_scalar': arithmetic_scalar,
+    'compare_columns': compare_columns,
+    'compare_scalar': compare_scalar,
+    'filter_rows': filter_rows,
+    'get_rows_by_index': get_rows_by_index,
+    'get_rows_by_index_hashed': get_rows_by_index_hashed,
+    'get_rows_by_number': get_rows_by_number,
+    'query_collect': query_collect,
+    'group_by': group_by,
+    'join': join,
+    'sort_by': sort_by,
+    'sort_csv': sort_csv_external,
+    'csv_save': csv_save,
+    'csv_load': csv_load,
+    'pickle_save': pickle_save,
+    'pickle_load': pickle_load,
+    'text_save': text_save,
+    'binary_save': binary_save,
+    'binary_load': binary_load,
+}
@@ -0,0 +1,72 @@
+# benchmarks/data.py
+import random
+from typing import Any, Dict, List, Tuple
+
+TYPE_NAMES = ('int', 'float', 'str', 'bool')
+DEFAULT_MIX = 'int=2,float=2,str=1,bool=1'
+_TYPES = {'int': int, 'float': float, 'str': str, 'bool': bool}
+# Distinct values of a str column: repeated keys make index lookups and grouping realistic
+STR_CARDINALITY = 1000
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    """
+    Разбирает состав типов столбцов вида 'int=2,float=1,str' (вес по умолчанию — 1).
+    """
+    mix: Dict[str, int] = {}
+    for part in spec.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in TYPE_NAMES:
+            raise ValueError(f"Unknown column type '{name}'. Available: {list(TYPE_NAMES)}")
+        try:
+            mix[name] = int(weight) if weight else 1
+        except ValueError:
+            raise ValueError(f"Weight of '{name}' must be an integer, got '{weight}'")
+        if mix[name] < 0:
+            raise ValueError(f"Weight of '{name}' must be non-negative, got {mix[name]}")
+    if not sum(mix.values()):
+        raise ValueError(f"Type mix '{spec}' has no columns")
+    return mix
+
+
+def column_types(n_cols: int, mix: Dict[str, int]) -> List[type]:
+    # Types repeat in a fixed pattern, so every prefix of the columns keeps the mix proportions
+    pattern = [name for name, weight in mix.items() for _ in range(weight)]
+    return [_TYPES[pattern[i % len(pattern)]] for i in range(n_cols)]
+
+
+def _values(rng: random.Random, col_type: type, n_rows: int) -> List[Any]:
+    if col_type is int:
+        return [rng.randint(-1_000_000, 1_000_000) for _ in range(n_rows)]
+    if col_type is float:
+        return [round(rng.uniform(-1e6, 1e6), 3) for _ in range(n_rows)]
+    if col_type is bool:
+        return [rng.random() < 0.5 for _ in range(n_rows)]
+    return [f"s{rng.randrange(STR_CARDINALITY)}" for _ in range(n_rows)]
+
+
+def make_data(n_rows: int, n_cols: int, mix: Dict[str, int], null_ratio: float = 0.0,
+              seed: int = 0) -> Tuple[List[str], List[type], List[List[Any]]]:
+    """
+    Синтетическая таблица: имена c0, c1, ..., типы столбцов по mix и значения по столбцам.
+    Доля null_ratio значений каждого столбца — None. При одном seed данные одинаковы.
+    """
+    if n_rows < 0 or n_cols < 1:
+        raise ValueError(f"Need rows >= 0 and cols >= 1, got {n_rows} x {n_cols}")
+    if not 0.0 <= null_ratio < 1.0:
+        raise ValueError(f"null_ratio must be in [0, 1), got {null_ratio}")
+    rng = random.Random(seed)
+    names = [f"c{i}" for i in range(n_cols)]
+    types = column_types(n_cols, mix)
+    data = []
+    for col_type in types:
+        values = _values(rng, col_type, n_rows)
+        if null_ratio:
+            values = [None if rng.random() < null_ratio else v for v in values]
+        data.append(values)
+    return names, types, data
+
+
+def as_text(data: List[List[Any]]) -> List[List[Any]]:
+    # Values as they come from a file before set_column_types: strings, None stays None
+    return [[None if v is None else str(v) for v in values] for values in data]
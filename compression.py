@@ -0,0 +1,75 @@
+# compression.py
+import bz2
+import gzip
+import io
+import lzma
+import os
+from typing import IO, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional: .zst files need the zstandard package
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # lz4 is optional: .lz4 files need the lz4 package
+    lz4_frame = None
+
+COMPRESSIONS = ('gzip', 'bz2', 'xz', 'zstd', 'lz4')
+EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.lzma': 'xz', '.zst': 'zstd', '.lz4': 'lz4'}
+_PACKAGES = {'zstd': 'zstandard', 'lz4': 'lz4'}
+
+
+def infer_compression(path: str, compression: Optional[str] = 'infer') -> Optional[str]:
+    """
+    Сжатие файла: по расширению path при compression='infer', иначе compression (None — без сжатия).
+    """
+    if compression == 'infer':
+        return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if compression is None or compression in COMPRESSIONS:
+        return compression
+    raise ValueError(f"Unknown compression '{compression}'. Available: {list(COMPRESSIONS)}")
+
+
+def available(compression: str) -> bool:
+    if compression == 'zstd':
+        return zstandard is not None
+    if compression == 'lz4':
+        return lz4_frame is not None
+    return compression in COMPRESSIONS
+
+
+def _open_binary(path: str, compression: str, mode: str, level: Optional[int]) -> IO[bytes]:
+    if not available(compression):
+        raise ImportError(f"{compression} compression needs the '{_PACKAGES[compression]}' package")
+    writing = 'r' not in mode
+    if compression == 'gzip':
+        return gzip.open(path, mode, **({'compresslevel': level} if level is not None else {}))
+    if compression == 'bz2':
+        return bz2.open(path, mode, **({'compresslevel': level} if level is not None else {}))
+    if compression == 'xz':
+        return lzma.open(path, mode, preset=level if writing else None)
+    if compression == 'zstd':
+        cctx = zstandard.ZstdCompressor(level=level) if writing and level is not None else None
+        return zstandard.open(path, mode, cctx=cctx)
+    return lz4_frame.open(path, mode, **({'compression_level': level} if writing and level is not None else {}))
+
+
+def open_file(path: str, mode: str = 'rb', compression: Optional[str] = 'infer', level: Optional[int] = None,
+              encoding: Optional[str] = None, newline: Optional[str] = None, buffering: int = -1) -> IO:
+    """
+    Открывает файл как open(), прозрачно сжимая или распаковывая его потоком.
+    - compression: 'infer' (по расширению .gz/.bz2/.xz/.lzma/.zst/.lz4), None или одно из COMPRESSIONS
+    - level: уровень сжатия при записи (по умолчанию — уровень библиотеки)
+    - mode без 'b' — текстовый режим с encoding и newline
+    zstd и lz4 доступны, только если установлены пакеты zstandard и lz4.
+    """
+    kind = infer_compression(path, compression)
+    if kind is None:
+        return open(path, mode, buffering=buffering, encoding=encoding, newline=newline)
+    binary_mode = mode.replace('t', '').replace('b', '') + 'b'
+    raw = _open_binary(path, kind, binary_mode, level)
+    if 'b' in mode:
+        return raw
+    return io.TextIOWrapper(raw, encoding=encoding, newline=newline)
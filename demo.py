@@ -94,7 +94,7 @@ def demo_comparison_operations(table):
     print("\n4.5 Зарплата > 50000 И возраст < 30:")
     high_salary = table.gr('salary', 50000)
     young_age = table.ls('age', 30)
-    combined_mask = [a and b for a, b in zip(high_salary, young_age)]
+    combined_mask = high_salary & young_age
     print("Маска:", combined_mask)
 
     return high_salary, young_age
@@ -115,7 +115,7 @@ def demo_filtering(table, mask1, mask2):
 
     # Комбинированная фильтрация
     print("\n5.3 Молодые сотрудники с высокой зарплатой:")
-    combined_mask = [a and b for a, b in zip(mask1, mask2)]
+    combined_mask = mask1 & mask2
     t_young_rich = table.filter_rows(combined_mask, copy_table=True)
     t_young_rich.print_table()
 
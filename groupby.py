@@ -0,0 +1,148 @@
+# groupby.py
+from itertools import chain, repeat
+from typing import Any, Dict, List, Sequence, Union
+
+import vectorized
+from instrument import instrumented
+from table import Table, TableError
+
+AGGREGATES = ('sum', 'mean', 'min', 'max', 'count')
+
+_NAN = float('nan')
+
+
+class GroupBy:
+    """
+    Группировка строк Table по значениям ключевых столбцов (Table.group_by).
+    - agg({'col': ['sum', 'mean', 'min', 'max', 'count']}) — новая Table: ключевые столбцы,
+      затем столбцы '<col>_<агрегат>' в порядке словаря, по строке на группу
+    - группы идут в порядке первого появления ключа; без ключей вся таблица — одна группа;
+      строки с ключом None, как и строки с ключом NaN, образуют по одной группе
+    - значения приводятся к типу столбца, None пропускаются: count — число остальных значений,
+      у группы без значений sum/mean/min/max равны None
+    - presorted=True: строки с одинаковым ключом уже идут подряд (таблица отсортирована по ключу),
+      группы находятся сравнением соседних строк, без словаря ключей
+    Типизированные числовые столбцы колоночной таблицы при установленном NumPy
+    агрегируются векторно, остальные — за один проход по строкам.
+    """
+
+    def __init__(self, table: Table, keys: Union[int, str, Sequence[Union[int, str]]], presorted: bool = False):
+        self._table = table
+        self._keys = [keys] if isinstance(keys, (int, str)) else list(keys)
+        self._key_indices = [table._col_index(key) for key in self._keys]
+        self._presorted = presorted
+
+    def _row_keys(self) -> List[Any]:
+        n_rows = self._table.row_count()
+        if not self._keys:
+            return [()] * n_rows
+        values = [self._table.get_values(key) for key in self._keys]
+        # All NaN keys form one group, whatever objects hold them: one NaN matches itself by identity
+        values = [[_NAN if v != v else v for v in column] if self._table._type_for(key) is float else column
+                  for key, column in zip(self._keys, values)]
+        return values[0] if len(values) == 1 else list(zip(*values))
+
+    def _group(self):
+        # Group number of each row (or run boundaries for presorted input) and the group keys
+        row_keys = self._row_keys()
+        self._ids = None
+        if not self._keys:
+            self._bounds, self._group_keys = [0, len(row_keys)], [()]
+        elif self._presorted:
+            starts = [0] + [i for i, (prev, key) in enumerate(zip(row_keys, row_keys[1:]), 1)
+                            if key is not prev and key != prev]
+            self._bounds = starts + [len(row_keys)] if row_keys else [0]
+            self._group_keys = [row_keys[i] for i in starts] if row_keys else []
+        else:
+            groups: Dict[Any, int] = {}
+            try:
+                self._ids = [groups.setdefault(key, len(groups)) for key in row_keys]
+            except TypeError as e:
+                raise TableError(f"Cannot group by columns {self._keys}: {e}") from e
+            self._bounds, self._group_keys = None, list(groups)
+
+    def _group_ids(self) -> Sequence[int]:
+        if self._ids is None:
+            self._ids = list(chain.from_iterable(repeat(g, stop - start) for g, (start, stop)
+                                                 in enumerate(zip(self._bounds, self._bounds[1:]))))
+        return self._ids
+
+    def _buckets(self, values: List[Any]) -> List[List[Any]]:
+        # Non-None values of every group
+        if self._bounds is not None:
+            # Presorted input: every group is a slice of consecutive rows
+            runs = [values[start:stop] for start, stop in zip(self._bounds, self._bounds[1:])]
+            if None not in values:
+                return runs
+            return [[v for v in run if v is not None] for run in runs]
+        # One sequential pass that appends each value to its group's bucket
+        buckets: List[List[Any]] = [[] for _ in self._group_keys]
+        appends = [bucket.append for bucket in buckets]
+        for group, value in zip(self._ids, values):
+            if value is not None:
+                appends[group](value)
+        return buckets
+
+    def _aggregate(self, column: Union[int, str], aggs: List[str]) -> Dict[str, List[Any]]:
+        buffer = self._table._typed_column(column) if vectorized.available() else None
+        if buffer is not None:
+            result = vectorized.group_aggregates(buffer, self._group_ids(), len(self._group_keys), aggs)
+            if result is not None:
+                return result
+            values = buffer.to_list()
+        else:
+            values = self._table.get_values(column)
+
+        buckets = self._buckets(values)
+        result: Dict[str, List[Any]] = {}
+        for agg in aggs:
+            try:
+                if agg == 'count':
+                    result[agg] = list(map(len, buckets))
+                elif agg == 'mean':
+                    result[agg] = [sum(bucket) / len(bucket) if bucket else None for bucket in buckets]
+                else:
+                    reduce = {'sum': sum, 'min': min, 'max': max}[agg]
+                    result[agg] = [reduce(bucket) if bucket else None for bucket in buckets]
+            except Exception as e:
+                raise TableError(f"{agg} of column '{self._table.columns[self._table._col_index(column)]}' failed: {e}") from e
+        return result
+
+    @staticmethod
+    def _result_type(agg: str, col_type: type) -> type:
+        if agg == 'count':
+            return int
+        if agg == 'mean':
+            return float
+        if agg == 'sum' and col_type is bool:
+            return int
+        return col_type
+
+    @instrumented()
+    def agg(self, spec: Dict[Union[int, str], Union[str, Sequence[str]]]) -> Table:
+        table = self._table
+        requests = []
+        for column, aggs in spec.items():
+            aggs = [aggs] if isinstance(aggs, str) else list(aggs)
+            for agg in aggs:
+                if agg not in AGGREGATES:
+                    raise ValueError(f"Unknown aggregation '{agg}'. Available: {list(AGGREGATES)}")
+            requests.append((column, table._col_index(column), aggs))
+
+        self._group()
+        names = [table.columns[idx] for idx in self._key_indices]
+        types: List[type] = [table._type_for(key) for key in self._keys]
+        if len(self._keys) == 1:
+            data: List[List[Any]] = [self._group_keys]
+        else:
+            data = [list(values) for values in zip(*self._group_keys)] or [[] for _ in self._keys]
+
+        for column, idx, aggs in requests:
+            col_type = table._type_for(column)
+            results = self._aggregate(column, aggs)
+            for agg in aggs:
+                names.append(f"{table.columns[idx]}_{agg}")
+                data.append(results[agg])
+                types.append(self._result_type(agg, col_type))
+
+        return Table.from_columns(names, data, types=dict(enumerate(types)), columnar=table.columnar)
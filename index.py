@@ -0,0 +1,109 @@
+# index.py
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+
+class HashIndex:
+    """
+    Хеш-индекс по одному или нескольким столбцам: значение -> номера строк.
+    - ключ составного индекса — кортеж значений столбцов
+    - строится по хранимым значениям, None тоже попадает в индекс
+    - после изменения столбца помечается stale и перестраивается при следующем обращении
+    """
+
+    def __init__(self, columns: Tuple[int, ...]):
+        self.columns = columns
+        self.positions: Dict[Any, List[int]] = {}
+        self.value_types: FrozenSet[type] = frozenset()
+        self.stale = True
+
+    def build(self, keys: Sequence[Any]):
+        positions: Dict[Any, List[int]] = {}
+        for i, key in enumerate(keys):
+            bucket = positions.get(key)
+            if bucket is None:
+                positions[key] = [i]
+            else:
+                bucket.append(i)
+        self.positions = positions
+        self.value_types = frozenset(map(type, positions))
+        self.stale = False
+
+    def lookup(self, keys: Iterable[Any]) -> List[int]:
+        """
+        Номера строк (по возрастанию), ключ которых равен одному из keys.
+        Для нехешируемых keys выбрасывает TypeError.
+        """
+        found: List[int] = []
+        buckets = 0
+        for key in set(keys):
+            bucket = self.positions.get(key)
+            if bucket:
+                found.extend(bucket)
+                buckets += 1
+        if buckets > 1:
+            found.sort()
+        return found
+
+
+class RowPositions(list):
+    """
+    Номера строк по возрастанию (результат Table.range).
+    filter_rows принимает их напрямую, не проходя по всем строкам.
+    """
+
+
+class SortedIndex:
+    """
+    Отсортированный индекс по одному столбцу для запросов по диапазону.
+    - хранит значения, приведённые к col_type, и номера их строк
+    - None и NaN не попадают в индекс: в сравнениях они всегда дают False
+    """
+
+    def __init__(self, column: int, col_type: type):
+        self.column = column
+        self.col_type = col_type
+        self.keys: List[Any] = []
+        self.positions: List[int] = []
+        self.nan: Any = None
+        self.stale = True
+
+    def build(self, values: Sequence[Any]):
+        order = [i for i, v in enumerate(values) if v is not None and v == v]
+        order.sort(key=values.__getitem__)
+        self.keys = [values[i] for i in order]
+        self.positions = order
+        self.nan = None
+        if len(order) != len(values):
+            self.nan = next((v for v in values if v is not None and v != v), None)
+        self.stale = False
+
+    def bounds(self, lo: Any = None, hi: Any = None,
+               include_lo: bool = True, include_hi: bool = True) -> Tuple[int, int]:
+        """
+        Срез keys[start:stop] со значениями в диапазоне; None — граница не задана.
+        Для несравнимых с ключами границ выбрасывает TypeError.
+        """
+        if not self.keys and self.nan is not None:
+            # Only NaN values: compare with one so incomparable bounds still raise TypeError
+            in_range(self.nan, lo, hi, include_lo, include_hi)
+        start, stop = 0, len(self.keys)
+        if lo is not None:
+            start = bisect_left(self.keys, lo) if include_lo else bisect_right(self.keys, lo)
+        if hi is not None:
+            stop = bisect_right(self.keys, hi) if include_hi else bisect_left(self.keys, hi)
+        return start, max(start, stop)
+
+    def range(self, lo: Any = None, hi: Any = None,
+              include_lo: bool = True, include_hi: bool = True) -> RowPositions:
+        start, stop = self.bounds(lo, hi, include_lo, include_hi)
+        return RowPositions(sorted(self.positions[start:stop]))
+
+
+def in_range(value: Any, lo: Any = None, hi: Any = None,
+             include_lo: bool = True, include_hi: bool = True) -> bool:
+    if lo is not None and not (value >= lo if include_lo else value > lo):
+        return False
+    if hi is not None and not (value <= hi if include_hi else value < hi):
+        return False
+    return True
@@ -0,0 +1,247 @@
+# instrument.py
+"""
+Необязательный учёт операций Table и функций io_*: число вызовов, время, строки и память.
+
+    instrument.enable()                 # или enable(memory=True) — ещё и память через tracemalloc
+    ...
+    instrument.snapshot()               # {'Table.add': {'calls': 3, 'seconds': ..., ...}, ...}
+    instrument.add_hook(exporter)       # exporter(record) после каждой операции
+    instrument.disable()
+
+    with instrument.profile() as stats: # учёт только внутри блока
+        ...
+    stats.snapshot()
+
+Учитываются только внешние вызовы: операции, вызванные изнутри другой учитываемой
+операции (например, Table.from_columns внутри io_csv.load_table), входят в её время
+и не записываются отдельно. Пока учёт выключен, обёртка операции проверяет один флаг.
+"""
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+Hook = Callable[['OperationRecord'], None]
+
+
+class OperationRecord:
+    """
+    Один вызов операции: имя, время в секундах, число строк (строки таблицы-аргумента,
+    а если её нет — таблицы-результата; None, если таблицы нет), пик выделенной памяти
+    в байтах (None без memory) и failed — завершилась ли операция исключением.
+    """
+    __slots__ = ('name', 'seconds', 'rows', 'bytes', 'failed')
+
+    def __init__(self, name: str, seconds: float, rows: Optional[int], bytes: Optional[int], failed: bool):
+        self.name = name
+        self.seconds = seconds
+        self.rows = rows
+        self.bytes = bytes
+        self.failed = failed
+
+    def __repr__(self) -> str:
+        return (f"OperationRecord({self.name!r}, seconds={self.seconds:.6f}, rows={self.rows}, "
+                f"bytes={self.bytes}, failed={self.failed})")
+
+
+class Stats:
+    """
+    Накопленные по операциям итоги: calls, errors, seconds (сумма), max_seconds,
+    rows (сумма) и bytes (сумма пиков памяти, None если память не учитывалась).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, record: OperationRecord):
+        with self._lock:
+            op = self._ops.get(record.name)
+            if op is None:
+                op = self._ops[record.name] = {'calls': 0, 'errors': 0, 'seconds': 0.0,
+                                               'max_seconds': 0.0, 'rows': 0, 'bytes': None}
+            op['calls'] += 1
+            op['errors'] += record.failed
+            op['seconds'] += record.seconds
+            op['max_seconds'] = max(op['max_seconds'], record.seconds)
+            if record.rows is not None:
+                op['rows'] += record.rows
+            if record.bytes is not None:
+                op['bytes'] = (op['bytes'] or 0) + record.bytes
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(op) for name, op in self._ops.items()}
+
+    def reset(self):
+        with self._lock:
+            self._ops.clear()
+
+
+_stats = Stats()
+_hooks: List[Hook] = []
+_profiles: List[Stats] = []
+_enabled = False
+_enabled_memory = False
+# The one flag an instrumented call checks while instrumentation is off
+_active = False
+# Requests for memory accounting and whether tracemalloc was started here
+_memory_users = 0
+_owns_tracing = False
+_local = threading.local()
+_reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+
+def _update():
+    global _active
+    _active = _enabled or bool(_profiles)
+
+
+def _start_memory():
+    global _memory_users, _owns_tracing
+    _memory_users += 1
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _owns_tracing = True
+
+
+def _stop_memory():
+    global _memory_users, _owns_tracing
+    _memory_users -= 1
+    if not _memory_users and _owns_tracing:
+        tracemalloc.stop()
+        _owns_tracing = False
+
+
+def enable(memory: bool = False):
+    """
+    Включает общий учёт (snapshot, хуки). memory=True — ещё и пик памяти каждой операции
+    через tracemalloc: это заметно замедляет выделение памяти, а пик включает выделения
+    всех потоков.
+    """
+    global _enabled, _enabled_memory
+    if _enabled:
+        disable()
+    _enabled, _enabled_memory = True, memory
+    if memory:
+        _start_memory()
+    _update()
+
+
+def disable():
+    global _enabled, _enabled_memory
+    if _enabled and _enabled_memory:
+        _stop_memory()
+    _enabled, _enabled_memory = False, False
+    _update()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    return _stats.snapshot()
+
+
+def reset():
+    _stats.reset()
+
+
+def add_hook(hook: Hook):
+    # Hooks run for every recorded operation while instrumentation is on, in the calling thread
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook):
+    _hooks.remove(hook)
+
+
+@contextmanager
+def profile(memory: bool = False) -> Iterator[Stats]:
+    """
+    Учёт операций внутри блока в отдельный Stats (общий учёт и хуки работают как обычно).
+    """
+    stats = Stats()
+    _profiles.append(stats)
+    if memory:
+        _start_memory()
+    _update()
+    try:
+        yield stats
+    finally:
+        _profiles.remove(stats)
+        if memory:
+            _stop_memory()
+        _update()
+
+
+def _rows(args: Sequence[Any], result: Any) -> Optional[int]:
+    for value in (args[0] if args else None, result):
+        row_count = getattr(value, 'row_count', None)
+        if row_count is not None and not isinstance(value, type):
+            return row_count()
+    return None
+
+
+def _call(name: str, fn: Callable, args, kwargs):
+    # Only the outermost instrumented call of a thread is recorded
+    depth = getattr(_local, 'depth', 0)
+    if depth:
+        return fn(*args, **kwargs)
+    memory = _memory_users > 0 and tracemalloc.is_tracing()
+    if memory:
+        base = tracemalloc.get_traced_memory()[0]
+        if _reset_peak is not None:
+            _reset_peak()
+    _local.depth = 1
+    result, failed = None, True
+    start = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+        failed = False
+        return result
+    finally:
+        seconds = time.perf_counter() - start
+        _local.depth = 0
+        allocated = None
+        if memory:
+            # Without reset_peak (Python < 3.9) only the memory still held after the call is known
+            current, peak = tracemalloc.get_traced_memory()
+            allocated = (peak if _reset_peak is not None else max(current, base)) - base
+        record = OperationRecord(name, seconds, None if failed else _rows(args, result), allocated, failed)
+        if _enabled:
+            _stats.add(record)
+        for stats in list(_profiles):
+            stats.add(record)
+        if _enabled:
+            for hook in list(_hooks):
+                hook(record)
+
+
+def instrumented(name: Optional[str] = None):
+    """
+    Декоратор учитываемой операции; имя по умолчанию — 'Класс.метод' или 'модуль.функция'.
+    """
+    def decorate(fn: Callable) -> Callable:
+        op_name = name or (fn.__qualname__ if '.' in fn.__qualname__ else f"{fn.__module__}.{fn.__qualname__}")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return fn(*args, **kwargs)
+            return _call(op_name, fn, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def instrument_methods(cls: type, names: Sequence[str]):
+    # Wraps the given methods (classmethods included) of cls in place
+    for method_name in names:
+        attr = cls.__dict__[method_name]
+        if isinstance(attr, classmethod):
+            setattr(cls, method_name, classmethod(instrumented()(attr.__func__)))
+        else:
+            setattr(cls, method_name, instrumented()(attr))
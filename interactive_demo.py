@@ -4,6 +4,10 @@ from io_csv import load_table as load_csv, save_table as save_csv
 from io_pickle import load_table as load_pickle, save_table as save_pickle
 from io_text import save_table as save_text
 
+# Tables are shown as a preview: first and last rows and clipped cells
+PREVIEW_ROWS = 20
+PREVIEW_COL_WIDTH = 40
+
 
 class TableManager:
     def __init__(self):
@@ -16,7 +20,7 @@ class TableManager:
 
         if self.current_table:
             print(
-                f"📊 Текущая таблица: {len(self.current_table.rows)} строк, {len(self.current_table.columns)} столбцов")
+                f"📊 Текущая таблица: {self.current_table.row_count()} строк, {len(self.current_table.columns)} столбцов")
         else:
             print("📊 Текущая таблица: НЕТ")
 
@@ -82,7 +86,7 @@ class TableManager:
         try:
             self.current_table = Table(columns=columns, rows=rows)
             print(f"✅ Таблица создана успешно! {len(rows)} строк, {len(columns)} столбцов")
-            self.current_table.print_table()
+            self.current_table.print_table(max_rows=PREVIEW_ROWS, max_col_width=PREVIEW_COL_WIDTH)
         except Exception as e:
             print(f"❌ Ошибка при создании таблицы: {e}")
 
@@ -110,7 +114,7 @@ class TableManager:
                 print("❌ Неверный выбор")
                 return
 
-            self.current_table.print_table()
+            self.current_table.print_table(max_rows=PREVIEW_ROWS, max_col_width=PREVIEW_COL_WIDTH)
 
         except Exception as e:
             print(f"❌ Ошибка загрузки: {e}")
@@ -122,10 +126,10 @@ class TableManager:
 
         print("\n👀 ПРОСМОТР ТАБЛИЦЫ")
         print("-" * 30)
-        self.current_table.print_table()
+        self.current_table.print_table(max_rows=PREVIEW_ROWS, max_col_width=PREVIEW_COL_WIDTH)
 
         print(f"\n📊 Информация:")
-        print(f"   Строк: {len(self.current_table.rows)}")
+        print(f"   Строк: {self.current_table.row_count()}")
         print(f"   Столбцов: {len(self.current_table.columns)}")
         print(f"   Столбцы: {', '.join(self.current_table.columns)}")
 
@@ -224,7 +228,7 @@ class TableManager:
                 self.current_table.div(col_a, col_b, result_column=result_col)
 
             print(f"✅ Операция выполнена успешно!")
-            self.current_table.print_table()
+            self.current_table.print_table(max_rows=PREVIEW_ROWS, max_col_width=PREVIEW_COL_WIDTH)
 
         except Exception as e:
             print(f"❌ Ошибка операции: {e}")
@@ -296,8 +300,8 @@ class TableManager:
 
             filtered_table = self.current_table.filter_rows(mask, copy_table=True)
 
-            print(f"✅ Найдено {len(filtered_table.rows)} строк:")
-            filtered_table.print_table()
+            print(f"✅ Найдено {filtered_table.row_count()} строк:")
+            filtered_table.print_table(max_rows=PREVIEW_ROWS, max_col_width=PREVIEW_COL_WIDTH)
 
             save_choice = input("\n💾 Сохранить отфильтрованную таблицу? (y/n): ").strip().lower()
             if save_choice == 'y':
@@ -339,19 +343,21 @@ class TableManager:
             return
 
         try:
-            values = self.current_table.get_values(column)
-            numeric_values = [v for v in values if v is not None]
+            # Вся таблица — одна группа: все агрегаты за один вызов
+            stats = self.current_table.group_by([]).agg(
+                {column: ['count', 'min', 'max', 'mean', 'sum']}).rows[0]
+            count, minimum, maximum, mean, total = stats
 
-            if not numeric_values:
+            if not count:
                 print("❌ В столбце нет числовых данных")
                 return
 
             print(f"\n📈 СТАТИСТИКА ПО СТОЛБЦУ '{column}':")
-            print(f"   Количество значений: {len(numeric_values)}")
-            print(f"   Минимальное: {min(numeric_values)}")
-            print(f"   Максимальное: {max(numeric_values)}")
-            print(f"   Среднее: {sum(numeric_values) / len(numeric_values):.2f}")
-            print(f"   Сумма: {sum(numeric_values)}")
+            print(f"   Количество значений: {count}")
+            print(f"   Минимальное: {minimum}")
+            print(f"   Максимальное: {maximum}")
+            print(f"   Среднее: {mean:.2f}")
+            print(f"   Сумма: {total}")
 
         except Exception as e:
             print(f"❌ Ошибка анализа: {e}")
@@ -444,7 +450,7 @@ class TableManager:
             )
             self.current_table.set_column_types(example['types'], by_number=False)
             print(f"✅ Загружен пример: {example['name']}")
-            self.current_table.print_table()
+            self.current_table.print_table(max_rows=PREVIEW_ROWS, max_col_width=PREVIEW_COL_WIDTH)
         else:
             print("❌ Неверный выбор")
 
@@ -0,0 +1,191 @@
+# io_binary.py
+import json
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from itertools import accumulate, chain
+from instrument import instrumented
+from storage import Column, TYPECODES
+from table import Table
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# File layout: MAGIC, header length (uint64 little-endian), JSON header, then the column
+# buffers. Every section starts at a multiple of _ALIGN so typed buffers can be viewed in place
+MAGIC = b'TBLBIN01'
+_ALIGN = 8
+_LENGTH = struct.Struct('<Q')
+
+
+class Utf8Column:
+    """
+    Строковый столбец поверх буфера UTF-8 и смещений строк (их n + 1).
+    Строка декодируется только при обращении к ней; None отмечены в карте nulls.
+    """
+    __slots__ = ('blob', 'offsets', 'nulls')
+
+    def __init__(self, blob: memoryview, offsets: memoryview, nulls: Optional[memoryview] = None):
+        self.blob = blob
+        self.offsets = offsets
+        self.nulls = nulls
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Utf8Column index out of range")
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        blob, offsets, nulls = self.blob, self.offsets, self.nulls
+        values = (str(blob[start:stop], 'utf-8') for start, stop in zip(offsets, offsets[1:]))
+        if nulls is None:
+            return values
+        return (None if null else value for value, null in zip(values, nulls))
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % _ALIGN)
+
+
+def _encode_column(column: Column) -> Tuple[str, List[Any]]:
+    """
+    Вид столбца в файле и его буферы:
+    - 'q'/'d'/'b' — типизированный буфер (+ карта None)
+    - 'utf8' — строки одним буфером UTF-8 + смещения (+ карта None)
+    - 'pickle' — остальные столбцы (смешанные типы, целые больше 64 бит) целиком через pickle
+    """
+    if column.typecode is not None:
+        return column.typecode, [column.data, column.nulls]
+    values = column.data
+    if all(type(v) is str for v in values if v is not None):
+        encoded = [b'' if v is None else v.encode('utf-8') for v in values]
+        offsets = array('q', chain((0,), accumulate(map(len, encoded))))
+        nulls = bytearray(v is None for v in values) if None in values else None
+        return 'utf8', [b''.join(encoded), offsets, nulls]
+    return 'pickle', [pickle.dumps(list(values), protocol=pickle.HIGHEST_PROTOCOL)]
+
+
+@instrumented()
+def save_table(table: Table, path: str):
+    """
+    Сохраняет Table в колоночный бинарный файл.
+    - заголовок JSON: имена столбцов, число строк, типы и расположение буферов
+    - затем по непрерывному буферу на столбец и карта None (1 байт на строку)
+    Колоночная таблица пишется прямо из своих буферов, без копирования значений.
+    """
+    try:
+        encoded = [_encode_column(table.get_column_buffer(idx)) for idx in range(len(table.columns))]
+        types = [[key, t.__name__] for key, t in table.types.items()]
+
+        # Lay out the buffers after a header whose size depends on the layout itself:
+        # offsets are written relative to the end of the header and shifted on load
+        layout = []
+        position = 0
+        for kind, buffers in encoded:
+            spans = []
+            for buffer in buffers:
+                if buffer is None:
+                    spans.append(None)
+                    continue
+                size = memoryview(buffer).nbytes
+                spans.append([position, size])
+                position += size + len(_padding(size))
+            layout.append({'kind': kind, 'buffers': spans})
+
+        header = json.dumps({
+            'columns': table.columns,
+            'n_rows': table.row_count(),
+            'types': types,
+            'byteorder': sys.byteorder,
+            'layout': layout,
+        }, ensure_ascii=False).encode('utf-8')
+
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(_padding(len(MAGIC) + _LENGTH.size + len(header)))
+            for _, buffers in encoded:
+                for buffer in buffers:
+                    if buffer is not None:
+                        f.write(buffer)
+                        f.write(_padding(memoryview(buffer).nbytes))
+    except Exception as e:
+        raise IOError(f"Error writing binary table file {path}: {e}")
+
+
+def _read_header(buffer: mmap.mmap) -> Tuple[Dict[str, Any], int]:
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary table file")
+    (length,) = _LENGTH.unpack_from(buffer, len(MAGIC))
+    start = len(MAGIC) + _LENGTH.size
+    header = json.loads(bytes(buffer[start:start + length]).decode('utf-8'))
+    data_start = start + length
+    return header, data_start + len(_padding(data_start))
+
+
+def _view(buffer: memoryview, span: Optional[List[int]], data_start: int, typecode: str = 'B'):
+    if span is None:
+        return None
+    position, size = span
+    view = buffer[data_start + position:data_start + position + size]
+    return view if typecode == 'B' else view.cast(typecode)
+
+
+def _decode_column(buffer: memoryview, kind: str, spans: List[Optional[List[int]]],
+                   data_start: int, swap: bool) -> Column:
+    if kind in TYPECODES.values():
+        data = _view(buffer, spans[0], data_start, kind)
+        if swap:
+            # Written on a machine with the other byte order: copy and swap
+            data = array(kind, data)
+            data.byteswap()
+        return Column(kind, data, _view(buffer, spans[1], data_start))
+    if kind == 'utf8':
+        offsets = _view(buffer, spans[1], data_start, 'q')
+        if swap:
+            offsets = array('q', offsets)
+            offsets.byteswap()
+        return Column(None, Utf8Column(_view(buffer, spans[0], data_start), offsets,
+                                       _view(buffer, spans[2], data_start)))
+    if kind == 'pickle':
+        return Column(None, pickle.loads(_view(buffer, spans[0], data_start)))
+    raise ValueError(f"unknown column kind '{kind}'")
+
+
+@instrumented()
+def load_table(path: str) -> Table:
+    """
+    Открывает бинарный файл таблицы через mmap и возвращает колоночную Table.
+    - числовые и bool столбцы и карты None — memoryview над файлом, без копирования
+    - строки декодируются при обращении, страницы файла читаются по мере надобности
+    - файл остаётся открытым, пока жива таблица (и любые её буферы)
+    """
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Binary table file not found: {path}")
+    except Exception as e:
+        raise IOError(f"Error reading binary table file {path}: {e}")
+
+    try:
+        header, data_start = _read_header(buffer)
+        swap = header['byteorder'] != sys.byteorder
+        view = memoryview(buffer)
+        columns = [_decode_column(view, entry['kind'], entry['buffers'], data_start, swap)
+                   for entry in header['layout']]
+        types = {key: type_name for key, type_name in header['types']}
+    except Exception as e:
+        raise IOError(f"Error reading binary table file {path}: {e}")
+
+    return Table.from_columns(header['columns'], columns, types=types, columnar=True)
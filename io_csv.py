@@ -1,98 +1,666 @@
 # io_csv.py
 import csv
-from table import Table
-from typing import Optional
+from array import array
+import io
+import os
+import random
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice, repeat
+from operator import itemgetter
+from compression import infer_compression, open_file
+from instrument import instrumented
+from storage import Column
+from table import Table, ColumnTypeError, TableError
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+DEFAULT_CHUNK_ROWS = 100_000
+# load_table parses in smaller chunks so raw csv rows are freed while still young for the GC
+_PARSE_CHUNK_ROWS = 10_000
+# Parallel load_table: files below this size are parsed serially, larger ones are split
+# into byte ranges of about _PART_BYTES so each worker task holds a bounded slice
+_PARALLEL_MIN_BYTES = 1 << 20
+_PART_BYTES = 64 << 20
+_SCAN_BLOCK = 16 << 20
+# save_table writes through a buffer of this size instead of the default 8 KiB
+_WRITE_BUFFER = 1 << 20
 
-def _is_float(value: str) -> bool:
+# Inferred column kinds from the narrowest to the widest
+_KINDS = ('bool', 'int', 'float', 'str')
+_BOOL_VALUES = {'true': True, 'false': False}
+_INT_PATTERN = re.compile(r'[+-]?\d+')
+
+
+def _to_bool(values: Iterable[str]) -> Iterator[bool]:
+    return map(_BOOL_VALUES.__getitem__, map(str.lower, values))
+
+
+def _to_int(values: Iterable[str]) -> Iterator[int]:
+    return map(int, values)
+
+
+def _to_float(values: Iterable[str]) -> Iterator[float]:
+    return map(float, values)
+
+
+# Bulk converters: each maps an iterable of non-empty strings
+_CONVERTERS = {'bool': _to_bool, 'int': _to_int, 'float': _to_float}
+_KIND_TYPES = {'bool': bool, 'int': int, 'float': float}
+
+
+# Row predicate of load_table(where=...): gets the row's values, returns whether to keep it
+RowPredicate = Callable[[List[Optional[str]]], Any]
+
+
+def _column_positions(header: List[str], usecols: Sequence[Union[int, str]]) -> List[int]:
+    # File positions of the usecols columns: numbers as they are, names looked up in the header
+    positions = []
+    for column in usecols:
+        if isinstance(column, int):
+            if not (0 <= column < len(header)):
+                raise IndexError(f"Column index {column} out of range [0, {len(header) - 1}]")
+            positions.append(column)
+        elif isinstance(column, str):
+            if column not in header:
+                raise KeyError(f"Column name '{column}' not found. Available: {header}")
+            positions.append(header.index(column))
+        else:
+            raise TypeError(f"Column must be int or str, got {type(column)}")
+    return positions
+
+
+def _normalize_chunk(raw_rows: List[List[str]], n_cols: int,
+                     positions: Optional[List[int]] = None) -> List[List[Optional[str]]]:
+    # Pad or cut rows to the header length, then strip values column by column: empty cells -> None.
+    # With positions only those columns are taken out of the rows, the other cells are never touched
+    for i, row in enumerate(raw_rows):
+        if len(row) != n_cols:
+            raw_rows[i] = (row + [''] * n_cols)[:n_cols]
+    n_out = n_cols if positions is None else len(positions)
+    if not raw_rows:
+        return [[] for _ in range(n_out)]
+    if positions is None:
+        selected = zip(*raw_rows)
+    else:
+        selected = (map(itemgetter(idx), raw_rows) for idx in positions)
+    columns = []
+    for column in selected:
+        values = list(map(str.strip, column))
+        if '' in values:
+            values = [value or None for value in values]
+        columns.append(values)
+    return columns
+
+
+def _filter_chunk(columns: List[List[Optional[str]]], where: RowPredicate, offset: int = 0,
+                  start_byte: Optional[int] = None) -> List[List[Optional[str]]]:
+    # Keeps the rows of a normalized chunk for which where is true. Errors name the data row
+    # (offset = number of the chunk's first row), or the row within a byte range of a parallel load
+    keep: List[bool] = []
+    append = keep.append
     try:
-        float(value)
-        return True
-    except ValueError:
-        return False
+        for row in zip(*columns):
+            append(bool(where(list(row))))
+    except Exception as e:
+        if start_byte is None:
+            raise TableError(f"where failed at data row {offset + len(keep)}: {e}") from e
+        raise TableError(f"where failed at row {len(keep)} of the part starting at byte {start_byte}: {e}") from e
+    if all(keep):
+        return columns
+    return [list(compress(values, keep)) for values in columns]
 
 
-def load_table(path: str, delimiter: str = ',', has_header: bool = True,
-               encoding: str = 'utf-8', auto_detect_types: bool = True) -> Table:
+def _iter_chunks(path: str, delimiter: str, has_header: bool, encoding: str, chunk_rows: int,
+                 compression: Optional[str] = 'infer', usecols: Optional[Sequence[Union[int, str]]] = None,
+                 where: Optional[RowPredicate] = None) -> Iterator[Tuple[List[str], List[List[Optional[str]]]]]:
     """
-    Загружает CSV в Table.
-    - пустые ячейки -> None
-    - если has_header=True: первая строка — имена столбцов, иначе генерируются col0,col1,...
-    - auto_detect_types: пытается автоматически определить типы числовых данных
+    Читает CSV частями: выдаёт (заголовок, нормализованные столбцы) не больше чем по chunk_rows строк.
+    В памяти одновременно находится только текущая часть сырых строк.
+    Для файла только с заголовком выдаёт одну пустую часть, для пустого файла — ничего.
+    usecols и where (см. load_table) применяются к каждой части до того, как её выдать.
     """
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
     try:
-        with open(path, 'r', newline='', encoding=encoding) as f:
+        with open_file(path, 'r', compression, encoding=encoding, newline='') as f:
             reader = csv.reader(f, delimiter=delimiter)
-            rows = list(reader)
+            first = next(reader, None)
+            if first is None:
+                return
+
+            # Handle header
+            if has_header:
+                header = [col.strip() for col in first]
+                raw_rows = []
+            else:
+                header = [f"col{i}" for i in range(len(first))]
+                raw_rows = [first]
+            n_cols = len(header)
+            positions = None if usecols is None else _column_positions(header, usecols)
+            if positions is not None:
+                header = [header[idx] for idx in positions]
+
+            raw_rows.extend(islice(reader, chunk_rows - len(raw_rows)))
+            offset = 0
+            while True:
+                n_rows = len(raw_rows)
+                columns = _normalize_chunk(raw_rows, n_cols, positions)
+                del raw_rows
+                if where is not None:
+                    columns = _filter_chunk(columns, where, offset)
+                yield header, columns
+                offset += n_rows
+                raw_rows = list(islice(reader, chunk_rows))
+                if not raw_rows:
+                    break
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV file not found: {path}")
+    except (TableError, KeyError, IndexError):
+        # A failing where and unknown usecols columns are not read errors
+        raise
     except Exception as e:
         raise IOError(f"Error reading CSV file {path}: {e}")
 
-    if not rows:
-        return Table(columns=[], rows=[])
 
-    # Handle header
-    if has_header:
-        header = [col.strip() for col in rows[0]]
-        data_rows = rows[1:]
+def _fits(values: List[str], kind: str) -> bool:
+    if kind == 'bool':
+        return set(_BOOL_VALUES).issuperset(map(str.lower, values))
+    if kind == 'int':
+        # Fast path for unsigned numbers, then signed ones such as '-5'
+        return all(map(str.isdecimal, values)) or all(map(_INT_PATTERN.fullmatch, values))
+    if kind == 'float':
+        try:
+            deque(map(float, values), maxlen=0)
+        except ValueError:
+            return False
+    return True
+
+
+def _widen(kind: Optional[str], values: List[Optional[str]]) -> Optional[str]:
+    """
+    Самый узкий тип из bool/int/float/str, которому подходят и уже просмотренные значения
+    столбца (их тип — kind, None если значений ещё не было), и values.
+    """
+    if None in values:
+        values = [v for v in values if v is not None]
+    if not values or kind == 'str':
+        return kind
+    if kind is None:
+        candidates = _KINDS
+    elif kind == 'bool':
+        candidates = ('bool', 'str')
     else:
-        n_cols = len(rows[0])
-        header = [f"col{i}" for i in range(n_cols)]
-        data_rows = rows
-
-    # Normalize rows
-    normalized_rows = []
-    for row_idx, row in enumerate(data_rows):
-        normalized_row = []
-        for i in range(len(header)):
-            if i < len(row):
-                value = row[i].strip()
-                normalized_row.append(value if value != '' else None)
+        candidates = _KINDS[_KINDS.index(kind):]
+    for candidate in candidates:
+        if _fits(values, candidate):
+            return candidate
+
+
+def _convert(values: List[Optional[str]], kind: Optional[str]) -> List[Any]:
+    converter = _CONVERTERS.get(kind)
+    if converter is None:
+        return values
+    if None not in values:
+        return list(converter(values))
+    # Convert the non-empty values in bulk and put them back around the None cells
+    converted = converter([v for v in values if v is not None])
+    return [None if v is None else next(converted) for v in values]
+
+
+def _sample(columns: List[List[Optional[str]]], sample_rows: int) -> List[List[Optional[str]]]:
+    # First sample_rows rows plus as many rows drawn uniformly from the rest. Every row is
+    # already parsed here, so the row count is known and random.sample replaces a reservoir
+    n_rows = len(columns[0]) if columns else 0
+    positions = list(range(min(sample_rows, n_rows)))
+    if n_rows > sample_rows:
+        rest = range(sample_rows, n_rows)
+        positions.extend(sorted(random.Random(0).sample(rest, min(sample_rows, len(rest)))))
+    return [[column[i] for i in positions] for column in columns]
+
+
+def _types_for(kinds: List[Optional[str]]) -> Dict[int, str]:
+    return {idx: kind for idx, kind in enumerate(kinds) if kind is not None}
+
+
+def _join_kinds(kind_a: Optional[str], kind_b: Optional[str]) -> Optional[str]:
+    # Narrowest kind that fits the values of both kinds
+    if kind_a is None or kind_a == kind_b:
+        return kind_b
+    if kind_b is None:
+        return kind_a
+    if {kind_a, kind_b} == {'int', 'float'}:
+        return 'float'
+    return 'str'
+
+
+def _supports_byte_split(encoding: str) -> bool:
+    # Record boundaries are found by scanning raw bytes for quotes and newlines,
+    # which only works when the encoding writes them as single ASCII bytes
+    try:
+        return '"\n'.encode(encoding) == b'"\n' and 'x'.encode(encoding) == b'x'
+    except LookupError:
+        return False
+
+
+def _record_ends(f, start: int, targets: List[int]) -> List[int]:
+    """
+    Для каждого смещения из targets (по возрастанию) — смещение сразу после первого
+    перевода строки не раньше него, который стоит вне кавычек (чётное число кавычек с start).
+    Если такого перевода строки нет — размер файла.
+    """
+    ends: List[int] = []
+    pending = iter(targets)
+    target = next(pending, None)
+    f.seek(start)
+    pos = start            # file offset of the current block
+    in_quotes = False      # quote parity at pos
+    while target is not None:
+        block = f.read(_SCAN_BLOCK)
+        if not block:
+            break
+        cursor, quotes = 0, in_quotes
+        while target is not None and target < pos + len(block):
+            nl = block.find(b'\n', max(target - pos, cursor))
+            if nl == -1:
+                break
+            quotes ^= bool(block.count(b'"', cursor, nl) & 1)
+            cursor = nl
+            if quotes:
+                # Newline inside a quoted field: the record goes on
+                target = pos + nl + 1
+                continue
+            end = pos + nl + 1
+            while target is not None and target < end:
+                ends.append(end)
+                target = next(pending, None)
+        in_quotes ^= bool(block.count(b'"') & 1)
+        pos += len(block)
+    if target is not None:
+        size = f.seek(0, os.SEEK_END)
+        ends.append(size)
+        ends.extend(size for _ in pending)
+    return ends
+
+
+def _parse_part(path: str, start: int, end: int, delimiter: str, encoding: str, n_cols: int,
+                auto_detect_types: bool, positions: Optional[List[int]] = None,
+                where: Optional[RowPredicate] = None, kinds: Optional[List[Optional[str]]] = None
+                ) -> Tuple[List[Optional[str]], List[Column]]:
+    """
+    Разбирает байты [start, end) файла (целое число записей) в процессе-исполнителе.
+    Возвращает типы столбцов и столбцы: int/float/bool — в типизированных буферах,
+    которые передаются в основной процесс как байты, без поэлементной сериализации.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    raw_rows = list(csv.reader(io.StringIO(text, newline=''), delimiter=delimiter))
+    del text
+    columns = _normalize_chunk(raw_rows, n_cols, positions)
+    del raw_rows
+    if where is not None:
+        columns = _filter_chunk(columns, where, start_byte=start)
+    if kinds is None:
+        kinds = [_widen(None, values) if auto_detect_types else None for values in columns]
+    return kinds, [Column.from_values(_convert(values, kind), _KIND_TYPES.get(kind, str))
+                   for values, kind in zip(columns, kinds)]
+
+
+def _recast(part: Column, kind: Optional[str], final_kind: Optional[str]) -> Optional[Column]:
+    # Column of one part as final_kind, or None if the part has to be parsed again
+    if kind == final_kind:
+        return part
+    if kind is None:
+        # Only empty cells in this part
+        return Column.from_values(part.to_list(), _KIND_TYPES.get(final_kind, str))
+    if kind == 'int' and final_kind == 'float':
+        if part.typecode is None:
+            return Column.from_values([None if v is None else float(v) for v in part.data], float)
+        return Column('d', array('d', part.data), part.nulls)
+    return None
+
+
+def _load_parallel(path: str, delimiter: str, has_header: bool, encoding: str,
+                   auto_detect_types: bool, workers: int, columnar: bool,
+                   usecols: Optional[Sequence[Union[int, str]]] = None,
+                   where: Optional[RowPredicate] = None) -> Table:
+    """
+    load_table с разбором в workers процессах.
+    Файл делится на диапазоны байт по границам записей: граница — перевод строки
+    вне кавычек, поэтому переводы строк внутри полей в кавычках не разрывают запись.
+    Каждый диапазон разбирается и приводится к типам независимо, затем типы столбцов
+    объединяются (int + float -> float, иначе str), а буферы столбцов склеиваются.
+    """
+    with open(path, 'rb') as f:
+        data_start = _record_ends(f, 0, [0])[0]
+        f.seek(0)
+        first_record = f.read(data_start).decode(encoding)
+        size = f.seek(0, os.SEEK_END)
+        first = next(csv.reader(io.StringIO(first_record, newline=''), delimiter=delimiter), None)
+        if first is None:
+            return Table(columns=[], rows=[])
+        if has_header:
+            header = [col.strip() for col in first]
+        else:
+            header = [f"col{i}" for i in range(len(first))]
+            data_start = 0
+        n_cols = len(header)
+        positions = None if usecols is None else _column_positions(header, usecols)
+        if positions is not None:
+            header = [header[idx] for idx in positions]
+
+        n_parts = max(workers, -(-(size - data_start) // _PART_BYTES))
+        step = (size - data_start) / n_parts
+        targets = [data_start + int(step * k) for k in range(1, n_parts)]
+        bounds = sorted({data_start, size, *_record_ends(f, data_start, targets)})
+    ranges = [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+    starts, ends = [r[0] for r in ranges], [r[1] for r in ranges]
+    n_out = len(header)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_parse_part, repeat(path), starts, ends, repeat(delimiter),
+                              repeat(encoding), repeat(n_cols), repeat(auto_detect_types),
+                              repeat(positions), repeat(where)))
+        kinds: List[Optional[str]] = [None] * n_out
+        for part_kinds, _ in parts:
+            kinds = [_join_kinds(kind, part_kind) for kind, part_kind in zip(kinds, part_kinds)]
+
+        # Parts whose converted values cannot be widened (e.g. bool -> str) are parsed again
+        columns: List[List[Optional[Column]]] = [[] for _ in range(n_out)]
+        redo = []
+        for i, (part_kinds, part_columns) in enumerate(parts):
+            recast = [_recast(c, k, final) for c, k, final in zip(part_columns, part_kinds, kinds)]
+            if None in recast:
+                redo.append(i)
+            for idx, column in enumerate(recast):
+                columns[idx].append(column)
+        del parts
+        redone = pool.map(_parse_part, repeat(path), [starts[i] for i in redo], [ends[i] for i in redo],
+                          repeat(delimiter), repeat(encoding), repeat(n_cols),
+                          repeat(auto_detect_types), repeat(positions), repeat(where), repeat(kinds))
+        for i, (_, part_columns) in zip(redo, redone):
+            for idx, column in enumerate(part_columns):
+                columns[idx][i] = column
+
+    data = [Column.concat(parts) if parts else [] for parts in columns]
+    return Table.from_columns(header, data, types=_types_for(kinds), columnar=columnar)
+
+
+@instrumented()
+def load_table(path: str, delimiter: str = ',', has_header: bool = True,
+               encoding: str = 'utf-8', auto_detect_types: bool = True,
+               sample_rows: Optional[int] = None, workers: int = 1,
+               columnar: bool = False, compression: Optional[str] = 'infer',
+               usecols: Optional[Sequence[Union[int, str]]] = None,
+               where: Optional[RowPredicate] = None) -> Table:
+    """
+    Загружает CSV в Table.
+    - пустые ячейки -> None
+    - если has_header=True: первая строка — имена столбцов, иначе генерируются col0,col1,...
+    - auto_detect_types: определяет типы int/float/bool/str за тот же проход, что и разбор файла
+    - sample_rows: определять типы только по первым sample_rows строкам и стольким же случайным
+      из остальных; если дальше встретится неподходящее значение, тип столбца расширяется
+    - файл читается частями, сырые строки целиком в памяти не держатся
+    - workers > 1: файл делится на диапазоны байт по границам записей, которые разбираются
+      параллельно в процессах (см. _load_parallel); sample_rows при этом не используется,
+      типы определяются по всем строкам. Для кодировок, где кавычка и перевод строки
+      не однобайтовые (например utf-16), для сжатых и небольших файлов чтение последовательное
+    - columnar: вернуть таблицу с колоночным хранилищем
+    - compression: сжатие файла ('infer' — по расширению, см. compression.open_file);
+      сжатый файл распаковывается потоком по мере чтения
+    - usecols: загрузить только эти столбцы (номера или имена в файле) в указанном порядке;
+      ячейки остальных столбцов не нормализуются, типы для них не определяются
+    - where: функция строки -> истина, если строку оставить. Получает список значений
+      загружаемых столбцов (порядок usecols) до приведения типов: строки без пробелов
+      по краям, пустые ячейки -> None. Проверяется при разборе каждой части, поэтому
+      отброшенные строки не хранятся и не участвуют в определении типов; ошибка функции ->
+      TableError с номером строки. При workers > 1 функция передаётся в процессы
+      и должна сериализоваться pickle (функция уровня модуля, не lambda)
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    if workers > 1 and _supports_byte_split(encoding) and infer_compression(path, compression) is None:
+        try:
+            parallel = os.path.getsize(path) >= _PARALLEL_MIN_BYTES
+        except OSError:
+            parallel = False
+        if parallel:
+            try:
+                return _load_parallel(path, delimiter, has_header, encoding, auto_detect_types,
+                                      workers, columnar, usecols, where)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"CSV file not found: {path}")
+            except (TableError, KeyError, IndexError):
+                raise
+            except Exception as e:
+                raise IOError(f"Error reading CSV file {path}: {e}")
+
+    header = None
+    columns: List[List[Optional[str]]] = []
+    kinds: List[Optional[str]] = []
+    for header, chunk in _iter_chunks(path, delimiter, has_header, encoding, _PARSE_CHUNK_ROWS,
+                                      compression, usecols, where):
+        if not columns:
+            columns = [[] for _ in header]
+            kinds = [None] * len(header)
+        if auto_detect_types and sample_rows is None:
+            kinds = [_widen(kind, values) for kind, values in zip(kinds, chunk)]
+        for column, values in zip(columns, chunk):
+            column.extend(values)
+
+    if header is None:
+        return Table(columns=[], rows=[])
+
+    if auto_detect_types and sample_rows is not None:
+        kinds = [_widen(None, values) for values in _sample(columns, sample_rows)]
+        # A column with no values in the sample gets its type from all of its values
+        kinds = [_widen(None, column) if kind is None else kind for kind, column in zip(kinds, columns)]
+
+    for idx, kind in enumerate(kinds):
+        try:
+            columns[idx] = _convert(columns[idx], kind)
+        except (ValueError, KeyError):
+            # A value outside the sample contradicts the inferred type
+            kinds[idx] = _widen(kind, columns[idx])
+            columns[idx] = _convert(columns[idx], kinds[idx])
+
+    return Table.from_columns(header, columns, types=_types_for(kinds), columnar=columnar)
+
+
+def _convert_chunk_column(values: List[Optional[str]], kind: Optional[str], offset: int, col_idx: int):
+    try:
+        return _convert(values, kind)
+    except (ValueError, KeyError):
+        pass
+    converter = _CONVERTERS[kind]
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        try:
+            next(converter([value]))
+        except (ValueError, KeyError) as e:
+            raise ColumnTypeError(f"Row {offset + i}, column {col_idx}: "
+                                  f"Cannot convert value {value!r} to {kind}: {e}") from e
+
+
+def _detect_kinds(path: str, delimiter: str, has_header: bool, encoding: str, compression: Optional[str],
+                  usecols: Optional[Sequence[Union[int, str]]] = None,
+                  where: Optional[RowPredicate] = None) -> List[Optional[str]]:
+    # Kind of every column over all (kept) rows, widened chunk by chunk as in load_table
+    kinds: List[Optional[str]] = []
+    for header, chunk in _iter_chunks(path, delimiter, has_header, encoding, DEFAULT_CHUNK_ROWS,
+                                      compression, usecols, where):
+        if not kinds:
+            kinds = [None] * len(header)
+        kinds = [_widen(kind, values) for kind, values in zip(kinds, chunk)]
+    return kinds
+
+
+def detect_types(path: str, delimiter: str = ',', has_header: bool = True, encoding: str = 'utf-8',
+                 compression: Optional[str] = 'infer',
+                 usecols: Optional[Sequence[Union[int, str]]] = None,
+                 where: Optional[RowPredicate] = None) -> Dict[int, type]:
+    """
+    Типы столбцов CSV, которые load_table определил бы по всем строкам, за один проход
+    частями, без загрузки файла: {номер столбца: тип} для столбцов, где есть значения.
+    С usecols просматриваются только эти столбцы, номера — по порядку usecols;
+    с where — только оставленные строки.
+    """
+    kinds = _detect_kinds(path, delimiter, has_header, encoding, compression, usecols, where)
+    return {idx: _KIND_TYPES.get(kind, str) for idx, kind in enumerate(kinds) if kind is not None}
+
+
+def iter_tables(path: str, delimiter: str = ',', has_header: bool = True,
+                encoding: str = 'utf-8', auto_detect_types: bool = True,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                types: Optional[Dict[Union[int, str], Union[type, str]]] = None,
+                compression: Optional[str] = 'infer',
+                usecols: Optional[Sequence[Union[int, str]]] = None,
+                where: Optional[RowPredicate] = None) -> Iterator[Table]:
+    """
+    Читает CSV по частям и выдаёт Table не больше чем по chunk_rows строк.
+    - у всех частей один заголовок и одни типы столбцов
+    - типы берутся из types (ключи — номера или имена столбцов),
+      иначе при auto_detect_types определяются как в load_table по всем строкам
+      (отдельный потоковый проход по файлу перед первой частью, см. detect_types)
+    - значение части, не приводимое к типу из types -> ColumnTypeError
+      с номером строки от начала данных
+    - compression, usecols, where: как в load_table; отброшенные where строки не попадают
+      в части, поэтому части бывают короче chunk_rows, а номера строк в ошибках типов
+      считаются по оставленным строкам
+    """
+    kinds = None
+    if types is None and auto_detect_types:
+        kinds = _detect_kinds(path, delimiter, has_header, encoding, compression, usecols, where)
+    offset = 0
+    for header, chunk in _iter_chunks(path, delimiter, has_header, encoding, chunk_rows,
+                                      compression, usecols, where):
+        n_rows = len(chunk[0]) if chunk else 0
+        if types is not None:
+            table = Table.from_columns(header, chunk)
+            shared_types = {(k if isinstance(k, int) else _column_positions(header, [k])[0]): t
+                            for k, t in types.items()}
+            try:
+                table.set_column_types(shared_types)
+            except ColumnTypeError as e:
+                raise ColumnTypeError(f"Chunk starting at data row {offset}: {e}") from e
+        else:
+            if kinds is None:
+                kinds = [None] * len(header)
+            data = [_convert_chunk_column(values, kind, offset, idx)
+                    for idx, (values, kind) in enumerate(zip(chunk, kinds))]
+            table = Table.from_columns(header, data, types=_types_for(kinds))
+        offset += n_rows
+        yield table
+
+
+def _part_column(column: Column, start: int, stop: int) -> Union[Column, List[Any]]:
+    # Rows [start, stop) of a column in a form that pickles cheaply for a worker process:
+    # typed values stay in an array buffer, views over a mapped file are copied out
+    if column.typecode is None:
+        return list(column.data[start:stop])
+    nulls = column.nulls[start:stop] if column.nulls is not None else None
+    return Column(column.typecode, array(column.typecode, column.data[start:stop]),
+                  bytearray(nulls) if nulls is not None else None)
+
+
+def _prepend(first: Table, rest: Iterator[Table]) -> Iterator[Table]:
+    # Hands out first without keeping a reference to it once it is written
+    pending = [first]
+    del first
+    while pending:
+        yield pending.pop()
+    yield from rest
+
+
+def _parts(tables: Iterable[Table], chunk_rows: int) -> Iterator[List[Union[Column, List[Any]]]]:
+    # Values of every chunk_rows rows, column by column
+    for table in tables:
+        n_cols, n_rows = len(table.columns), table.row_count()
+        row_iter = table.iter_rows()
+        for start in range(0, n_rows, chunk_rows):
+            stop = min(start + chunk_rows, n_rows)
+            if table.columnar:
+                yield [_part_column(column, start, stop) for column in table._store.columns]
             else:
-                normalized_row.append(None)
-        normalized_rows.append(normalized_row)
+                rows = list(islice(row_iter, stop - start))
+                yield [list(map(itemgetter(idx), rows)) for idx in range(n_cols)]
 
-    # Create table
-    table = Table(columns=header, rows=normalized_rows)
 
-    # Auto-detect types if requested
-    if auto_detect_types and normalized_rows:
-        type_suggestions = {}
-        for col_idx, col_name in enumerate(header):
-            # Get sample of non-None values
-            sample_values = [row[col_idx] for row in normalized_rows if row[col_idx] is not None]
-            if sample_values:
-                first_val = sample_values[0]
-                # Check if all values are integers
-                if all(isinstance(v, str) and v.isdigit() for v in sample_values if v is not None):
-                    type_suggestions[col_idx] = 'int'
-                # Check if all values are floats
-                elif all(isinstance(v, str) and _is_float(v) for v in sample_values if v is not None):
-                    type_suggestions[col_idx] = 'float'
+def _format_part(columns: List[Union[Column, List[Any]]], delimiter: str) -> str:
+    """
+    CSV-текст части строк: каждая ячейка переводится в строку один раз, None -> пустая ячейка.
+    """
+    cells = []
+    for values in columns:
+        if isinstance(values, Column):
+            values = values.to_list()
+        if None in values:
+            cells.append(['' if v is None else str(v) for v in values])
+        else:
+            cells.append(list(map(str, values)))
+    # Cells that need no quoting are joined directly: that is exactly what the csv writer
+    # (QUOTE_MINIMAL) would produce, and far cheaper. Checking one joined string per column
+    # is a single scan; a lone empty field is quoted by the writer, so it takes that path
+    special = (delimiter, '"', '\r', '\n')
+    plain = all(not any(char in text for char in special) for text in map(''.join, cells))
+    if plain and not (len(cells) == 1 and '' in cells[0]):
+        return ''.join([line + '\r\n' for line in map(delimiter.join, zip(*cells))])
+    buffer = io.StringIO(newline='')
+    csv.writer(buffer, delimiter=delimiter).writerows(zip(*cells))
+    return buffer.getvalue()
 
-        if type_suggestions:
-            table.set_column_types(type_suggestions)
 
-    return table
+def _ordered_map(pool: ProcessPoolExecutor, fn, items: Iterable[Any], window: int, *args) -> Iterator[Any]:
+    # Like pool.map, but keeps at most window items in flight instead of submitting all at once
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
 
 
-def save_table(table: Table, path: str, delimiter: str = ',',
-               has_header: bool = True, encoding: str = 'utf-8'):
+@instrumented()
+def save_table(table: Union[Table, Iterable[Table]], path: str, delimiter: str = ',',
+               has_header: bool = True, encoding: str = 'utf-8',
+               chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1,
+               compression: Optional[str] = 'infer', compression_level: Optional[int] = None):
     """
     Сохраняет Table в CSV файл.
+    - table может быть и итератором частей Table с одинаковыми столбцами (например, из iter_tables):
+      части пишутся по мере получения, заголовок берётся из первой
+    - строки форматируются частями по chunk_rows (по столбцам, каждая ячейка — один раз)
+      и пишутся одним вызовом на часть через большой буфер записи
+    - workers > 1: части форматируются в процессах, а записываются по порядку;
+      одновременно в работе не больше 2 * workers частей
+    - compression, compression_level: сжатие файла ('infer' — по расширению) и его уровень
     """
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    tables = iter([table] if isinstance(table, Table) else table)
     try:
-        with open(path, 'w', newline='', encoding=encoding) as f:
-            writer = csv.writer(f, delimiter=delimiter)
-
+        first = next(tables, None)
+        with open_file(path, 'w', compression, compression_level, encoding=encoding, newline='',
+                       buffering=_WRITE_BUFFER) as f:
+            if first is None:
+                return
             if has_header:
-                writer.writerow(table.columns)
+                csv.writer(f, delimiter=delimiter).writerow(first.columns)
 
-            for row in table.rows:
-                # Convert None to empty string, other values to string
-                csv_row = ['' if value is None else str(value) for value in row]
-                writer.writerow(csv_row)
+            parts = _parts(_prepend(first, tables), chunk_rows)
+            del first
+            if workers == 1:
+                for part in parts:
+                    f.write(_format_part(part, delimiter))
+                return
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for text in _ordered_map(pool, _format_part, parts, 2 * workers, delimiter):
+                    f.write(text)
 
     except Exception as e:
-        raise IOError(f"Error writing CSV file {path}: {e}")
\ No newline at end of file
+        raise IOError(f"Error writing CSV file {path}: {e}")
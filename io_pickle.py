@@ -1,13 +1,19 @@
 # io_pickle.py
 import pickle
+from typing import Optional
+
+from compression import open_file
+from instrument import instrumented
 from table import Table
 
-def load_table(path: str) -> Table:
+@instrumented()
+def load_table(path: str, compression: Optional[str] = 'infer') -> Table:
     """
     Загружает Table из pickle файла.
+    - compression: сжатие файла ('infer' — по расширению, см. compression.open_file)
     """
     try:
-        with open(path, 'rb') as f:
+        with open_file(path, 'rb', compression) as f:
             data = pickle.load(f)
     except FileNotFoundError:
         raise FileNotFoundError(f"Pickle file not found: {path}")
@@ -22,12 +28,15 @@ def load_table(path: str) -> Table:
     else:
         raise TypeError(f"Unsupported data format in pickle file: {type(data)}")
 
-def save_table(table: Table, path: str):
+@instrumented()
+def save_table(table: Table, path: str, compression: Optional[str] = 'infer',
+               compression_level: Optional[int] = None):
     """
     Сохраняет Table в pickle файл.
+    - compression, compression_level: сжатие файла ('infer' — по расширению) и его уровень
     """
     try:
-        with open(path, 'wb') as f:
+        with open_file(path, 'wb', compression, compression_level) as f:
             # Save as dictionary representation for compatibility
             pickle.dump(table.as_dict(), f)
     except Exception as e:
@@ -1,45 +1,25 @@
 # io_text.py
+from typing import Optional, Sequence
+
+from compression import open_file
+from instrument import instrumented
+from render import DEFAULT_CHUNK_ROWS, write_table
 from table import Table
 
 
-def save_table(table: Table, path: str, encoding: str = 'utf-8'):
+@instrumented()
+def save_table(table: Table, path: str, encoding: str = 'utf-8',
+               widths: Optional[Sequence[int]] = None, sample_rows: Optional[int] = None,
+               chunk_rows: int = DEFAULT_CHUNK_ROWS, compression: Optional[str] = 'infer',
+               compression_level: Optional[int] = None):
     """
     Сохраняет текстовое представление таблицы (такое же, как print_table) в файл.
+    - widths или sample_rows: потоковая запись с заданными ширинами столбцов
+      или ширинами по первым sample_rows строкам (см. render.write_table)
+    - compression, compression_level: сжатие файла ('infer' — по расширению) и его уровень
     """
     try:
-        with open(path, 'w', encoding=encoding) as f:
-            if not table.columns:
-                f.write("Empty table\n")
-                return
-
-            # Calculate column widths
-            widths = []
-            for col_idx, col_name in enumerate(table.columns):
-                max_width = len(str(col_name))
-                for row in table.rows:
-                    if col_idx < len(row):
-                        value_str = "<None>" if row[col_idx] is None else str(row[col_idx])
-                        max_width = max(max_width, len(value_str))
-                widths.append(max_width)
-
-            # Write header
-            header = " | ".join(str(table.columns[i]).ljust(widths[i]) for i in range(len(table.columns)))
-            separator = "-+-".join('-' * widths[i] for i in range(len(table.columns)))
-
-            f.write(header + "\n")
-            f.write(separator + "\n")
-
-            # Write rows
-            for row in table.rows:
-                row_strs = []
-                for i in range(len(table.columns)):
-                    if i < len(row):
-                        value = row[i]
-                        value_str = "<None>" if value is None else str(value)
-                    else:
-                        value_str = "<None>"
-                    row_strs.append(value_str.ljust(widths[i]))
-                f.write(" | ".join(row_strs) + "\n")
-
+        with open_file(path, 'w', compression, compression_level, encoding=encoding) as f:
+            write_table(table, f, widths, sample_rows, chunk_rows)
     except Exception as e:
-        raise IOError(f"Error writing text file {path}: {e}")
\ No newline at end of file
+        raise IOError(f"Error writing text file {path}: {e}")
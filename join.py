@@ -0,0 +1,187 @@
+# join.py
+import operator
+from itertools import islice
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from table import Table, TableError
+
+JOIN_KINDS = ('inner', 'left', 'outer')
+
+# Position of a missing row on one side of an output row
+_MISSING = -1
+
+
+def _key_values(table: Table, on: Sequence[Union[int, str]]) -> List[Any]:
+    # Typed key of every row: a single value or a tuple for several columns.
+    # NaN equals nothing, like None; a shared NaN object would still match itself in a dict
+    values = [table.get_values(column) for column in on]
+    values = [[None if v != v else v for v in column] if table._type_for(key) is float else column
+              for key, column in zip(on, values)]
+    if len(values) == 1:
+        return values[0]
+    return [None if None in key else key for key in zip(*values)]
+
+
+def _is_sorted(keys: List[Any]) -> bool:
+    # None keys never match and cannot be ordered: such input goes to the hash join
+    if None in keys:
+        return False
+    try:
+        return all(map(operator.le, keys, islice(keys, 1, None)))
+    except TypeError:
+        return False
+
+
+def _hash_join(left_keys: List[Any], right_keys: List[Any], how: str) -> Tuple[List[int], List[int]]:
+    keep_left, keep_right = how in ('left', 'outer'), how == 'outer'
+    matched = set()
+    if len(right_keys) <= len(left_keys):
+        # Build on the right side and probe it with the left rows in order
+        buckets: Dict[Any, List[int]] = {}
+        for j, key in enumerate(right_keys):
+            if key is not None:
+                buckets.setdefault(key, []).append(j)
+        left_pos: List[int] = []
+        right_pos: List[int] = []
+        for i, key in enumerate(left_keys):
+            match = buckets.get(key) if key is not None else None
+            if match:
+                left_pos.extend([i] * len(match))
+                right_pos.extend(match)
+                if keep_right:
+                    matched.add(key)
+            elif keep_left:
+                left_pos.append(i)
+                right_pos.append(_MISSING)
+    else:
+        # Build on the smaller left side; the pairs found while probing with the right rows
+        # are put back in left row order, so the result does not depend on the build side
+        buckets = {}
+        for i, key in enumerate(left_keys):
+            if key is not None:
+                buckets.setdefault(key, []).append(i)
+        pairs: List[Tuple[int, int]] = []
+        for j, key in enumerate(right_keys):
+            match = buckets.get(key) if key is not None else None
+            if match:
+                pairs.extend([(i, j) for i in match])
+                matched.add(key)
+        if keep_left:
+            pairs.extend((i, _MISSING) for i, key in enumerate(left_keys) if key is None or key not in matched)
+        pairs.sort()
+        left_pos = [i for i, _ in pairs]
+        right_pos = [j for _, j in pairs]
+
+    if keep_right:
+        only_right = [j for j, key in enumerate(right_keys) if key is None or key not in matched]
+        left_pos.extend([_MISSING] * len(only_right))
+        right_pos.extend(only_right)
+    return left_pos, right_pos
+
+
+def _merge_join(left_keys: List[Any], right_keys: List[Any], how: str) -> Tuple[List[int], List[int]]:
+    # Both key lists are sorted: walk them together run by run
+    keep_left, keep_right = how in ('left', 'outer'), how == 'outer'
+    left_pos: List[int] = []
+    right_pos: List[int] = []
+    only_right: List[int] = []
+    n_left, n_right = len(left_keys), len(right_keys)
+    i = j = 0
+    while i < n_left:
+        key = left_keys[i]
+        i_end = i + 1
+        while i_end < n_left and left_keys[i_end] == key:
+            i_end += 1
+        while j < n_right and right_keys[j] < key:
+            only_right.append(j)
+            j += 1
+        j_end = j
+        while j_end < n_right and right_keys[j_end] == key:
+            j_end += 1
+        if j_end > j:
+            for row in range(i, i_end):
+                left_pos.extend([row] * (j_end - j))
+                right_pos.extend(range(j, j_end))
+        elif keep_left:
+            left_pos.extend(range(i, i_end))
+            right_pos.extend([_MISSING] * (i_end - i))
+        i, j = i_end, j_end
+    if keep_right:
+        only_right.extend(range(j, n_right))
+        left_pos.extend([_MISSING] * len(only_right))
+        right_pos.extend(only_right)
+    return left_pos, right_pos
+
+
+def _gather(values: List[Any], positions: List[int]) -> List[Any]:
+    # The appended None is what position -1 (a missing row) picks
+    return list(map((values + [None]).__getitem__, positions))
+
+
+def _declared_type(table: Table, idx: int):
+    types = table.types
+    if table.columns[idx] in types or idx in types:
+        return table._storage_type(idx)
+    return None
+
+
+def join_tables(left: Table, right: Table, on: Union[int, str, Sequence[Union[int, str]]],
+                how: str = 'inner', suffix: str = '_right') -> Table:
+    """
+    Соединение двух Table по равенству ключевых столбцов on (есть в обеих таблицах).
+    - how: 'inner' — только совпавшие строки, 'left' — и строки left без пары,
+      'outer' — и строки обеих таблиц без пары (строки right без пары идут в конце)
+    - ключи сравниваются после приведения к типам столбцов, None и NaN не совпадают ни с чем
+    - строки результата идут в порядке строк left, пары одной строки — в порядке строк right
+    - столбцы: ключи (один раз, имена и типы left), остальные столбцы left, затем right;
+      к имени столбца right, уже занятому, добавляется suffix
+    Обычно строится хеш-таблица по меньшей стороне; если обе таблицы уже отсортированы
+    по ключу, используется слияние без хеш-таблицы. Результат от способа не зависит.
+    """
+    if how not in JOIN_KINDS:
+        raise ValueError(f"Unknown join kind '{how}'. Available: {list(JOIN_KINDS)}")
+    on = [on] if isinstance(on, (int, str)) else list(on)
+    if not on:
+        raise TableError("join needs at least one key column")
+    left_on = [left._col_index(column) for column in on]
+    right_on = [right._col_index(column) for column in on]
+
+    left_keys, right_keys = _key_values(left, on), _key_values(right, on)
+    if _is_sorted(left_keys) and _is_sorted(right_keys):
+        try:
+            left_pos, right_pos = _merge_join(left_keys, right_keys, how)
+        except TypeError:
+            # Keys of the two sides cannot be ordered against each other
+            left_pos, right_pos = _hash_join(left_keys, right_keys, how)
+    else:
+        try:
+            left_pos, right_pos = _hash_join(left_keys, right_keys, how)
+        except TypeError as e:
+            raise TableError(f"Cannot join on columns {on}: {e}") from e
+
+    names: List[str] = []
+    data: List[List[Any]] = []
+    types: Dict[int, type] = {}
+
+    def add(name: str, values: List[Any], col_type):
+        if col_type is not None:
+            types[len(names)] = col_type
+        names.append(name)
+        data.append(values)
+
+    # Rows of right without a pair (outer) are at the end and take their key from right
+    n_both = len(left_pos) - left_pos.count(_MISSING)
+    for left_idx, right_idx in zip(left_on, right_on):
+        values = _gather(left._store.column(left_idx), left_pos[:n_both])
+        values.extend(_gather(right._store.column(right_idx), right_pos[n_both:]))
+        add(left.columns[left_idx], values, _declared_type(left, left_idx))
+    for idx in range(len(left.columns)):
+        if idx not in left_on:
+            add(left.columns[idx], _gather(left._store.column(idx), left_pos), _declared_type(left, idx))
+    for idx in range(len(right.columns)):
+        if idx not in right_on:
+            name = right.columns[idx]
+            add(name + suffix if name in names else name,
+                _gather(right._store.column(idx), right_pos), _declared_type(right, idx))
+
+    return Table.from_columns(names, data, types=types, columnar=left.columnar)
@@ -0,0 +1,108 @@
+# mask.py
+from itertools import compress
+from typing import Any, Iterable, Iterator, List, Union
+
+from index import RowPositions
+
+# bytes.translate tables: any non-zero byte -> 1, and 0 <-> 1
+_NORMALIZE = bytes([0] + [1] * 255)
+_INVERT = bytes([1, 0] + [0] * 254)
+
+
+class Mask:
+    """
+    Булева маска строк (результат eq/gr/ls/ge/le/ne): по байту 0/1 на строку
+    вместо списка объектов bool.
+    - &, |, ^, ~ — поэлементные И, ИЛИ, исключающее ИЛИ, НЕ (второй операнд — Mask
+      или последовательность bool той же длины)
+    - count() — число истинных строк, nonzero() — их номера по возрастанию
+    - ведёт себя как список bool: len, итерация, индексы, сравнение со списком и такой же вывод
+    filter_rows принимает маску напрямую и проходит только по истинным строкам.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, values: Union['Mask', bytes, bytearray, Iterable[Any]] = ()):
+        if isinstance(values, Mask):
+            self._data = bytearray(values._data)
+        elif isinstance(values, (bytes, bytearray)):
+            self._data = bytearray(values.translate(_NORMALIZE))
+        else:
+            self._data = bytearray(map(bool, values))
+
+    @classmethod
+    def _wrap(cls, data: bytearray) -> 'Mask':
+        # Takes a bytearray of 0/1 bytes as it is, without a copy
+        mask = cls.__new__(cls)
+        mask._data = data
+        return mask
+
+    @classmethod
+    def concat(cls, masks: Iterable['Mask']) -> 'Mask':
+        return cls._wrap(bytearray(b''.join(mask._data for mask in masks)))
+
+    def __reduce__(self):
+        return Mask, (bytes(self._data),)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[bool]:
+        return map(bool, self._data)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[bool, 'Mask']:
+        if isinstance(index, slice):
+            return Mask._wrap(self._data[index])
+        return bool(self._data[index])
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Mask):
+            return self._data == other._data
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self._data) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def _other(self, other: Any) -> bytearray:
+        data = other._data if isinstance(other, Mask) else Mask(other)._data
+        if len(data) != len(self._data):
+            raise ValueError(f"Masks of different lengths: {len(self._data)} and {len(data)}")
+        return data
+
+    def _bitwise(self, other: Any, op) -> 'Mask':
+        # Bytes are 0 or 1, so a bitwise operation on the whole buffer read as one integer
+        # is the element-wise one, done in C
+        n = len(self._data)
+        a = int.from_bytes(self._data, 'little')
+        b = int.from_bytes(self._other(other), 'little')
+        return Mask._wrap(bytearray(op(a, b).to_bytes(n, 'little')))
+
+    def __and__(self, other: Any) -> 'Mask':
+        return self._bitwise(other, int.__and__)
+
+    def __or__(self, other: Any) -> 'Mask':
+        return self._bitwise(other, int.__or__)
+
+    def __xor__(self, other: Any) -> 'Mask':
+        return self._bitwise(other, int.__xor__)
+
+    __rand__ = __and__
+    __ror__ = __or__
+    __rxor__ = __xor__
+
+    def __invert__(self) -> 'Mask':
+        return Mask._wrap(self._data.translate(_INVERT))
+
+    def count(self, value: bool = True) -> int:
+        # Like list.count: mask.count() and mask.count(True) count the true rows
+        ones = self._data.count(1)
+        return ones if value else len(self._data) - ones
+
+    def nonzero(self) -> RowPositions:
+        return RowPositions(compress(range(len(self._data)), self._data))
+
+    def to_list(self) -> List[bool]:
+        return list(self)
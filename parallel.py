@@ -0,0 +1,155 @@
+# parallel.py
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, repeat
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from mask import Mask
+from table import Table, TableError, ColumnRef, Literal, ARITHMETIC_OPS, COMPARISON_OPS
+
+# Tables with fewer rows are computed in the calling process: starting workers costs more
+_PARALLEL_MIN_ROWS = 100_000
+# Row errors of Table operations read "<op> failed at row <i>: ..."
+_ROW_ERROR = re.compile(r'^(\w+) failed at row (\d+):')
+
+Operation = Sequence[Any]
+
+
+def _check(ops: Sequence[Operation]) -> List[Tuple[str, Any, Any, Optional[Union[int, str]]]]:
+    # (op_name, col_a, col_b_or_scalar, result_column or None) of every operation
+    checked = []
+    for op in ops:
+        if not 3 <= len(op) <= 4:
+            raise ValueError(f"Operation must be (name, col_a, col_b_or_scalar[, result_column]), got {op!r}")
+        op_name = op[0]
+        if op_name not in ARITHMETIC_OPS and op_name not in COMPARISON_OPS:
+            raise ValueError(f"Unknown operation '{op_name}'. "
+                             f"Available: {list(ARITHMETIC_OPS) + list(COMPARISON_OPS)}")
+        result_column = op[3] if len(op) == 4 else None
+        if op_name in COMPARISON_OPS and result_column is not None:
+            raise ValueError(f"Comparison '{op_name}' takes no result column")
+        checked.append((op_name, op[1], op[2], result_column))
+    return checked
+
+
+def _apply(table: Table, op_name: str, col_a, col_b_or_scalar, result_column) -> Any:
+    if result_column is None:
+        return getattr(table, op_name)(col_a, col_b_or_scalar)
+    getattr(table, op_name)(col_a, col_b_or_scalar, result_column)
+    # The stored values as _store_result got them, before later operations can overwrite them
+    return table._store.column(table._col_index(result_column))
+
+
+def _run_chunk(names: List[str], types: Dict[Union[int, str], type], data: List[List[Any]], columnar: bool,
+               ops) -> Tuple[List[Any], Optional[Tuple[int, BaseException]]]:
+    """
+    Выполняет операции по порядку над строками одной части таблицы (в процессе-исполнителе).
+    Возвращает результаты выполненных операций и (номер операции, исключение),
+    если одна из них не удалась: следующие операции этой части не выполняются.
+    """
+    table = Table.from_columns(names, data, types=types, columnar=columnar)
+    del data
+    results: List[Any] = []
+    for k, op in enumerate(ops):
+        try:
+            results.append(_apply(table, *op))
+        except Exception as e:
+            return results, (k, e)
+    return results, None
+
+
+def _used_columns(table: Table, ops) -> List[int]:
+    # Source columns the operations can read; the others are sent to workers as None
+    used = set()
+    for _, col_a, col_b_or_scalar, _ in ops:
+        for operand in (col_a, col_b_or_scalar):
+            if isinstance(operand, ColumnRef):
+                operand = operand.column
+            elif isinstance(operand, Literal):
+                continue
+            if table._is_column(operand):
+                used.add(table._col_index(operand))
+    return sorted(used)
+
+
+def _shifted(error: BaseException, offset: int) -> BaseException:
+    # A row error of a part names the row within the part: renumber it from the table start
+    match = _ROW_ERROR.match(str(error)) if isinstance(error, TableError) else None
+    if match is None or not offset:
+        return error
+    row = int(match.group(2)) + offset
+    return type(error)(f"{match.group(1)} failed at row {row}:{str(error)[match.end():]}")
+
+
+def _executor(workers: int):
+    # Threads only run Python code in parallel on a free-threaded build (no GIL)
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    if is_gil_enabled is not None and not is_gil_enabled():
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def compute_many(table: Table, ops: Sequence[Operation], workers: int = 1) -> List[Any]:
+    """
+    Выполняет арифметику и сравнения Table в указанном порядке, как последовательные вызовы
+    table.add/.../ne: ops — кортежи (имя, col_a, col_b_or_scalar[, result_column]).
+    Возвращает результат каждой операции: список значений, Mask для сравнений,
+    None для арифметики с result_column (столбец записывается в table).
+    - workers > 1: строки делятся на workers частей, каждая часть выполняет все операции
+      по порядку в своём процессе (в потоке — на сборке Python без GIL), результаты
+      склеиваются. Операции построчные, поэтому операция может читать столбец,
+      записанный предыдущей
+    - ошибка — та же, что при последовательных вызовах: первая по порядку операция,
+      которая не удалась, с номером строки от начала таблицы; результаты предыдущих
+      операций при этом уже записаны
+    Небольшие таблицы (меньше _PARALLEL_MIN_ROWS строк) считаются в текущем процессе.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    ops = _check(ops)
+    n_rows = table.row_count()
+    if workers == 1 or n_rows < _PARALLEL_MIN_ROWS or not ops or not n_rows:
+        results = []
+        for op_name, col_a, col_b_or_scalar, result_column in ops:
+            if result_column is None:
+                results.append(getattr(table, op_name)(col_a, col_b_or_scalar))
+            else:
+                results.append(getattr(table, op_name)(col_a, col_b_or_scalar, result_column))
+        return results
+
+    used = _used_columns(table, ops)
+    columns = {idx: table._store.column(idx) for idx in used}
+    step = -(-n_rows // workers)
+    starts = list(range(0, n_rows, step))
+
+    def chunk_data(start: int) -> List[List[Any]]:
+        stop = min(start + step, n_rows)
+        return [columns[idx][start:stop] if idx in columns else [None] * (stop - start)
+                for idx in range(len(table.columns))]
+
+    with _executor(workers) as pool:
+        parts = list(pool.map(_run_chunk, repeat(list(table.columns)), repeat(dict(table.types)),
+                              map(chunk_data, starts), repeat(table.columnar), repeat(ops)))
+    del columns
+
+    # Sequential calls stop at the first operation that fails and report its first bad row:
+    # the smallest failed operation number, and for it the earliest part
+    failure = min(((failed[0], i) for i, (_, failed) in enumerate(parts) if failed is not None), default=None)
+    n_done = len(ops) if failure is None else failure[0]
+
+    results: List[Any] = []
+    for k in range(n_done):
+        chunks = [part_results[k] for part_results, _ in parts]
+        result_column = ops[k][3]
+        if ops[k][0] in COMPARISON_OPS:
+            results.append(Mask.concat(chunks))
+        elif result_column is None:
+            results.append(list(chain.from_iterable(chunks)))
+        else:
+            table._store_result(result_column, list(chain.from_iterable(chunks)))
+            results.append(None)
+    if failure is not None:
+        k, i = failure
+        raise _shifted(parts[i][1][1], starts[i])
+    return results
@@ -0,0 +1,267 @@
+# query.py
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import vectorized
+from instrument import instrumented
+from schema import ColumnNames
+from table import Table, TableError, ARITHMETIC_OPS, COMPARISON_OPS, column_index, column_operand
+
+# Recorded step: (operation, col_a, col_b_or_scalar, result_column or None for a filter)
+Step = Tuple[str, Any, Any, Optional[Union[int, str]]]
+
+
+class Query:
+    """
+    Ленивый план над Table: фильтры, арифметика и выбор столбцов записываются
+    и выполняются в collect() за один проход по строкам.
+    - eq/gr/ls/ge/le/ne(col_a, col_b_or_scalar) — фильтр, все фильтры объединяются через И
+    - add/sub/mul/div(col_a, col_b_or_scalar, result_column) — новый или изменённый столбец
+    - select(*columns) — столбцы результата и их порядок
+    Значения, типы и ошибки те же, что у одноимённых методов Table, применённых по очереди.
+    Фильтр выполняется раньше арифметики, результат которой он не читает, поэтому
+    арифметика считается только для прошедших все такие фильтры строк.
+    Построчная таблица обрабатывается за один проход по строкам, номер строки в ошибке —
+    номер строки исходной таблицы. Колоночная таблица при установленном NumPy обрабатывается
+    векторными операциями Table в том же порядке шагов (номер строки — в промежуточном результате).
+    Тип нового столбца, как и в Table, определяется по его значениям, но только в строках результата.
+    """
+
+    def __init__(self, table: Table):
+        self._table = table
+        self._steps: List[Step] = []
+        self._selected: Optional[Tuple[Union[int, str], ...]] = None
+
+    def _filter(self, op_name: str, col_a, col_b_or_scalar) -> 'Query':
+        self._steps.append((op_name, col_a, col_b_or_scalar, None))
+        return self
+
+    def _arithmetic(self, op_name: str, col_a, col_b_or_scalar, result_column: Union[int, str]) -> 'Query':
+        if result_column is None:
+            raise TableError(f"{op_name} in a query needs result_column")
+        self._steps.append((op_name, col_a, col_b_or_scalar, result_column))
+        return self
+
+    def eq(self, col_a, col_b_or_scalar) -> 'Query':
+        return self._filter('eq', col_a, col_b_or_scalar)
+
+    def gr(self, col_a, col_b_or_scalar) -> 'Query':
+        return self._filter('gr', col_a, col_b_or_scalar)
+
+    def ls(self, col_a, col_b_or_scalar) -> 'Query':
+        return self._filter('ls', col_a, col_b_or_scalar)
+
+    def ge(self, col_a, col_b_or_scalar) -> 'Query':
+        return self._filter('ge', col_a, col_b_or_scalar)
+
+    def le(self, col_a, col_b_or_scalar) -> 'Query':
+        return self._filter('le', col_a, col_b_or_scalar)
+
+    def ne(self, col_a, col_b_or_scalar) -> 'Query':
+        return self._filter('ne', col_a, col_b_or_scalar)
+
+    def add(self, col_a, col_b_or_scalar, result_column: Union[int, str]) -> 'Query':
+        return self._arithmetic('add', col_a, col_b_or_scalar, result_column)
+
+    def sub(self, col_a, col_b_or_scalar, result_column: Union[int, str]) -> 'Query':
+        return self._arithmetic('sub', col_a, col_b_or_scalar, result_column)
+
+    def mul(self, col_a, col_b_or_scalar, result_column: Union[int, str]) -> 'Query':
+        return self._arithmetic('mul', col_a, col_b_or_scalar, result_column)
+
+    def div(self, col_a, col_b_or_scalar, result_column: Union[int, str]) -> 'Query':
+        return self._arithmetic('div', col_a, col_b_or_scalar, result_column)
+
+    def select(self, *columns: Union[int, str]) -> 'Query':
+        self._selected = columns
+        return self
+
+    @instrumented()
+    def collect(self, copy_table: bool = False) -> Table:
+        plan, n_new = _Planner(self._table).plan(self._steps)
+        if self._table.columnar and vectorized.available():
+            result = self._collect_columns(plan, copy_table)
+        else:
+            result = self._collect_rows(plan, n_new, copy_table)
+        if self._selected is not None:
+            result = result._select([result._col_index(c) for c in self._selected])
+        return result
+
+    def _collect_columns(self, plan, copy_table: bool) -> Table:
+        # Typed column buffers are faster to process whole in NumPy than row by row:
+        # the steps run as Table operations in plan order, so filters still come first
+        result = self._table
+        for _, _, _, (op_name, col_a, col_b_or_scalar, result_column) in plan:
+            if result_column is None:
+                result = result.filter_rows(getattr(result, op_name)(col_a, col_b_or_scalar), copy_table)
+                continue
+            if result is self._table:
+                result = result._take(range(result.row_count()), copy_table)
+            getattr(result, op_name)(col_a, col_b_or_scalar, result_column)
+        if result is self._table:
+            result = result._take(range(result.row_count()), copy_table)
+        return result
+
+    def _collect_rows(self, plan, n_new: int, copy_table: bool) -> Table:
+        # Each row is evaluated as its cells followed by the results of the arithmetic steps
+        n_cols = len(self._table.columns)
+        extra = [None] * n_new
+        positions: List[int] = []
+        outputs: List[List[Any]] = [[] for _ in range(n_new)]
+        for i, row in enumerate(self._table.iter_rows()):
+            values = row + extra if n_new else row
+            for op_name, slot, evaluate, _ in plan:
+                try:
+                    value = evaluate(values)
+                except Exception as e:
+                    raise TableError(f"{op_name} failed at row {i}: {e}") from e
+                if slot is None:
+                    if not value:
+                        break
+                else:
+                    values[slot] = value
+            else:
+                positions.append(i)
+                for output, value in zip(outputs, values[n_cols:]):
+                    output.append(value)
+
+        result = self._table._take(positions, copy_table)
+        arithmetic = [step for step in self._steps if step[3] is not None]
+        for (_, _, _, result_column), values in zip(arithmetic, outputs):
+            result._store_result(result_column, values)
+        return result
+
+
+class _Planner:
+    """
+    Разрешает операнды шагов так же, как Table после выполнения предыдущих шагов
+    (новые столбцы добавляются в конец, типы — по тем же правилам),
+    и строит список (имя операции, слот результата или None для фильтра, функция от строки).
+    """
+
+    def __init__(self, table: Table):
+        self.table = table
+        self.columns = ColumnNames(table.columns)
+        self.types = dict(table.types)
+        # Position of each column's value in the evaluated row: cells of the source
+        # table first, then one slot per arithmetic step
+        self.slots: List[int] = list(range(len(self.columns)))
+        self.n_source = len(self.columns)
+
+    def _col_index(self, column: Union[int, str]) -> int:
+        return column_index(self.columns, column)
+
+    def _operand(self, value: Any) -> Tuple[bool, Any]:
+        return column_operand(self.columns, value)
+
+    def _column_key(self, column: Any) -> Union[int, str]:
+        return self.table._column_key(column)
+
+    def _type_for(self, column: Union[int, str]) -> type:
+        if column in self.types:
+            return self.table._normalize_type(self.types[column])
+        return self.table._normalize_type(self.types.get(self._col_index(column), str))
+
+    def _slot(self, column: Union[int, str]) -> int:
+        return self.slots[self._col_index(column)]
+
+    def _comparison(self, op_name: str, col_a, col_b_or_scalar):
+        col_a = self._column_key(col_a)
+        is_column, col_b_or_scalar = self._operand(col_b_or_scalar)
+        compare, convert = COMPARISON_OPS[op_name], self.table._convert_value
+        slot_a, type_a = self._slot(col_a), self._type_for(col_a)
+        if is_column:
+            slot_b, type_b = self._slot(col_b_or_scalar), self._type_for(col_b_or_scalar)
+
+            def evaluate(values):
+                a, b = values[slot_a], values[slot_b]
+                if a is None or b is None:
+                    return False
+                if type(a) is not type_a:
+                    a = convert(a, type_a)
+                if type(b) is not type_b:
+                    b = convert(b, type_b)
+                return bool(compare(a, b))
+        else:
+            scalar = col_b_or_scalar
+
+            def evaluate(values):
+                a = values[slot_a]
+                if a is None:
+                    return False
+                if type(a) is not type_a:
+                    a = convert(a, type_a)
+                return bool(compare(a, scalar))
+        return evaluate
+
+    def _arithmetic(self, op_name: str, col_a, col_b_or_scalar):
+        col_a = self._column_key(col_a)
+        is_column, col_b_or_scalar = self._operand(col_b_or_scalar)
+        operation, convert = ARITHMETIC_OPS[op_name], self.table._convert_value
+        slot_a, type_a = self._slot(col_a), self._type_for(col_a)
+        if is_column:
+            slot_b, type_b = self._slot(col_b_or_scalar), self._type_for(col_b_or_scalar)
+
+            def evaluate(values):
+                a, b = values[slot_a], values[slot_b]
+                if a is None or b is None:
+                    return None
+                if type(a) is not type_a:
+                    a = convert(a, type_a)
+                if type(b) is not type_b:
+                    b = convert(b, type_b)
+                return operation(float(a), float(b))
+        else:
+            scalar = col_b_or_scalar
+
+            def evaluate(values):
+                a = values[slot_a]
+                if a is None:
+                    return None
+                if type(a) is not type_a:
+                    a = convert(a, type_a)
+                return operation(float(a), float(scalar))
+        return evaluate
+
+    def _add_result(self, result_column: Union[int, str], slot: int):
+        # Same naming and typing as Table._store_result
+        if isinstance(result_column, int):
+            if result_column < 0 or result_column > len(self.columns):
+                raise IndexError(f"Result column index {result_column} out of range")
+            if result_column == len(self.columns):
+                self.columns.append(f"col{result_column}")
+                self.slots.append(slot)
+        elif result_column not in self.columns:
+            self.columns.append(result_column)
+            self.slots.append(slot)
+        self.slots[self._col_index(result_column)] = slot
+        if result_column not in self.types:
+            self.types[result_column] = float
+
+    def plan(self, steps) -> Tuple[List[Tuple[str, Optional[int], Callable, Step]], int]:
+        # A filter moves ahead of arithmetic steps whose results it does not read,
+        # but never ahead of an earlier filter: those decide which rows it sees
+        plan: List[Tuple[str, Optional[int], Callable, Step]] = []
+        producers: Dict[int, int] = {}
+        last_filter = -1
+        n_new = 0
+        for step in steps:
+            op_name, col_a, col_b_or_scalar, result_column = step
+            if result_column is None:
+                evaluate = self._comparison(op_name, col_a, col_b_or_scalar)
+                is_column, operand = self._operand(col_b_or_scalar)
+                reads = [self._slot(self._column_key(col_a))] + ([self._slot(operand)] if is_column else [])
+                after = max((producers[slot] for slot in reads if slot in producers), default=-1)
+                insert_at = max(after, last_filter) + 1
+                plan.insert(insert_at, (op_name, None, evaluate, step))
+                last_filter = insert_at
+                for slot, position in producers.items():
+                    if position >= insert_at:
+                        producers[slot] = position + 1
+            else:
+                evaluate = self._arithmetic(op_name, col_a, col_b_or_scalar)
+                slot = self.n_source + n_new
+                self._add_result(result_column, slot)
+                producers[slot] = len(plan)
+                plan.append((op_name, slot, evaluate, step))
+                n_new += 1
+        return plan, n_new
@@ -0,0 +1,150 @@
+# render.py
+from itertools import islice, repeat
+from operator import itemgetter
+from typing import Any, List, Optional, Sequence, TextIO
+
+# Text of a None cell and the number of rows formatted per write
+NONE_TEXT = "<None>"
+DEFAULT_CHUNK_ROWS = 10_000
+# Preview: the row standing for the rows left out and the end of a clipped cell
+ELLIPSIS = "..."
+CLIP_MARK = "…"
+
+
+def _cells(values: Sequence[Any]) -> List[str]:
+    # Every cell is converted to text exactly once
+    if None in values:
+        return [NONE_TEXT if v is None else str(v) for v in values]
+    return list(map(str, values))
+
+
+def _padded(rows: List[List[Any]], n_cols: int) -> List[List[Any]]:
+    # Rows edited in place through table.rows may be short: their missing cells are None
+    if rows and set(map(len, rows)) != {n_cols}:
+        return [(list(row) + [None] * n_cols)[:n_cols] for row in rows]
+    return rows
+
+
+def _row_cells(rows: List[List[Any]], n_cols: int) -> List[List[str]]:
+    # Cells of a chunk of rows, column by column
+    rows = _padded(rows, n_cols)
+    return [_cells(list(map(itemgetter(idx), rows))) for idx in range(n_cols)]
+
+
+def _table_cells(table) -> List[List[str]]:
+    if table.columnar:
+        return [_cells(table._store.column(idx)) for idx in range(len(table.columns))]
+    # Not table.rows: handing out the rows makes a row-range view copy them
+    return _row_cells(list(table.iter_rows()), len(table.columns))
+
+
+def _clip(text: str, width: int) -> str:
+    return text if len(text) <= width else text[:width - 1] + CLIP_MARK
+
+
+def _widths(names: List[str], columns: List[List[str]]) -> List[int]:
+    return [max(len(name), max(map(len, cells), default=0)) for name, cells in zip(names, columns)]
+
+
+def _write_header(out: TextIO, names: List[str], widths: List[int]):
+    header = " | ".join(name.ljust(width) for name, width in zip(names, widths))
+    separator = "-+-".join('-' * width for width in widths)
+    out.write(header + "\n" + separator + "\n")
+
+
+def _write_lines(out: TextIO, columns: List[List[str]], widths: List[int]):
+    if not columns or not columns[0]:
+        return
+    padded = [list(map(str.ljust, cells, repeat(width))) for cells, width in zip(columns, widths)]
+    out.write("\n".join(map(" | ".join, zip(*padded))) + "\n")
+
+
+def _write_blocks(out: TextIO, columns: List[List[str]], widths: List[int], chunk_rows: int):
+    for start in range(0, len(columns[0]), chunk_rows):
+        _write_lines(out, [cells[start:start + chunk_rows] for cells in columns], widths)
+
+
+def write_table(table, out: TextIO, widths: Optional[Sequence[int]] = None,
+                sample_rows: Optional[int] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Пишет текстовое представление таблицы (формат print_table) в out.
+    - каждая ячейка переводится в строку один раз, строки пишутся блоками по chunk_rows
+    - по умолчанию ширины столбцов — по всем ячейкам, поэтому строки всей таблицы держатся в памяти
+    - потоковый режим: widths (ширина каждого столбца) или sample_rows (ширины по заголовку
+      и первым sample_rows строкам); строки таблицы переводятся в текст по одному блоку,
+      а значения шире столбца выводятся целиком и сдвигают строку
+    """
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+    n_cols = len(table.columns)
+    if not n_cols:
+        out.write("Empty table\n")
+        return
+    names = [str(name) for name in table.columns]
+
+    if widths is None and sample_rows is None:
+        columns = _table_cells(table)
+        widths = _widths(names, columns)
+        _write_header(out, names, widths)
+        _write_blocks(out, columns, widths, chunk_rows)
+        return
+
+    rows = table.iter_rows()
+    if widths is None:
+        head = _row_cells(list(islice(rows, sample_rows)), n_cols)
+        widths = _widths(names, head)
+        _write_header(out, names, widths)
+        _write_lines(out, head, widths)
+        del head
+    else:
+        widths = list(widths)
+        if len(widths) != n_cols:
+            raise ValueError(f"Got {len(widths)} widths for {n_cols} columns")
+        _write_header(out, names, widths)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            break
+        _write_lines(out, _row_cells(chunk, n_cols), widths)
+
+
+def write_preview(table, out: TextIO, max_rows: Optional[int] = None, max_col_width: Optional[int] = None):
+    """
+    Пишет в out ограниченный просмотр таблицы в формате print_table.
+    - max_rows: если строк больше, выводятся первые и последние строки (всего max_rows),
+      между ними строка ELLIPSIS, а в конце — размер таблицы
+    - max_col_width: ячейки и имена длиннее обрезаются до этой ширины с CLIP_MARK в конце
+    Ширины считаются только по выводимым строкам, поэтому при max_rows время не зависит
+    от размера таблицы.
+    """
+    if max_rows is not None and max_rows < 0:
+        raise ValueError(f"max_rows must be non-negative, got {max_rows}")
+    if max_col_width is not None and max_col_width < 1:
+        raise ValueError(f"max_col_width must be positive, got {max_col_width}")
+    n_cols = len(table.columns)
+    if not n_cols:
+        out.write("Empty table\n")
+        return
+
+    n_rows = table.row_count()
+    truncated = max_rows is not None and n_rows > max_rows
+    shown = table
+    if truncated:
+        n_tail = max_rows // 2
+        n_head = max_rows - n_tail
+        shown = table._take(list(range(n_head)) + list(range(n_rows - n_tail, n_rows)))
+
+    names = [str(name) for name in table.columns]
+    columns = _table_cells(shown)
+    if truncated:
+        for cells in columns:
+            cells.insert(n_head, ELLIPSIS)
+    if max_col_width is not None:
+        names = [_clip(name, max_col_width) for name in names]
+        columns = [[_clip(cell, max_col_width) for cell in cells] for cells in columns]
+
+    widths = _widths(names, columns)
+    _write_header(out, names, widths)
+    _write_blocks(out, columns, widths, DEFAULT_CHUNK_ROWS)
+    if truncated:
+        out.write(f"[{n_rows} rows x {n_cols} columns]\n")
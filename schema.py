@@ -0,0 +1,80 @@
+# schema.py
+from itertools import count
+from typing import Any, Dict, Optional
+
+# Versions are unique across all objects, so replacing table.columns or table.types
+# with a new object also changes the version a cache was built for
+_versions = count(1)
+
+
+def _tracked(method):
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class ColumnNames(list):
+    """
+    Имена столбцов Table: обычный список, который отмечает свои изменения.
+    - version меняется при любом изменении списка
+    - position(name) — номер первого столбца с таким именем по словарю имя -> номер,
+      который перестраивается только после изменения списка
+    """
+    # Class-level defaults: pickle and copy fill the list before restoring __dict__
+    version = 0
+    _positions: Optional[Dict[str, int]] = None
+
+    def __init__(self, names=()):
+        super().__init__(names)
+        self._changed()
+
+    def _changed(self):
+        self.version = next(_versions)
+        self._positions = None
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # Versions are counted anew in every process: an unpickled list takes a fresh one
+        self.__dict__.update(state)
+        self._changed()
+
+    def position(self, name: str) -> Optional[int]:
+        positions = self._positions
+        if positions is None:
+            positions = {}
+            for i, column in enumerate(self):
+                positions.setdefault(column, i)
+            self._positions = positions
+        return positions.get(name)
+
+
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend',
+              'insert', 'pop', 'remove', 'clear', 'sort', 'reverse'):
+    setattr(ColumnNames, _name, _tracked(getattr(list, _name)))
+
+
+class ColumnTypes(dict):
+    """
+    Типы столбцов Table (ключ — номер или имя столбца): обычный словарь,
+    version которого меняется при любом его изменении.
+    """
+    version = 0
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._changed()
+
+    def _changed(self):
+        self.version = next(_versions)
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._changed()
+
+
+for _name in ('__setitem__', '__delitem__', '__ior__', 'clear', 'pop', 'popitem',
+              'setdefault', 'update'):
+    setattr(ColumnTypes, _name, _tracked(getattr(dict, _name)))
@@ -0,0 +1,195 @@
+# sorting.py
+import heapq
+import os
+import tempfile
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import io_binary
+import vectorized
+from instrument import instrumented
+from io_csv import detect_types, iter_tables, save_table
+from table import Table, TableError, ColumnTypeError
+
+DEFAULT_RUN_ROWS = 1_000_000
+
+
+def _sort_spec(table: Table, columns: Union[int, str, Sequence[Union[int, str]]],
+               descending: Union[bool, Sequence[bool]]) -> List[Tuple[Union[int, str], bool]]:
+    columns = [columns] if isinstance(columns, (int, str)) else list(columns)
+    if not columns:
+        raise TableError("sort needs at least one column")
+    if isinstance(descending, bool):
+        descending = [descending] * len(columns)
+    elif len(descending) != len(columns):
+        raise TableError(f"Got {len(descending)} descending flags for {len(columns)} columns")
+    for column in columns:
+        table._col_index(column)
+    return list(zip(columns, descending))
+
+
+def _sort_pass(table: Table, column: Union[int, str], descending: bool, order: List[int]) -> List[int]:
+    # One stable pass over a single key: values of the column type, None and NaN at the end
+    buffer = table._typed_column(column) if vectorized.available() else None
+    if buffer is not None:
+        return vectorized.sort_positions(buffer, order, descending)
+
+    values = table.get_values(column)
+    missing: List[int] = []
+    if None in values or table._type_for(column) is float:
+        missing = [i for i in order if values[i] is None or values[i] != values[i]]
+        if missing:
+            order = [i for i in order if values[i] is not None and values[i] == values[i]]
+    try:
+        order.sort(key=values.__getitem__, reverse=descending)
+    except TypeError as e:
+        raise TableError(f"Cannot sort by column {column}: {e}") from e
+    return order + missing
+
+
+def sort_table(table: Table, columns: Union[int, str, Sequence[Union[int, str]]],
+               descending: Union[bool, Sequence[bool]] = False, copy_table: bool = False) -> Table:
+    """
+    Новая Table со строками, упорядоченными по столбцам columns (первый — главный ключ).
+    - значения сравниваются в типах столбцов; None и NaN всегда идут в конце
+    - descending: одно значение для всех столбцов или по флагу на столбец
+    - сортировка устойчивая: строки с равными ключами сохраняют исходный порядок
+    Ключи сортируются по одному, от последнего к первому, устойчивыми проходами:
+    типизированные буферы колоночной таблицы при установленном NumPy — через argsort.
+    """
+    spec = _sort_spec(table, columns, descending)
+    order = list(range(table.row_count()))
+    for column, column_descending in reversed(spec):
+        order = _sort_pass(table, column, column_descending, order)
+    return table._take(order, copy_table)
+
+
+class _Descending:
+    """
+    Значение ключа слияния с обратным порядком сравнения.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: '_Descending') -> bool:
+        return self.value == other.value
+
+
+def _merge_key(spec: List[Tuple[int, bool]]) -> Callable[[List[Any]], Tuple[Tuple[int, Any], ...]]:
+    # Same order as sort_table: (0, value) for values, (1, 0) puts None and NaN last
+    def key(row: List[Any]) -> Tuple[Tuple[int, Any], ...]:
+        parts = []
+        for idx, column_descending in spec:
+            value = row[idx]
+            if value is None or value != value:
+                parts.append((1, 0))
+            else:
+                parts.append((0, _Descending(value) if column_descending else value))
+        return tuple(parts)
+    return key
+
+
+def _merged_tables(header: List[str], rows: Iterator[List[Any]], run_rows: int) -> Iterator[Table]:
+    # Merged rows handed to io_csv.save_table in chunks of run_rows
+    while True:
+        chunk = list(islice(rows, run_rows))
+        if not chunk:
+            return
+        yield Table.from_rows(header, chunk)
+
+
+def _key_types(src: str, first: Table, key_idx: List[int], types, delimiter: str, has_header: bool,
+               encoding: str) -> List[type]:
+    # Type of every sort key: from types, else inferred over the whole file like load_table does
+    given = {}
+    for column, col_type in (types or {}).items():
+        given[first._col_index(column)] = first._normalize_type(col_type)
+    missing = [idx for idx in dict.fromkeys(key_idx) if idx not in given]
+    if missing:
+        detected = detect_types(src, delimiter, has_header, encoding, usecols=missing)
+        given.update((missing[k], col_type) for k, col_type in detected.items())
+    return [given.get(idx, str) for idx in key_idx]
+
+
+def _sorted_run(chunk: Table, spec: List[Tuple[int, bool]], key_types: List[type], offset: int) -> Table:
+    """
+    Часть, отсортированная по ключам: текстовые ячейки как в файле и за ними
+    по столбцу значений каждого ключа, приведённых к типу ключа.
+    """
+    n_cols = len(chunk.columns)
+    keys = [f"key{k}" for k in range(len(spec))]
+    data = [chunk.get_values(idx) for idx in range(n_cols)]
+    run = Table.from_columns(list(chunk.columns) + keys, data + [data[idx] for idx, _ in spec])
+    try:
+        run.set_column_types({n_cols + k: col_type for k, col_type in enumerate(key_types)})
+    except ColumnTypeError as e:
+        raise ColumnTypeError(f"Chunk starting at data row {offset}: {e}") from e
+    return sort_table(run, list(range(n_cols, n_cols + len(spec))), [d for _, d in spec])
+
+
+@instrumented()
+def sort_csv(src: str, dst: str, columns: Union[int, str, Sequence[Union[int, str]]],
+             descending: Union[bool, Sequence[bool]] = False, run_rows: int = DEFAULT_RUN_ROWS,
+             delimiter: str = ',', has_header: bool = True, encoding: str = 'utf-8',
+             types=None, tmp_dir: Optional[str] = None):
+    """
+    Сортирует CSV-файл src в dst, держа в памяти не больше run_rows строк (внешняя сортировка слиянием).
+    - ячейки переписываются в dst тем же текстом, что в src; к типу приводятся только ключи сортировки:
+      типы из types (ключи — номера или имена столбцов), иначе — как их определил бы load_table
+      по всему файлу (отдельный проход только по столбцам ключей)
+    - src читается частями по run_rows строк (io_csv.iter_tables), каждая часть сортируется
+      sort_table и сбрасывается во временный бинарный файл (io_binary)
+    - затем отсортированные части сливаются: файлы частей открыты через mmap,
+      в памяти — по одной текущей строке каждой части
+    - порядок тот же, что у sort_table над всем файлом, включая устойчивость
+    Файл из одной части сортируется в памяти и записывается сразу.
+    """
+    chunks = iter_tables(src, delimiter=delimiter, has_header=has_header, encoding=encoding,
+                         auto_detect_types=False, chunk_rows=run_rows)
+    first = next(chunks, None)
+    if first is None:
+        save_table([], dst, delimiter, has_header, encoding)
+        return
+    header = list(first.columns)
+    n_cols = len(header)
+    spec = [(first._col_index(column), column_descending)
+            for column, column_descending in _sort_spec(first, columns, descending)]
+    key_types = _key_types(src, first, [idx for idx, _ in spec], types, delimiter, has_header, encoding)
+    second = next(chunks, None)
+    if second is None:
+        run = _sorted_run(first, spec, key_types, 0)
+        save_table(run._select(range(n_cols)), dst, delimiter, has_header, encoding)
+        return
+
+    buffered = [first, second]
+    del first, second
+
+    def tables() -> Iterator[Table]:
+        # Hands out the chunks already read without keeping references to them
+        while buffered:
+            yield buffered.pop(0)
+        yield from chunks
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        paths = []
+        offset = 0
+        for chunk in tables():
+            paths.append(os.path.join(run_dir, f"run{len(paths)}.bin"))
+            io_binary.save_table(_sorted_run(chunk, spec, key_types, offset), paths[-1])
+            offset += chunk.row_count()
+            del chunk
+
+        runs = [io_binary.load_table(path) for path in paths]
+        key = _merge_key([(n_cols + k, column_descending) for k, (_, column_descending) in enumerate(spec)])
+        try:
+            merged = heapq.merge(*[run.iter_rows() for run in runs], key=key)
+            rows = (row[:n_cols] for row in merged)
+            save_table(_merged_tables(header, rows, run_rows), dst, delimiter, has_header, encoding)
+        finally:
+            # The run files stay mapped while their tables are alive
+            del runs
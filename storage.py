@@ -0,0 +1,381 @@
+# storage.py
+import gc
+import weakref
+from array import array
+from contextlib import contextmanager
+from copy import deepcopy
+from itertools import compress, count
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+# Column types that can live in a typed buffer and their array typecodes
+TYPECODES = {int: 'q', float: 'd', bool: 'b'}
+
+# Cell types that are never changed in place: a deep copy of the table can share them
+IMMUTABLE_TYPES = frozenset({int, float, bool, str, bytes, complex, type(None)})
+
+
+def copy_values(values: Sequence[Any], deep: bool = False) -> List[Any]:
+    # deep copies only the mutable cells (lists, dicts, ...); typed cells are shared
+    if not deep or IMMUTABLE_TYPES.issuperset(map(type, values)):
+        return list(values)
+    return [v if type(v) in IMMUTABLE_TYPES else deepcopy(v) for v in values]
+
+
+@contextmanager
+def gc_paused():
+    # Copying many rows creates many surviving lists, which would trigger repeated full
+    # collections that scan every row of the table; none of them can free anything here
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class Column:
+    """
+    Столбец колоночного хранилища.
+    - int/float/bool хранятся в типизированном буфере array.array,
+      а None отмечаются в отдельной карте пропусков nulls (1 байт на строку)
+    - data и nulls могут быть и memoryview (например, над файлом в mmap): Column их не изменяет
+    - остальные столбцы (и столбцы, где значения ещё не приведены к типу) — обычный список
+    """
+    __slots__ = ('typecode', 'data', 'nulls')
+
+    def __init__(self, typecode: Optional[str], data: Any, nulls: Optional[bytearray] = None):
+        self.typecode = typecode
+        self.data = data
+        self.nulls = nulls
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any], col_type: type = str) -> 'Column':
+        typecode = TYPECODES.get(col_type)
+        # Only values that already have exactly the column type go to a buffer:
+        # bool is a subclass of int and must not silently turn into 0/1
+        if typecode is not None and all(type(v) is col_type for v in values if v is not None):
+            nulls = bytearray(v is None for v in values)
+            if 1 not in nulls:
+                nulls = None
+                filled = values
+            else:
+                fill = col_type()
+                filled = [fill if v is None else v for v in values]
+            try:
+                return cls(typecode, array(typecode, filled), nulls)
+            except OverflowError:
+                # Integers beyond 64 bits stay in a plain list
+                pass
+        return cls(None, list(values))
+
+    def __reduce__(self):
+        # Buffers shared through a memoryview (a row range, a mapped file) pickle as copies
+        data, nulls = self.data, self.nulls
+        if isinstance(data, memoryview):
+            data = array(self.typecode, data.tobytes())
+        if isinstance(nulls, memoryview):
+            nulls = bytearray(nulls)
+        return Column, (self.typecode, data, nulls)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, i: int) -> Any:
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        value = self.data[i]
+        return bool(value) if self.typecode == 'b' else value
+
+    def null_positions(self) -> Iterator[int]:
+        nulls = self.nulls
+        if nulls is None:
+            return
+        if not isinstance(nulls, bytearray):
+            # Read-only map, e.g. a memoryview over a memory-mapped file
+            yield from compress(count(), nulls)
+            return
+        i = nulls.find(1)
+        while i != -1:
+            yield i
+            i = nulls.find(1, i + 1)
+
+    def to_list(self) -> List[Any]:
+        if self.typecode is None:
+            return list(self.data)
+        values = self.data.tolist()
+        if self.typecode == 'b':
+            values = list(map(bool, values))
+        for i in self.null_positions():
+            values[i] = None
+        return values
+
+    @classmethod
+    def concat(cls, parts: Sequence['Column']) -> 'Column':
+        typecodes = {part.typecode for part in parts}
+        if len(typecodes) != 1 or None in typecodes:
+            values = []
+            for part in parts:
+                values.extend(part.to_list() if part.typecode is not None else part.data)
+            return cls(None, values)
+
+        typecode = typecodes.pop()
+        data = array(typecode)
+        for part in parts:
+            data.extend(part.data)
+        nulls = None
+        if any(part.nulls is not None for part in parts):
+            nulls = bytearray()
+            for part in parts:
+                nulls.extend(part.nulls if part.nulls is not None else bytes(len(part)))
+        return cls(typecode, data, nulls)
+
+    def take(self, positions: Sequence[int], deep: bool = False) -> 'Column':
+        data = self.data
+        if self.typecode is None:
+            taken = [data[i] for i in positions]
+            return Column(None, copy_values(taken, deep) if deep else taken)
+        nulls = None
+        if self.nulls is not None:
+            nulls = bytearray(map(self.nulls.__getitem__, positions))
+            if 1 not in nulls:
+                nulls = None
+        return Column(self.typecode, array(self.typecode, map(data.__getitem__, positions)), nulls)
+
+    def slice(self, start: int, stop: int) -> 'Column':
+        # Rows [start, stop): a typed buffer and its null map are shared through a memoryview
+        if self.typecode is None:
+            return Column(None, self.data[start:stop])
+        nulls = memoryview(self.nulls)[start:stop] if self.nulls is not None else None
+        return Column(self.typecode, memoryview(self.data)[start:stop], nulls)
+
+
+class RowStore:
+    """
+    Построчное хранилище: список строк-списков (исходный формат Table).
+    """
+    columnar = False
+
+    def __init__(self, rows: List[List[Any]]):
+        self.rows = rows
+        # Views of row ranges (RangeStore) that still read these rows
+        self._views: Optional[weakref.WeakSet] = None
+
+    def __getstate__(self):
+        # Views stay with the original: a copy has none
+        return {'rows': self.rows, '_views': None}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _detach_views(self):
+        # Rows are about to be changed in place: views copy their rows first
+        if self._views:
+            for view in list(self._views):
+                view.detach()
+
+    def get_rows(self) -> List[List[Any]]:
+        # The caller may edit the rows in place
+        self._detach_views()
+        return self.rows
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        return iter(self.rows)
+
+    def column(self, idx: int) -> List[Any]:
+        return [row[idx] for row in self.rows]
+
+    def column_buffer(self, idx: int, col_type: type = str) -> Column:
+        return Column.from_values(self.column(idx), col_type)
+
+    def set_column(self, idx: int, values: Iterable[Any], col_type: type = str):
+        self._detach_views()
+        for row, value in zip(self.rows, values):
+            row[idx] = value
+
+    def append_column(self, values: Iterable[Any], col_type: type = str):
+        self._detach_views()
+        for row, value in zip(self.rows, values):
+            row.append(value)
+
+    def take(self, positions: Iterable[int], deep: bool = False) -> 'RowStore':
+        rows = self.rows
+        with gc_paused():
+            if deep:
+                return RowStore([copy_values(rows[i], deep) for i in positions])
+            return RowStore([list(rows[i]) for i in positions])
+
+    def slice(self, start: int, stop: int) -> 'RangeStore':
+        view = RangeStore(self, start, stop)
+        if self._views is None:
+            self._views = weakref.WeakSet()
+        self._views.add(view)
+        return view
+
+    def select(self, indices: Sequence[int]) -> 'RowStore':
+        return RowStore([[row[i] for i in indices] for row in self.rows])
+
+    def to_columns(self, types: List[type]) -> 'ColumnStore':
+        columns = [Column.from_values(self.column(idx), t) for idx, t in enumerate(types)]
+        return ColumnStore(columns, len(self.rows))
+
+
+class ColumnStore:
+    """
+    Колоночное хранилище: по одному Column на столбец.
+    Строки (rows) собираются лениво и кэшируются до следующей записи.
+    """
+    columnar = True
+
+    def __init__(self, columns: List[Column], n_rows: int):
+        self.columns = columns
+        self.n_rows = n_rows
+        self._rows_cache: Optional[List[List[Any]]] = None
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def get_rows(self) -> List[List[Any]]:
+        if self._rows_cache is None:
+            self._rows_cache = list(self.iter_rows())
+        return self._rows_cache
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        if self._rows_cache is not None:
+            return iter(self._rows_cache)
+        if not self.columns:
+            return ([] for _ in range(self.n_rows))
+        return (list(r) for r in zip(*[c.to_list() for c in self.columns]))
+
+    def column(self, idx: int) -> List[Any]:
+        return self.columns[idx].to_list()
+
+    def column_buffer(self, idx: int, col_type: type = str) -> Column:
+        return self.columns[idx]
+
+    def set_column(self, idx: int, values: Union[Column, Iterable[Any]], col_type: type = str):
+        self.columns[idx] = values if isinstance(values, Column) else Column.from_values(list(values), col_type)
+        self._rows_cache = None
+
+    def append_column(self, values: Union[Column, Iterable[Any]], col_type: type = str):
+        self.columns.append(values if isinstance(values, Column) else Column.from_values(list(values), col_type))
+        self._rows_cache = None
+
+    def take(self, positions: Iterable[int], deep: bool = False) -> 'ColumnStore':
+        positions = positions if isinstance(positions, (list, range)) else list(positions)
+        return ColumnStore([c.take(positions, deep) for c in self.columns], len(positions))
+
+    def slice(self, start: int, stop: int) -> 'RangeStore':
+        return RangeStore(self, start, stop)
+
+    def select(self, indices: Sequence[int]) -> 'ColumnStore':
+        # Column objects are never changed in place, so the new store shares them
+        return ColumnStore([self.columns[i] for i in indices], self.n_rows)
+
+    def to_rows(self) -> RowStore:
+        return RowStore([list(r) for r in self.iter_rows()])
+
+
+class RangeStore:
+    """
+    Строки [start, stop) другого хранилища без копирования (get_rows_by_number).
+    Чтение идёт из источника со сдвигом; первая запись или выдача rows (их можно
+    изменить на месте) превращает представление в собственное хранилище этих строк.
+    - построчный источник сам отделяет свои представления перед записью на месте
+    - у колоночного запоминается список Column: источник заменяет их при записи, а не изменяет
+    """
+    __slots__ = ('columnar', 'start', 'stop', '_source', '_columns', '_own', '__weakref__')
+
+    def __init__(self, source: Union[RowStore, ColumnStore, List[Column]], start: int, stop: int):
+        self.columnar = not isinstance(source, RowStore)
+        self.start = start
+        self.stop = stop
+        self._source = list(source.columns) if isinstance(source, ColumnStore) else source
+        self._columns: Optional[List[Column]] = None
+        self._own: Optional[Union[RowStore, ColumnStore]] = None
+
+    def detach(self) -> Union[RowStore, ColumnStore]:
+        # The own store of the rows, built on first use
+        if self._own is None:
+            if self.columnar:
+                self._own = ColumnStore(self.columns, len(self))
+            else:
+                self._own = self._source.take(range(self.start, self.stop))
+                self._source._views.discard(self)
+            self._source = self._columns = None
+        return self._own
+
+    def __reduce__(self):
+        # Pickles (and copies) as a store of its own rows, without the source
+        if self.columnar:
+            return ColumnStore, (self.columns, len(self))
+        return RowStore, (list(self.iter_rows()),)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def columns(self) -> List[Column]:
+        if self._own is not None:
+            return self._own.columns
+        if self._columns is None:
+            self._columns = [c.slice(self.start, self.stop) for c in self._source]
+        return self._columns
+
+    def get_rows(self) -> List[List[Any]]:
+        return self.detach().get_rows()
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        if self._own is not None:
+            return self._own.iter_rows()
+        if self.columnar:
+            return ColumnStore(self.columns, len(self)).iter_rows()
+        return map(self._source.rows.__getitem__, range(self.start, self.stop))
+
+    def column(self, idx: int) -> List[Any]:
+        if self._own is not None:
+            return self._own.column(idx)
+        if self.columnar:
+            return self._source[idx].slice(self.start, self.stop).to_list()
+        rows = self._source.rows
+        return [rows[i][idx] for i in range(self.start, self.stop)]
+
+    def column_buffer(self, idx: int, col_type: type = str) -> Column:
+        if self._own is not None:
+            return self._own.column_buffer(idx, col_type)
+        if self.columnar:
+            return self.columns[idx]
+        return Column.from_values(self.column(idx), col_type)
+
+    def set_column(self, idx: int, values: Union[Column, Iterable[Any]], col_type: type = str):
+        self.detach().set_column(idx, values, col_type)
+
+    def append_column(self, values: Union[Column, Iterable[Any]], col_type: type = str):
+        self.detach().append_column(values, col_type)
+
+    def take(self, positions: Iterable[int], deep: bool = False) -> Union[RowStore, ColumnStore]:
+        if self._own is not None:
+            return self._own.take(positions, deep)
+        if self.columnar:
+            return ColumnStore(self.columns, len(self)).take(positions, deep)
+        return self._source.take(map(self.start.__add__, positions), deep)
+
+    def slice(self, start: int, stop: int) -> 'RangeStore':
+        if self._own is not None:
+            return self._own.slice(start, stop)
+        if self.columnar:
+            return RangeStore(self._source, self.start + start, self.start + stop)
+        return self._source.slice(self.start + start, self.start + stop)
+
+    def select(self, indices: Sequence[int]) -> Union[RowStore, ColumnStore]:
+        if self.columnar:
+            columns = self.columns
+            return ColumnStore([columns[i] for i in indices], len(self))
+        return RowStore([[row[i] for i in indices] for row in self.iter_rows()])
+
+    def to_columns(self, types: List[type]) -> ColumnStore:
+        columns = [Column.from_values(self.column(idx), t) for idx, t in enumerate(types)]
+        return ColumnStore(columns, len(self))
+
+    def to_rows(self) -> RowStore:
+        return RowStore([list(r) for r in self.iter_rows()])
@@ -1,6 +1,50 @@
 # table.py
-from copy import deepcopy
-from typing import List, Any, Dict, Optional, Iterable, Union
+import operator
+import sys
+from functools import partial
+from typing import List, Any, Callable, Dict, Optional, Iterable, Iterator, Sequence, Set, Tuple, Union
+
+import vectorized
+from index import HashIndex, RowPositions, SortedIndex, in_range
+from instrument import instrument_methods
+from mask import Mask
+from render import write_preview, write_table
+from schema import ColumnNames, ColumnTypes
+from storage import Column, RowStore, ColumnStore, TYPECODES, copy_values
+
+
+def _safe_divide(x, y):
+    if y == 0:
+        raise ZeroDivisionError("Division by zero")
+    return x / y
+
+
+# Per-value operations of add/sub/mul/div and eq/gr/ls/ge/le/ne (also used by query.Query)
+ARITHMETIC_OPS = {'add': operator.add, 'sub': operator.sub, 'mul': operator.mul, 'div': _safe_divide}
+COMPARISON_OPS = {'eq': operator.eq, 'gr': operator.gt, 'ls': operator.lt,
+                  'ge': operator.ge, 'le': operator.le, 'ne': operator.ne}
+
+
+# Strings that bool conversion accepts, after strip() and lower()
+_BOOL_STRINGS = {'true': True, '1': True, 'yes': True, 'y': True, 't': True,
+                 'false': False, '0': False, 'no': False, 'n': False, 'f': False}
+
+
+def _bulk_converter(to_type: type, kinds: Set[type]) -> Optional[Callable[[Iterable[Any]], Iterator[Any]]]:
+    # Converter for all non-None values of a column at once that gives the same results as
+    # Table._convert_value for these value types, or None if only the per-cell path does
+    if to_type is str:
+        return partial(map, str)
+    if to_type is float and kinds <= {int, float, bool, str}:
+        return partial(map, float)
+    if to_type is int and kinds <= {int, float, str}:
+        return partial(map, int)
+    if to_type is bool:
+        if kinds <= {str}:
+            return lambda values: map(_BOOL_STRINGS.__getitem__, map(str.lower, map(str.strip, values)))
+        if kinds <= {bool, int, float}:
+            return partial(map, bool)
+    return None
 
 
 class TableError(Exception):
@@ -11,25 +55,98 @@ class ColumnTypeError(TableError):
     pass
 
 
+class ColumnRef:
+    """
+    Операнд-столбец: table.add('a', col(2)) складывает со столбцом 2,
+    без проверки, похоже ли значение на номер или имя столбца.
+    """
+    __slots__ = ('column',)
+
+    def __init__(self, column: Union[int, str]):
+        self.column = column
+
+    def __repr__(self) -> str:
+        return f"col({self.column!r})"
+
+
+class Literal:
+    """
+    Операнд-значение: table.add('a', lit(2)) прибавляет число 2,
+    даже если в таблице есть столбец с номером 2.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"lit({self.value!r})"
+
+
+# Column resolution shared by Table and query.Query, which plans over a ColumnNames of its own
+def column_index(columns: ColumnNames, column: Union[int, str]) -> int:
+    if isinstance(column, int):
+        if not (0 <= column < len(columns)):
+            raise IndexError(f"Column index {column} out of range [0, {len(columns) - 1}]")
+        return column
+    if isinstance(column, str):
+        idx = columns.position(column)
+        if idx is None:
+            raise KeyError(f"Column name '{column}' not found. Available: {columns}")
+        return idx
+    raise TypeError(f"Column must be int or str, got {type(column)}")
+
+
+def is_column(columns: ColumnNames, value: Any) -> bool:
+    # Plain operands: an int within the column range or a column name is a column
+    if isinstance(value, int):
+        return 0 <= value < len(columns)
+    if isinstance(value, str):
+        return columns.position(value) is not None
+    return False
+
+
+def column_operand(columns: ColumnNames, value: Any) -> Tuple[bool, Any]:
+    # (is_column, column key or scalar); col()/lit() say it explicitly
+    if isinstance(value, ColumnRef):
+        column_index(columns, value.column)
+        return True, value.column
+    if isinstance(value, Literal):
+        return False, value.value
+    return is_column(columns, value), value
+
+
+def col(column: Union[int, str]) -> ColumnRef:
+    return ColumnRef(column)
+
+
+def lit(value: Any) -> Literal:
+    return Literal(value)
+
+
 class Table:
     TYPE_STRS = {'int': int, 'float': float, 'bool': bool, 'str': str}
 
     def __init__(self,
                  columns: Optional[List[str]] = None,
                  rows: Optional[List[List[Any]]] = None,
-                 types: Optional[Dict[Union[int, str], Union[type, str]]] = None):
+                 types: Optional[Dict[Union[int, str], Union[type, str]]] = None,
+                 columnar: bool = False):
 
-        self.columns = list(columns) if columns else []
-        self.rows = [list(r) for r in rows] if rows else []
+        # Resolved column types, rebuilt only after columns or types change
+        self._schema_version: Optional[Tuple[int, int]] = None
+        self._type_cache: Dict[Union[int, str], type] = {}
+        self._storage_types: Optional[List[type]] = None
 
-        # Validate row lengths match columns
-        if self.columns and self.rows:
-            for i, r in enumerate(self.rows):
-                if len(r) != len(self.columns):
-                    raise TableError(f"Row {i} length {len(r)} doesn't match columns {len(self.columns)}")
+        self.columns = columns if columns else []
+        rows = [list(r) for r in rows] if rows else []
+        self._check_rows(rows)
+        self._store = RowStore(rows)
+        self._hash_indexes: Dict[Tuple[int, ...], HashIndex] = {}
+        self._sorted_indexes: Dict[int, SortedIndex] = {}
 
         # Initialize types
-        self.types: Dict[Union[int, str], type] = {}
+        self.types = {}
 
         # Set default types first
         for idx in range(len(self.columns)):
@@ -42,18 +159,284 @@ class Table:
             for key, type_spec in types.items():
                 self.types[key] = self._normalize_type(type_spec)
 
+        if columnar:
+            self.set_columnar(True)
+
+    @property
+    def columns(self) -> ColumnNames:
+        return self._columns
+
+    @columns.setter
+    def columns(self, columns: Iterable[str]):
+        self._columns = ColumnNames(columns)
+
+    @property
+    def types(self) -> ColumnTypes:
+        return self._types
+
+    @types.setter
+    def types(self, types: Dict[Union[int, str], type]):
+        self._types = ColumnTypes(types)
+
+    def _check_rows(self, rows: List[List[Any]]):
+        # Validate row lengths match columns
+        if self.columns and rows:
+            for i, r in enumerate(rows):
+                if len(r) != len(self.columns):
+                    raise TableError(f"Row {i} length {len(r)} doesn't match columns {len(self.columns)}")
+
+    @classmethod
+    def from_rows(cls, columns: List[str], rows: List[List[Any]],
+                  types: Optional[Dict[Union[int, str], Union[type, str]]] = None,
+                  columnar: bool = False) -> 'Table':
+        # Takes ownership of the row lists instead of copying them like the constructor
+        table = cls(columns=columns, types=types)
+        table._check_rows(rows)
+        table._store = RowStore(rows)
+        if columnar:
+            table.set_columnar(True)
+        return table
+
+    @classmethod
+    def from_columns(cls, columns: List[str], data: List[Union[List[Any], Column]],
+                     types: Optional[Dict[Union[int, str], Union[type, str]]] = None,
+                     columnar: bool = False) -> 'Table':
+        # Builds the table from one list of values per column; values are stored as given
+        if len(data) != len(columns):
+            raise TableError(f"Got {len(data)} value lists for {len(columns)} columns")
+        n_rows = len(data[0]) if data else 0
+        for name, values in zip(columns, data):
+            if len(values) != n_rows:
+                raise TableError(f"Column '{name}' length {len(values)} doesn't match {n_rows} rows")
+
+        # Column buffers (e.g. from parallel CSV parsing) are taken as they are
+        table = cls(columns=columns, types=types)
+        if columnar:
+            table._store = ColumnStore([values if isinstance(values, Column)
+                                        else Column.from_values(values, table._storage_type(idx))
+                                        for idx, values in enumerate(data)], n_rows)
+        else:
+            data = [values.to_list() if isinstance(values, Column) else values for values in data]
+            table._store = RowStore([list(r) for r in zip(*data)])
+        return table
+
+    @classmethod
+    def _from_store(cls, columns: List[str], store, types: Dict[Union[int, str], type]) -> 'Table':
+        table = cls(columns=columns, types=types)
+        table._store = store
+        return table
+
+    @property
+    def rows(self) -> List[List[Any]]:
+        # In columnar mode rows are built lazily from the column buffers and cached
+        # until the next write, so change values through set_values, not through rows
+        return self._store.get_rows()
+
+    @rows.setter
+    def rows(self, rows: List[List[Any]]):
+        columnar = self.columnar
+        self._store = RowStore([list(r) for r in rows])
+        self._invalidate_indexes()
+        if columnar:
+            self.set_columnar(True)
+
+    @property
+    def columnar(self) -> bool:
+        return self._store.columnar
+
+    def set_columnar(self, columnar: bool = True):
+        if columnar and not self._store.columnar:
+            types = [self._storage_type(idx) for idx in range(len(self.columns))]
+            self._store = self._store.to_columns(types)
+        elif not columnar and self._store.columnar:
+            self._store = self._store.to_rows()
+
+    def get_column_buffer(self, column: Union[int, str]) -> Column:
+        # The stored Column itself in columnar mode (do not modify it), a new one built from the rows otherwise
+        idx = self._col_index(column)
+        return self._store.column_buffer(idx, self._storage_type(idx))
+
+    def row_count(self) -> int:
+        return len(self._store)
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        return self._store.iter_rows()
+
+    def create_index(self, columns: Union[int, str, Sequence[Union[int, str]]], kind: str = 'hash'):
+        # Indexes follow writes made through Table methods; rows edited in place
+        # via table.rows are not tracked, call create_index again after that
+        key = self._index_key(columns)
+        if kind == 'hash':
+            index = HashIndex(key)
+            try:
+                index.build(self._index_values(key))
+            except TypeError as e:
+                raise TableError(f"Cannot index columns {columns}: {e}") from e
+            self._hash_indexes[key] = index
+        elif kind == 'sorted':
+            if len(key) != 1:
+                raise TableError("Sorted index supports a single column only")
+            index = SortedIndex(key[0], self._type_for(columns))
+            try:
+                self._build_sorted_index(index)
+            except (ColumnTypeError, TypeError) as e:
+                raise TableError(f"Cannot index column {columns}: {e}") from e
+            self._sorted_indexes[key[0]] = index
+        else:
+            raise ValueError(f"Unknown index kind '{kind}'. Available: ['hash', 'sorted']")
+
+    def drop_index(self, columns: Union[int, str, Sequence[Union[int, str]]], kind: Optional[str] = None):
+        key = self._index_key(columns)
+        if kind in (None, 'hash'):
+            self._hash_indexes.pop(key, None)
+        if kind in (None, 'sorted') and len(key) == 1:
+            self._sorted_indexes.pop(key[0], None)
+
+    def _build_sorted_index(self, index: SortedIndex):
+        index.build(self._convert_values(self._store.column(index.column), index.col_type))
+
+    def _index_key(self, columns: Union[int, str, Sequence[Union[int, str]]]) -> Tuple[int, ...]:
+        if isinstance(columns, (int, str)):
+            return (self._col_index(columns),)
+        return tuple(self._col_index(c) for c in columns)
+
+    def _index_values(self, key: Tuple[int, ...]) -> List[Any]:
+        if len(key) == 1:
+            return self._store.column(key[0])
+        return list(zip(*[self._store.column(idx) for idx in key]))
+
+    def _get_index(self, key: Tuple[int, ...]) -> Optional[HashIndex]:
+        index = self._hash_indexes.get(key)
+        if index is not None and index.stale:
+            try:
+                index.build(self._index_values(key))
+            except TypeError:
+                return None
+        return index
+
+    def _get_sorted_index(self, column: Union[int, str]) -> Optional[SortedIndex]:
+        index = self._sorted_indexes.get(self._col_index(column))
+        # The keys were converted to the type the caller's column key resolves to
+        if index is None or index.col_type is not self._type_for(column):
+            return None
+        if index.stale:
+            try:
+                self._build_sorted_index(index)
+            except (ColumnTypeError, TypeError):
+                return None
+        return index
+
+    def _invalidate_indexes(self, idx: Optional[int] = None):
+        for key, index in self._hash_indexes.items():
+            if idx is None or idx in key:
+                index.stale = True
+        for column, index in self._sorted_indexes.items():
+            if idx is None or idx == column:
+                index.stale = True
+
+    def _positions_mask(self, positions: Iterable[int]) -> Mask:
+        data = bytearray(len(self._store))
+        for i in positions:
+            data[i] = 1
+        return Mask._wrap(data)
+
+    def _index_lookup_range(self, column: Union[int, str], scalar: Any, op_name: str) -> Optional[List[int]]:
+        # Rows for gr/ls/ge/le against a scalar from a sorted index, or None when the scan must decide
+        is_column, scalar = self._operand(scalar)
+        if scalar is None or is_column:
+            return None
+        index = self._get_sorted_index(self._column_key(column))
+        if index is None:
+            return None
+        bounds = {
+            'gr': {'lo': scalar, 'include_lo': False},
+            'ge': {'lo': scalar},
+            'ls': {'hi': scalar, 'include_hi': False},
+            'le': {'hi': scalar},
+        }[op_name]
+        try:
+            if scalar != scalar:
+                return None
+            start, stop = index.bounds(**bounds)
+        except TypeError:
+            # Incomparable scalar: the scan raises the row-numbered error
+            return None
+        return index.positions[start:stop]
+
+    def range(self, column: Union[int, str], lo: Any = None, hi: Any = None,
+              include_lo: bool = True, include_hi: bool = True) -> RowPositions:
+        index = self._get_sorted_index(column)
+        # A NaN bound matches no row: the scan decides, as in _index_lookup_range
+        if index is not None and lo == lo and hi == hi:
+            try:
+                return index.range(lo, hi, include_lo, include_hi)
+            except TypeError:
+                pass
+
+        col_type = self._type_for(column)
+        positions = RowPositions()
+        values, convert = self._operand_values(self._col_index(column), col_type)
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            try:
+                converted = value if convert is None else convert(value, col_type)
+                if converted == converted and in_range(converted, lo, hi, include_lo, include_hi):
+                    positions.append(i)
+            except Exception as e:
+                raise TableError(f"range failed at row {i}: {e}") from e
+        return positions
+
+    def _index_lookup_eq(self, column: Union[int, str], scalar: Any) -> Optional[List[int]]:
+        # Rows where column == scalar from a hash index, or None when the scan must decide
+        column = self._column_key(column)
+        index = self._get_index((self._col_index(column),))
+        is_column, scalar = self._operand(scalar)
+        if index is None or is_column:
+            return None
+        if scalar is None:
+            return None
+        # The index holds stored values, which match converted ones only if they already have the type
+        col_type = self._type_for(column)
+        if not all(t is type(None) or issubclass(t, col_type) for t in index.value_types):
+            return None
+        try:
+            if scalar != scalar:
+                return None
+            # A scalar that does not convert to the column type is left to the scan as well
+            self._convert_value(scalar, col_type)
+            return index.lookup((scalar,))
+        except (ColumnTypeError, TypeError, ValueError):
+            return None
+
     def _col_index(self, column: Union[int, str]) -> int:
-        if isinstance(column, int):
-            if not (0 <= column < len(self.columns)):
-                raise IndexError(f"Column index {column} out of range [0, {len(self.columns) - 1}]")
-            return column
-        if isinstance(column, str):
-            if column not in self.columns:
-                raise KeyError(f"Column name '{column}' not found. Available: {self.columns}")
-            return self.columns.index(column)
-        raise TypeError(f"Column must be int or str, got {type(column)}")
+        return column_index(self.columns, column)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Resolved types are cached per schema version, and versions are only unique within
+        # one process: a pickled table drops the cache and resolves its types again
+        state = self.__dict__.copy()
+        state['_schema_version'] = None
+        state['_type_cache'] = {}
+        state['_storage_types'] = None
+        return state
+
+    def _resolved_types(self) -> Dict[Union[int, str], type]:
+        version = (self._columns.version, self._types.version)
+        if self._schema_version != version:
+            self._schema_version = version
+            self._type_cache = {}
+            self._storage_types = None
+        return self._type_cache
 
     def _type_for(self, column: Union[int, str]) -> type:
+        cache = self._resolved_types()
+        resolved = cache.get(column)
+        if resolved is None:
+            resolved = cache[column] = self._resolve_type(column)
+        return resolved
+
+    def _resolve_type(self, column: Union[int, str]) -> type:
         # Try by exact key first
         if column in self.types:
             return self._normalize_type(self.types[column])
@@ -66,6 +449,17 @@ class Table:
         # Fallback to string
         return str
 
+    def _storage_type(self, idx: int) -> type:
+        # Type the stored values were converted to: set_column_types(by_number=False) keys it by name
+        self._resolved_types()
+        if self._storage_types is None:
+            types = self.types
+            self._storage_types = [
+                self._normalize_type(types[name] if name in types else types.get(i, str))
+                for i, name in enumerate(self.columns)
+            ]
+        return self._storage_types[idx]
+
     def _normalize_type(self, t: Union[str, type]) -> type:
         if isinstance(t, str):
             if t not in self.TYPE_STRS:
@@ -86,21 +480,55 @@ class Table:
             if to_type is bool:
                 if isinstance(value, str):
                     v = value.strip().lower()
-                    if v in ('true', '1', 'yes', 'y', 't'):
-                        return True
-                    if v in ('false', '0', 'no', 'n', 'f'):
-                        return False
+                    if v in _BOOL_STRINGS:
+                        return _BOOL_STRINGS[v]
                     raise ValueError(f"Cannot convert '{value}' to bool")
                 return bool(value)
             return to_type(value)
         except Exception as e:
             raise ColumnTypeError(f"Cannot convert value {value!r} to {to_type.__name__}: {e}")
 
+    def _convert_values(self, values: List[Any], to_type: type, column: Optional[Union[int, str]] = None) -> List[Any]:
+        # _convert_value for a whole column: typed columns are returned as they are, others are
+        # converted in bulk; if a cell fails, the per-cell pass finds its row for the error
+        kinds = set(map(type, values))
+        kinds.discard(type(None))
+        if all(issubclass(kind, to_type) for kind in kinds):
+            return values
+        converter = _bulk_converter(to_type, kinds)
+        if converter is not None:
+            try:
+                if None not in values:
+                    return list(converter(values))
+                converted = converter([v for v in values if v is not None])
+                return [None if v is None else next(converted) for v in values]
+            except Exception:
+                pass
+
+        result = []
+        where = "" if column is None else f", column {column}"
+        for i, value in enumerate(values):
+            try:
+                result.append(self._convert_value(value, to_type))
+            except ColumnTypeError as e:
+                raise ColumnTypeError(f"Row {i}{where}: {e}") from e
+        return result
+
+    def _operand_values(self, idx: int, col_type: type) -> Tuple[List[Any], Optional[Callable[[Any, type], Any]]]:
+        # Values of a column converted in bulk, or the stored values and the per-cell
+        # converter when some cell does not convert: the row loop then reports that row
+        values = self._store.column(idx)
+        try:
+            return self._convert_values(values, col_type), None
+        except ColumnTypeError:
+            return values, self._convert_value
+
     def as_dict(self) -> Dict[str, Any]:
+        # Independent copy: column names and types are immutable, only mutable cells are deep-copied
         return {
-            'columns': deepcopy(self.columns),
-            'rows': deepcopy(self.rows),
-            'types': deepcopy(self.types)
+            'columns': list(self.columns),
+            'rows': [copy_values(row, deep=True) for row in self.iter_rows()],
+            'types': dict(self.types)
         }
 
     @classmethod
@@ -112,18 +540,18 @@ class Table:
         )
 
     def get_rows_by_number(self, start: int, stop: Optional[int] = None, copy_table: bool = False) -> 'Table':
-        if not self.rows:
-            return Table(columns=self.columns, rows=[], types=self.types.copy())
+        n = len(self._store)
+        if not n:
+            return Table(columns=self.columns, rows=[], types=self.types.copy(), columnar=self.columnar)
 
         if not isinstance(start, int) or start < 0:
             raise TypeError("start must be non-negative integer")
 
-        n = len(self.rows)
         if start >= n:
             raise IndexError(f"start row {start} out of range [0, {n - 1}]")
 
         if stop is None:
-            row_slice = [start]
+            stop = start
         else:
             if not isinstance(stop, int):
                 raise TypeError("stop must be integer")
@@ -131,32 +559,52 @@ class Table:
                 raise ValueError(f"stop ({stop}) must be >= start ({start})")
             if stop >= n:
                 raise IndexError(f"stop row {stop} out of range [0, {n - 1}]")
-            row_slice = list(range(start, stop + 1))
-
-        selected_rows = []
-        for idx in row_slice:
-            if copy_table:
-                selected_rows.append(deepcopy(self.rows[idx]))
-            else:
-                selected_rows.append(self.rows[idx])
 
-        return Table(columns=self.columns, rows=selected_rows, types=self.types.copy())
-
-    def get_rows_by_index(self, *vals: Any, copy_table: bool = False) -> 'Table':
+        if copy_table:
+            return self._take(range(start, stop + 1), copy_table)
+        # A view of the rows: nothing is copied until the slice or this table writes them.
+        # Rows edited in place through a rows list taken earlier are not tracked
+        return Table._from_store(self.columns, self._store.slice(start, stop + 1), self.types.copy())
+
+    def _take(self, positions: Iterable[int], copy_table: bool = False) -> 'Table':
+        return Table._from_store(self.columns, self._store.take(positions, deep=copy_table), self.types.copy())
+
+    def _select(self, indices: Sequence[int]) -> 'Table':
+        # Table of the given columns in the given order; types keyed by name or number follow them
+        types: Dict[Union[int, str], type] = {}
+        for new_idx, idx in enumerate(indices):
+            name = self.columns[idx]
+            if name in self.types:
+                types[name] = self.types[name]
+            if idx in self.types:
+                types[new_idx] = self.types[idx]
+        return Table._from_store([self.columns[i] for i in indices], self._store.select(indices), types)
+
+    def get_rows_by_index(self, *vals: Any, column: Union[int, str, Sequence[Union[int, str]]] = 0,
+                          copy_table: bool = False) -> 'Table':
         if not self.columns:
             raise TableError("No columns in table")
         if not vals:
-            return Table(columns=self.columns, rows=[], types=self.types.copy())
-
-        matches = []
-        for r in self.rows:
-            if r and r[0] in vals:
-                if copy_table:
-                    matches.append(deepcopy(r))
-                else:
-                    matches.append(r)
+            return Table(columns=self.columns, rows=[], types=self.types.copy(), columnar=self.columnar)
 
-        return Table(columns=self.columns, rows=matches, types=self.types.copy())
+        # For a composite column list each of vals is a tuple of values
+        key = self._index_key(column)
+        matches = None
+        index = self._get_index(key)
+        if index is not None:
+            try:
+                matches = index.lookup(vals)
+            except TypeError:
+                matches = None
+        if matches is None and not self._store.columnar:
+            # Without an index a row table is scanned row by row, without building the key column
+            get_key = operator.itemgetter(*key)
+            found = RowStore([row for row in self._store.iter_rows() if get_key(row) in vals])
+            return Table._from_store(self.columns, found.take(range(len(found)), deep=copy_table),
+                                     self.types.copy())
+        if matches is None:
+            matches = [i for i, value in enumerate(self._index_values(key)) if value in vals]
+        return self._take(matches, copy_table)
 
     def get_column_types(self, by_number: bool = True) -> Dict[Union[int, str], type]:
         result = {}
@@ -193,31 +641,26 @@ class Table:
             idx = self._col_index(col_key)
 
             # Convert existing values
-            for i, row in enumerate(self.rows):
-                try:
-                    row[idx] = self._convert_value(row[idx], new_type)
-                except ColumnTypeError as e:
-                    raise ColumnTypeError(f"Row {i}, column {col_key}: {e}") from e
+            converted = self._convert_values(self._store.column(idx), new_type, col_key)
 
             # Update type mapping
+            self._store.set_column(idx, converted, new_type)
+            self._invalidate_indexes(idx)
             self.types[col_key] = new_type
 
     def get_values(self, column: Union[int, str] = 0) -> List[Any]:
         idx = self._col_index(column)
         col_type = self._type_for(column)
 
-        result = []
-        for i, row in enumerate(self.rows):
-            try:
-                result.append(self._convert_value(row[idx], col_type))
-            except ColumnTypeError as e:
-                raise ColumnTypeError(f"Row {i}: {e}") from e
-
-        return result
+        # A typed buffer already holds values of the column type
+        buffer = self._typed_column(column)
+        if buffer is not None:
+            return buffer.to_list()
+        return self._convert_values(self._store.column(idx), col_type)
 
     def get_value(self, column: Union[int, str] = 0) -> Any:
-        if len(self.rows) != 1:
-            raise TableError(f"get_value requires exactly one row, got {len(self.rows)}")
+        if len(self._store) != 1:
+            raise TableError(f"get_value requires exactly one row, got {len(self._store)}")
         return self.get_values(column)[0]
 
     def set_values(self, values: Iterable[Any], column: Union[int, str] = 0):
@@ -225,99 +668,106 @@ class Table:
         col_type = self._type_for(column)
         values_list = list(values)
 
-        if len(values_list) != len(self.rows):
-            raise TableError(f"Values length {len(values_list)} doesn't match rows count {len(self.rows)}")
+        if len(values_list) != len(self._store):
+            raise TableError(f"Values length {len(values_list)} doesn't match rows count {len(self._store)}")
 
-        for i, value in enumerate(values_list):
-            try:
-                self.rows[i][idx] = self._convert_value(value, col_type)
-            except ColumnTypeError as e:
-                raise ColumnTypeError(f"Row {i}: {e}") from e
+        converted = self._convert_values(values_list, col_type)
+        self._store.set_column(idx, converted, col_type)
+        self._invalidate_indexes(idx)
 
     def set_value(self, value: Any, column: Union[int, str] = 0):
-        if len(self.rows) != 1:
-            raise TableError(f"set_value requires exactly one row, got {len(self.rows)}")
+        if len(self._store) != 1:
+            raise TableError(f"set_value requires exactly one row, got {len(self._store)}")
         self.set_values([value], column)
 
-    def print_table(self):
-        if not self.columns:
-            print("Empty table")
-            return
-
-        widths = []
-        for c in range(len(self.columns)):
-            max_width = len(str(self.columns[c]))
-            for row in self.rows:
-                if c < len(row):
-                    value_str = "<None>" if row[c] is None else str(row[c])
-                    max_width = max(max_width, len(value_str))
-            widths.append(max_width)
-
-        # Header
-        header = " | ".join(str(self.columns[i]).ljust(widths[i]) for i in range(len(self.columns)))
-        separator = "-+-".join('-' * widths[i] for i in range(len(self.columns)))
-
-        print(header)
-        print(separator)
-
-        # Rows
-        for row in self.rows:
-            row_strs = []
-            for i in range(len(self.columns)):
-                if i < len(row):
-                    value = row[i]
-                    value_str = "<None>" if value is None else str(value)
-                else:
-                    value_str = "<None>"
-                row_strs.append(value_str.ljust(widths[i]))
-            print(" | ".join(row_strs))
+    def print_table(self, max_rows: Optional[int] = None, max_col_width: Optional[int] = None):
+        # With a limit only the shown rows are read and measured (see render.write_preview)
+        if max_rows is None and max_col_width is None:
+            write_table(self, sys.stdout)
+        else:
+            write_preview(self, sys.stdout, max_rows, max_col_width)
+
+    def _typed_column(self, column: Union[int, str]):
+        # Column buffer whose typecode matches the type the operation converts to, if any
+        if not self._store.columnar:
+            return None
+        buffer = self._store.columns[self._col_index(column)]
+        if buffer.typecode is None or buffer.typecode != TYPECODES.get(self._type_for(column)):
+            return None
+        return buffer
+
+    def _vectorized_op(self, op, op_name: str, col_a: Union[int, str], col_b: Optional[Union[int, str]], scalar: Any):
+        if not vectorized.available():
+            return None
+        buffer_a = self._typed_column(col_a)
+        buffer_b = self._typed_column(col_b) if col_b is not None else None
+        if buffer_a is None or (col_b is not None and buffer_b is None):
+            return None
+        try:
+            return op(op_name, buffer_a, buffer_b, scalar)
+        except vectorized.VectorizedError as e:
+            raise TableError(f"{op_name} failed at row {e.row_index}: {e}") from e.cause
+
+    def _is_column(self, value: Any) -> bool:
+        return is_column(self.columns, value)
+
+    def _operand(self, value: Any) -> Tuple[bool, Any]:
+        return column_operand(self.columns, value)
+
+    def _column_key(self, column: Union[int, str, ColumnRef]) -> Union[int, str]:
+        if isinstance(column, ColumnRef):
+            return column.column
+        if isinstance(column, Literal):
+            raise TableError(f"First operand must be a column, got {column!r}")
+        return column
 
     def _binary_column_op(self, col_a: Union[int, str], col_b_or_scalar: Union[int, str, Any],
                           operation, operation_name: str, result_column: Optional[Union[int, str]] = None):
+        col_a = self._column_key(col_a)
         idx_a = self._col_index(col_a)
         type_a = self._type_for(col_a)
 
         # Determine if second operand is column or scalar
-        is_column = False
-        if isinstance(col_b_or_scalar, (int, str)):
-            try:
-                self._col_index(col_b_or_scalar)
-                is_column = True
-            except (IndexError, KeyError):
-                is_column = False
-
-        results = []
-        if is_column:
-            idx_b = self._col_index(col_b_or_scalar)
+        is_column, col_b_or_scalar = self._operand(col_b_or_scalar)
+        idx_b = self._col_index(col_b_or_scalar) if is_column else None
+
+        # Typed numeric buffers are computed in a single NumPy call
+        vector_column = self._vectorized_op(vectorized.binary_op, operation_name, col_a,
+                                           col_b_or_scalar if is_column else None, col_b_or_scalar)
+        if vector_column is not None:
+            if result_column is None:
+                return vector_column.to_list()
+            results = None
+        elif is_column:
+            results = []
+            values_a, convert_a = self._operand_values(idx_a, type_a)
             type_b = self._type_for(col_b_or_scalar)
+            values_b, convert_b = self._operand_values(idx_b, type_b)
 
-            for i, row in enumerate(self.rows):
-                val_a = row[idx_a]
-                val_b = row[idx_b]
-
+            for i, (val_a, val_b) in enumerate(zip(values_a, values_b)):
                 if val_a is None or val_b is None:
                     results.append(None)
                     continue
 
                 try:
                     # Convert both to float for arithmetic operations to ensure compatibility
-                    converted_a = float(self._convert_value(val_a, type_a))
-                    converted_b = float(self._convert_value(val_b, type_b))
+                    converted_a = float(val_a if convert_a is None else convert_a(val_a, type_a))
+                    converted_b = float(val_b if convert_b is None else convert_b(val_b, type_b))
                     results.append(operation(converted_a, converted_b))
                 except Exception as e:
                     raise TableError(f"{operation_name} failed at row {i}: {e}") from e
         else:
+            results = []
             scalar = col_b_or_scalar
-            for i, row in enumerate(self.rows):
-                val_a = row[idx_a]
-
+            values_a, convert_a = self._operand_values(idx_a, type_a)
+            for i, val_a in enumerate(values_a):
                 if val_a is None:
                     results.append(None)
                     continue
 
                 try:
                     # Convert to float and ensure scalar is also numeric
-                    converted_a = float(self._convert_value(val_a, type_a))
+                    converted_a = float(val_a if convert_a is None else convert_a(val_a, type_a))
                     converted_scalar = float(scalar)  # Convert scalar to float
                     results.append(operation(converted_a, converted_scalar))
                 except Exception as e:
@@ -325,31 +775,32 @@ class Table:
 
         # Handle result column
         if result_column is not None:
-            # Create new column if needed
-            if isinstance(result_column, int):
-                if result_column < 0 or result_column > len(self.columns):
-                    raise IndexError(f"Result column index {result_column} out of range")
-
-                if result_column == len(self.columns):
-                    # Add new column
-                    new_name = f"col{result_column}"
-                    self.columns.append(new_name)
-                    for row in self.rows:
-                        row.append(None)
+            self._store_result(result_column, results, vector_column)
+            return None
+        else:
+            return results
+
+    def _store_result(self, result_column: Union[int, str], results: Optional[List[Any]],
+                      vector_column: Optional[Column] = None):
+        # Create new column if needed
+        new_name = None
+        if isinstance(result_column, int):
+            if result_column < 0 or result_column > len(self.columns):
+                raise IndexError(f"Result column index {result_column} out of range")
+
+            if result_column == len(self.columns):
+                # Add new column
+                new_name = f"col{result_column}"
+        elif result_column not in self.columns:
+            # Add new named column
+            new_name = result_column
+
+        # Set type for new column (infer from first non-None result)
+        if result_column not in self.types:
+            if vector_column is not None:
+                has_values = len(vector_column) and (vector_column.nulls is None or 0 in vector_column.nulls)
+                self.types[result_column] = float if has_values else str
             else:
-                if result_column not in self.columns:
-                    # Add new named column
-                    self.columns.append(result_column)
-                    for row in self.rows:
-                        row.append(None)
-
-            # Set the values
-            result_idx = self._col_index(result_column)
-            for i, value in enumerate(results):
-                self.rows[i][result_idx] = value
-
-            # Set type for new column (infer from first non-None result)
-            if result_column not in self.types:
                 for result_val in results:
                     if result_val is not None:
                         self.types[result_column] = type(result_val)
@@ -357,102 +808,159 @@ class Table:
                 else:
                     self.types[result_column] = str
 
-            return None
+        # Set the values
+        if new_name is not None:
+            self.columns.append(new_name)
+        result_idx = self._col_index(result_column)
+        result_type = self._storage_type(result_idx)
+        if vector_column is not None:
+            # The float buffer is stored as is when the column is typed float
+            results = vector_column if result_type is float else vector_column.to_list()
+        if new_name is not None:
+            self._store.append_column(results, result_type)
         else:
-            return results
+            self._store.set_column(result_idx, results, result_type)
+            self._invalidate_indexes(result_idx)
 
     def add(self, col_a, col_b_or_scalar, result_column: Optional[Union[int, str]] = None):
-        return self._binary_column_op(col_a, col_b_or_scalar, lambda x, y: x + y, 'add', result_column)
+        return self._binary_column_op(col_a, col_b_or_scalar, ARITHMETIC_OPS['add'], 'add', result_column)
 
     def sub(self, col_a, col_b_or_scalar, result_column: Optional[Union[int, str]] = None):
-        return self._binary_column_op(col_a, col_b_or_scalar, lambda x, y: x - y, 'sub', result_column)
+        return self._binary_column_op(col_a, col_b_or_scalar, ARITHMETIC_OPS['sub'], 'sub', result_column)
 
     def mul(self, col_a, col_b_or_scalar, result_column: Optional[Union[int, str]] = None):
-        return self._binary_column_op(col_a, col_b_or_scalar, lambda x, y: x * y, 'mul', result_column)
+        return self._binary_column_op(col_a, col_b_or_scalar, ARITHMETIC_OPS['mul'], 'mul', result_column)
 
     def div(self, col_a, col_b_or_scalar, result_column: Optional[Union[int, str]] = None):
-        def safe_divide(x, y):
-            if y == 0:
-                raise ZeroDivisionError("Division by zero")
-            return x / y
-
-        return self._binary_column_op(col_a, col_b_or_scalar, safe_divide, 'div', result_column)
+        return self._binary_column_op(col_a, col_b_or_scalar, ARITHMETIC_OPS['div'], 'div', result_column)
 
     def _comparison_op(self, col_a, col_b_or_scalar, comparator, op_name: str):
+        col_a = self._column_key(col_a)
         idx_a = self._col_index(col_a)
         type_a = self._type_for(col_a)
 
-        is_column = False
-        if isinstance(col_b_or_scalar, (int, str)):
-            try:
-                self._col_index(col_b_or_scalar)
-                is_column = True
-            except (IndexError, KeyError):
-                is_column = False
+        is_column, col_b_or_scalar = self._operand(col_b_or_scalar)
+        idx_b = self._col_index(col_b_or_scalar) if is_column else None
+
+        vector_results = self._vectorized_op(vectorized.compare, op_name, col_a,
+                                             col_b_or_scalar if is_column else None, col_b_or_scalar)
+        if vector_results is not None:
+            return vector_results
 
-        results = []
+        # One byte per row instead of a list of bool objects
+        results = bytearray()
+        values_a, convert_a = self._operand_values(idx_a, type_a)
         if is_column:
-            idx_b = self._col_index(col_b_or_scalar)
             type_b = self._type_for(col_b_or_scalar)
+            values_b, convert_b = self._operand_values(idx_b, type_b)
 
-            for i, row in enumerate(self.rows):
-                val_a = row[idx_a]
-                val_b = row[idx_b]
-
+            for i, (val_a, val_b) in enumerate(zip(values_a, values_b)):
                 if val_a is None or val_b is None:
                     results.append(False)
                 else:
                     try:
-                        converted_a = self._convert_value(val_a, type_a)
-                        converted_b = self._convert_value(val_b, type_b)
+                        converted_a = val_a if convert_a is None else convert_a(val_a, type_a)
+                        converted_b = val_b if convert_b is None else convert_b(val_b, type_b)
                         results.append(bool(comparator(converted_a, converted_b)))
                     except Exception as e:
                         raise TableError(f"{op_name} failed at row {i}: {e}") from e
         else:
             scalar = col_b_or_scalar
-            for i, row in enumerate(self.rows):
-                val_a = row[idx_a]
-
+            for i, val_a in enumerate(values_a):
                 if val_a is None:
                     results.append(False)
                 else:
                     try:
-                        converted_a = self._convert_value(val_a, type_a)
+                        converted_a = val_a if convert_a is None else convert_a(val_a, type_a)
                         results.append(bool(comparator(converted_a, scalar)))
                     except Exception as e:
                         raise TableError(f"{op_name} failed at row {i}: {e}") from e
 
-        return results
+        return Mask._wrap(results)
 
     def eq(self, col_a, col_b_or_scalar):
-        return self._comparison_op(col_a, col_b_or_scalar, lambda x, y: x == y, 'eq')
+        positions = self._index_lookup_eq(col_a, col_b_or_scalar)
+        if positions is not None:
+            return self._positions_mask(positions)
+        return self._comparison_op(col_a, col_b_or_scalar, COMPARISON_OPS['eq'], 'eq')
 
     def gr(self, col_a, col_b_or_scalar):
-        return self._comparison_op(col_a, col_b_or_scalar, lambda x, y: x > y, 'gr')
+        positions = self._index_lookup_range(col_a, col_b_or_scalar, 'gr')
+        if positions is not None:
+            return self._positions_mask(positions)
+        return self._comparison_op(col_a, col_b_or_scalar, COMPARISON_OPS['gr'], 'gr')
 
     def ls(self, col_a, col_b_or_scalar):
-        return self._comparison_op(col_a, col_b_or_scalar, lambda x, y: x < y, 'ls')
+        positions = self._index_lookup_range(col_a, col_b_or_scalar, 'ls')
+        if positions is not None:
+            return self._positions_mask(positions)
+        return self._comparison_op(col_a, col_b_or_scalar, COMPARISON_OPS['ls'], 'ls')
 
     def ge(self, col_a, col_b_or_scalar):
-        return self._comparison_op(col_a, col_b_or_scalar, lambda x, y: x >= y, 'ge')
+        positions = self._index_lookup_range(col_a, col_b_or_scalar, 'ge')
+        if positions is not None:
+            return self._positions_mask(positions)
+        return self._comparison_op(col_a, col_b_or_scalar, COMPARISON_OPS['ge'], 'ge')
 
     def le(self, col_a, col_b_or_scalar):
-        return self._comparison_op(col_a, col_b_or_scalar, lambda x, y: x <= y, 'le')
+        positions = self._index_lookup_range(col_a, col_b_or_scalar, 'le')
+        if positions is not None:
+            return self._positions_mask(positions)
+        return self._comparison_op(col_a, col_b_or_scalar, COMPARISON_OPS['le'], 'le')
 
     def ne(self, col_a, col_b_or_scalar):
-        return self._comparison_op(col_a, col_b_or_scalar, lambda x, y: x != y, 'ne')
+        return self._comparison_op(col_a, col_b_or_scalar, COMPARISON_OPS['ne'], 'ne')
 
     def filter_rows(self, bool_list: Iterable[bool], copy_table: bool = False) -> 'Table':
-        bools = list(bool_list)
-        if len(bools) != len(self.rows):
-            raise TableError(f"Boolean list length {len(bools)} doesn't match rows count {len(self.rows)}")
-
-        filtered_rows = []
-        for i, keep in enumerate(bools):
-            if keep:
-                if copy_table:
-                    filtered_rows.append(deepcopy(self.rows[i]))
-                else:
-                    filtered_rows.append(self.rows[i])
+        if isinstance(bool_list, RowPositions):
+            # Positions from range(): only the matching rows are touched
+            if bool_list and not (0 <= bool_list[0] and bool_list[-1] < len(self._store)):
+                raise TableError(f"Row positions out of range [0, {len(self._store) - 1}]")
+            return self._take(bool_list, copy_table)
+
+        if isinstance(bool_list, Mask):
+            # Only the set rows are visited
+            if len(bool_list) != len(self._store):
+                raise TableError(f"Boolean list length {len(bool_list)} doesn't match rows count {len(self._store)}")
+            return self._take(bool_list.nonzero(), copy_table)
 
-        return Table(columns=self.columns, rows=filtered_rows, types=self.types.copy())
\ No newline at end of file
+        bools = list(bool_list)
+        if len(bools) != len(self._store):
+            raise TableError(f"Boolean list length {len(bools)} doesn't match rows count {len(self._store)}")
+
+        return self._take([i for i, keep in enumerate(bools) if keep], copy_table)
+
+    def compute_many(self, ops: Sequence[Sequence[Any]], workers: int = 1) -> List[Any]:
+        # Imported here because parallel.py itself builds on Table
+        from parallel import compute_many
+        return compute_many(self, ops, workers)
+
+    def query(self) -> 'Query':
+        # Imported here because query.py itself builds on Table
+        from query import Query
+        return Query(self)
+
+    def group_by(self, keys: Union[int, str, Sequence[Union[int, str]]], presorted: bool = False) -> 'GroupBy':
+        # Imported here because groupby.py itself builds on Table
+        from groupby import GroupBy
+        return GroupBy(self, keys, presorted)
+
+    def join(self, other: 'Table', on: Union[int, str, Sequence[Union[int, str]]],
+             how: str = 'inner', suffix: str = '_right') -> 'Table':
+        # Imported here because join.py itself builds on Table
+        from join import join_tables
+        return join_tables(self, other, on, how, suffix)
+
+    def sort_by(self, columns: Union[int, str, Sequence[Union[int, str]]],
+                descending: Union[bool, Sequence[bool]] = False, copy_table: bool = False) -> 'Table':
+        # Imported here because sorting.py itself builds on Table
+        from sorting import sort_table
+        return sort_table(self, columns, descending, copy_table)
+
+
+# Operations reported by instrument.py while instrumentation is on
+instrument_methods(Table, ('__init__', 'from_rows', 'from_columns', 'from_dict', 'as_dict', 'set_columnar',
+                           'create_index', 'range', 'get_rows_by_number', 'get_rows_by_index',
+                           'set_column_types', 'get_values', 'set_values', 'print_table',
+                           'add', 'sub', 'mul', 'div', 'eq', 'gr', 'ls', 'ge', 'le', 'ne',
+                           'compute_many', 'filter_rows', 'join', 'sort_by'))
@@ -0,0 +1,102 @@
+# tests/test_compression.py
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+import compression
+import io_csv
+import io_pickle
+import io_text
+from compression import infer_compression, open_file
+from table import Table
+
+NAN = float('nan')
+DECOMPRESS = {'gzip': gzip.decompress, 'bz2': bz2.decompress, 'xz': lzma.decompress}
+SUFFIXES = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz'}
+
+
+def _table():
+    rows = [[i, f"name, {i}" if i % 4 else None, i / 3 if i % 5 else NAN, i % 2 == 0] for i in range(300)]
+    return Table(columns=['id', 'name', 'x', 'flag'], rows=rows,
+                 types={'id': int, 'name': str, 'x': float, 'flag': bool})
+
+
+def _rows(table):
+    # repr() keeps NaN comparable
+    return repr(list(table.iter_rows()))
+
+
+def test_infer_compression():
+    assert infer_compression('a.csv.GZ') == 'gzip'
+    assert infer_compression('a.lzma') == 'xz'
+    assert infer_compression('a.csv') is None
+    assert infer_compression('a.csv.gz', None) is None
+    assert infer_compression('a.csv', 'bz2') == 'bz2'
+    with pytest.raises(ValueError, match="Unknown compression 'rar'"):
+        infer_compression('a.csv', 'rar')
+
+
+@pytest.mark.parametrize('kind', ['gzip', 'bz2', 'xz'])
+@pytest.mark.parametrize('level', [None, 1, 9])
+def test_open_file_round_trip(tmp_path, kind, level):
+    path = str(tmp_path / ('data' + SUFFIXES[kind]))
+    text = 'строка\r\n' * 1000
+    with open_file(path, 'w', level=level, encoding='utf-8', newline='') as f:
+        f.write(text)
+    with open(path, 'rb') as f:
+        assert DECOMPRESS[kind](f.read()) == text.encode('utf-8')
+    with open_file(path, 'r', encoding='utf-8', newline='') as f:
+        assert f.read() == text
+
+
+@pytest.mark.parametrize('kind', ['gzip', 'bz2', 'xz'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_compressed_csv_matches_plain_csv(tmp_path, monkeypatch, kind, workers):
+    monkeypatch.setattr(io_csv, '_PARALLEL_MIN_BYTES', 0)
+    plain, packed = str(tmp_path / 'data.csv'), str(tmp_path / ('data.csv' + SUFFIXES[kind]))
+    io_csv.save_table(_table(), plain)
+    io_csv.save_table(_table(), packed, chunk_rows=64, workers=workers, compression_level=1)
+    with open(plain, 'rb') as f, open(packed, 'rb') as g:
+        assert DECOMPRESS[kind](g.read()) == f.read()
+
+    expected = io_csv.load_table(plain)
+    loaded = io_csv.load_table(packed, workers=workers)
+    assert loaded.get_column_types() == expected.get_column_types()
+    assert _rows(loaded) == _rows(expected)
+    projected = io_csv.load_table(packed, usecols=['x', 'id'], workers=workers)
+    assert _rows(projected) == _rows(io_csv.load_table(plain, usecols=['x', 'id']))
+    chunks = list(io_csv.iter_tables(packed, chunk_rows=70))
+    assert len(chunks) == 5
+    assert repr([row for chunk in chunks for row in chunk.iter_rows()]) == _rows(expected)
+
+
+@pytest.mark.parametrize('kind', ['gzip', 'xz'])
+def test_compressed_pickle_and_text_match_plain(tmp_path, kind):
+    table = _table()
+    io_pickle.save_table(table, str(tmp_path / 'data.pkl'))
+    io_pickle.save_table(table, str(tmp_path / ('data.pkl' + SUFFIXES[kind])))
+    assert DECOMPRESS[kind]((tmp_path / ('data.pkl' + SUFFIXES[kind])).read_bytes()) == \
+        (tmp_path / 'data.pkl').read_bytes()
+    assert _rows(io_pickle.load_table(str(tmp_path / ('data.pkl' + SUFFIXES[kind])))) == _rows(table)
+
+    io_text.save_table(table, str(tmp_path / 'data.txt'))
+    io_text.save_table(table, str(tmp_path / 'data.txt.bin'), compression=kind)
+    assert DECOMPRESS[kind]((tmp_path / 'data.txt.bin').read_bytes()) == (tmp_path / 'data.txt').read_bytes()
+
+
+def test_empty_table_round_trip(tmp_path):
+    path = str(tmp_path / 'empty.csv.gz')
+    io_csv.save_table(Table(columns=['a', 'b'], rows=[]), path)
+    loaded = io_csv.load_table(path)
+    assert loaded.columns == ['a', 'b'] and loaded.row_count() == 0
+
+
+def test_missing_optional_codec(tmp_path, monkeypatch):
+    monkeypatch.setattr(compression, 'zstandard', None)
+    monkeypatch.setattr(compression, 'lz4_frame', None)
+    with pytest.raises(IOError, match="needs the 'zstandard' package"):
+        io_csv.save_table(_table(), str(tmp_path / 'data.csv.zst'))
+    with pytest.raises(ImportError, match="needs the 'lz4' package"):
+        open_file(str(tmp_path / 'data.csv.lz4'), 'rb')
@@ -0,0 +1,122 @@
+# tests/test_groupby.py
+import pytest
+
+import vectorized
+from table import Table, TableError
+
+NAN = float('nan')
+
+ROWS = [
+    ['b', 1, 2.5, True],
+    ['a', None, 1.0, False],
+    ['b', 3, NAN, None],
+    [None, 4, None, True],
+    ['a', -2, 0.5, True],
+    ['c', None, None, None],
+    ['b', 2 ** 40, -1.0, False],
+]
+# Without NaN the float column is aggregated by NumPy as well
+FINITE_ROWS = [row[:2] + [7.25 if row[2] != row[2] else row[2]] + row[3:] for row in ROWS]
+SPEC = {'i': ['sum', 'mean', 'min', 'max', 'count'], 'f': ['count', 'max', 'sum'], 'b': ['sum', 'min', 'count']}
+
+
+def _table(rows, columnar):
+    return Table(columns=['k', 'i', 'f', 'b'], rows=rows,
+                 types={'k': str, 'i': int, 'f': float, 'b': bool}, columnar=columnar)
+
+
+def _reference(table, keys, spec):
+    # Row by row: a dict of groups in order of first appearance, None values skipped
+    key_values = [table.get_values(key) for key in keys]
+    # Without keys the whole table is one group, even an empty one
+    groups = {} if keys else {(): []}
+    for i in range(table.row_count()):
+        key = tuple(values[i] for values in key_values)
+        groups.setdefault(key, []).append(i)
+    rows = []
+    for key, positions in groups.items():
+        row = list(key)
+        for column, aggs in spec.items():
+            values = table.get_values(column)
+            bucket = [values[i] for i in positions if values[i] is not None]
+            for agg in aggs:
+                if agg == 'count':
+                    row.append(len(bucket))
+                elif not bucket:
+                    row.append(None)
+                elif agg == 'mean':
+                    row.append(sum(bucket) / len(bucket))
+                else:
+                    row.append({'sum': sum, 'min': min, 'max': max}[agg](bucket))
+        rows.append(row)
+    # repr() keeps NaN comparable
+    return repr(rows)
+
+
+def _agg(table, keys, spec, presorted=False):
+    return repr(list(table.group_by(keys, presorted=presorted).agg(spec).iter_rows()))
+
+
+@pytest.mark.parametrize('rows', [ROWS, FINITE_ROWS, [], [ROWS[5]]])
+@pytest.mark.parametrize('keys', [['k'], ['k', 'b'], []])
+def test_hash_and_vectorized_grouping_match_reference(monkeypatch, rows, keys):
+    expected = _reference(_table(rows, False), keys, SPEC)
+    assert _agg(_table(rows, False), keys, SPEC) == expected
+    assert _agg(_table(rows, True), keys, SPEC) == expected
+    monkeypatch.setattr(vectorized, 'np', None)
+    assert _agg(_table(rows, True), keys, SPEC) == expected
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('rows', [ROWS, []])
+def test_presorted_grouping_matches_hash_grouping(columnar, rows):
+    table = _table(rows, columnar).sort_by(['k', 'b'])
+    assert _agg(table, ['k', 'b'], SPEC, presorted=True) == _agg(table, ['k', 'b'], SPEC)
+    assert _agg(table, 'k', SPEC, presorted=True) == _reference(table, ['k'], SPEC)
+
+
+@pytest.mark.skipif(not vectorized.available(), reason='NumPy is not installed')
+def test_typed_columns_are_aggregated_with_numpy(monkeypatch):
+    calls = []
+    original = vectorized.group_aggregates
+
+    def group_aggregates(column, *args):
+        result = original(column, *args)
+        calls.append((column.typecode, result is not None))
+        return result
+
+    monkeypatch.setattr(vectorized, 'group_aggregates', group_aggregates)
+    _table(ROWS, True).group_by('k').agg(SPEC)
+    # The float column holds NaN and is left to the row pass
+    assert calls == [('q', True), ('d', False), ('b', True)]
+
+
+def test_result_types():
+    result = _table(ROWS, False).group_by('k').agg(SPEC)
+    assert result.columns == ['k', 'i_sum', 'i_mean', 'i_min', 'i_max', 'i_count', 'f_count', 'f_max', 'f_sum',
+                              'b_sum', 'b_min', 'b_count']
+    assert list(result.get_column_types().values()) == [str, int, float, int, int, int, int, float, float,
+                                                        int, bool, int]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('presorted', [False, True])
+def test_aggregation_errors_match_across_paths(columnar, presorted):
+    table = _table(ROWS, columnar)
+    with pytest.raises(TableError, match="sum of column 'k' failed"):
+        table.group_by('b', presorted=presorted).agg({'k': 'sum'})
+    with pytest.raises(ValueError, match="Unknown aggregation 'median'"):
+        table.group_by('b', presorted=presorted).agg({'i': 'median'})
+    with pytest.raises(KeyError):
+        table.group_by('missing', presorted=presorted)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_nan_keys_form_one_group(columnar):
+    table = Table(columns=['k', 'a'], rows=[[NAN, 1], [1.0, 2], [NAN, 3], [None, 4], [1.0, 5], [None, 6]],
+                  types={'k': float, 'a': int}, columnar=columnar)
+    assert _agg(table, 'k', {'a': 'sum'}) == '[[nan, 4], [1.0, 7], [None, 10]]'
+    assert _agg(table, ['a', 'k'], {'a': 'count'}) == _reference(table, ['a', 'k'], {'a': ['count']})
+    ordered = table.sort_by('k')
+    assert _agg(ordered, 'k', {'a': 'sum'}, presorted=True) == _agg(ordered, 'k', {'a': 'sum'})
+    assert _agg(ordered, ['k'], {'a': 'sum'}, presorted=True) == '[[1.0, 7], [nan, 4], [None, 10]]'
@@ -0,0 +1,155 @@
+# tests/test_index.py
+import pytest
+
+from table import Table, TableError, lit
+
+NAN = float('nan')
+
+
+def _table(index=None):
+    table = Table(columns=['k', 'v'], rows=[[3.0, 'a'], [None, 'b'], [1.0, 'c'], [NAN, 'd'], [2.0, 'e']],
+                  types={'k': float})
+    if index is not None:
+        table.create_index('k', kind=index)
+    return table
+
+
+@pytest.mark.parametrize('lo, hi', [(NAN, None), (None, NAN), (1.0, NAN), (NAN, NAN)])
+def test_range_with_nan_bound_matches_scan(lo, hi):
+    assert list(_table('sorted').range('k', lo, hi)) == list(_table().range('k', lo, hi)) == []
+
+
+def _eq(table, scalar):
+    try:
+        return list(table.eq('k', scalar))
+    except TableError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize('rows, col_type, scalar', [
+    ([[1], [None], [2], [1]], int, None),
+    ([[1], [None], [2], [1]], int, 1),
+    ([['1'], ['x'], ['2']], int, None),
+    ([['1'], ['x'], ['2']], int, 1),
+    ([[True], [False], [None]], bool, 'maybe'),
+    ([[1.0], [NAN], [2.0]], float, NAN),
+])
+def test_eq_with_hash_index_matches_scan(rows, col_type, scalar):
+    plain = Table(columns=['k'], rows=rows, types={'k': col_type})
+    indexed = Table(columns=['k'], rows=rows, types={'k': col_type})
+    indexed.create_index('k')
+    assert _eq(indexed, scalar) == _eq(plain, scalar)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('column, vals', [('k', (3.0, None)), (['k', 'v'], ((1.0, 'c'), (2.0, 'x')))])
+def test_get_rows_by_index_matches_scan(columnar, column, vals):
+    plain, indexed = _table(), _table()
+    plain.set_columnar(columnar)
+    indexed.set_columnar(columnar)
+    indexed.create_index(column)
+    expected = list(plain.get_rows_by_index(*vals, column=column).iter_rows())
+    assert list(indexed.get_rows_by_index(*vals, column=column).iter_rows()) == expected
+    assert expected == [row for row in _table().iter_rows()
+                        if (row[0] if column == 'k' else tuple(row)) in vals]
+
+
+def _pair(rows, col_type, kind='hash', columnar=False):
+    plain = Table(columns=['k', 'v'], rows=rows, types={'k': col_type, 'v': int}, columnar=columnar)
+    indexed = Table(columns=['k', 'v'], rows=rows, types={'k': col_type, 'v': int}, columnar=columnar)
+    indexed.create_index('k', kind=kind)
+    return plain, indexed
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_hash_index_follows_writes(columnar):
+    plain, indexed = _pair([[1, 1], [2, None], [None, 3], [2, 4]], int, columnar=columnar)
+    for table in (plain, indexed):
+        table.set_values([2, 2, 5, None], 'k')
+    assert _eq(indexed, 2) == _eq(plain, 2) == [True, True, False, False]
+    for table in (plain, indexed):
+        table.add('v', lit(1), 'k')
+    assert _eq(indexed, 2.0) == _eq(plain, 2.0) == [True, False, False, False]
+    for table in (plain, indexed):
+        table.set_column_types({0: int})
+    assert _eq(indexed, 5) == _eq(plain, 5) == [False, False, False, True]
+
+
+def test_hash_index_defers_scan_errors_with_row_number():
+    plain, indexed = _pair([[1, 1], [None, 2], ['x', 3]], int)
+    assert _eq(indexed, 1) == _eq(plain, 1)
+    assert 'eq failed at row 2' in _eq(indexed, 1)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_hash_index_on_empty_table(columnar):
+    plain, indexed = _pair([], int, columnar=columnar)
+    assert _eq(indexed, 1) == _eq(plain, 1) == []
+    assert indexed.get_rows_by_index(1, column='k').row_count() == 0
+    assert plain.get_rows_by_index(1, column='k').row_count() == 0
+
+
+def test_unhashable_values_cannot_be_indexed():
+    table = Table(columns=['k'], rows=[[[1]], [[2]]])
+    with pytest.raises(TableError, match='Cannot index columns'):
+        table.create_index('k')
+
+
+def _compare(table, method, scalar):
+    try:
+        return list(getattr(table, method)('k', scalar))
+    except TableError as e:
+        return str(e)
+
+
+def _range(table, *args):
+    try:
+        return list(table.range('k', *args))
+    except TableError as e:
+        return str(e)
+
+
+SORTED_ROWS = [[3.0, 1], [None, 2], [1.0, 3], [NAN, 4], [2.0, 5], [1.0, 6]]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('method', ['gr', 'ls', 'ge', 'le'])
+@pytest.mark.parametrize('scalar', [1.0, 1.5, 3, -1, NAN, None, 'x'])
+def test_sorted_index_comparisons_match_scan(columnar, method, scalar):
+    plain, indexed = _pair(SORTED_ROWS, float, kind='sorted', columnar=columnar)
+    assert _compare(indexed, method, scalar) == _compare(plain, method, scalar)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('args', [(1.0, 2.0), (1.0, 2.0, False, False), (None, 1.0), (2.0,), (5.0, 0.0), ('a', 'b')])
+def test_sorted_index_range_matches_scan(columnar, args):
+    plain, indexed = _pair(SORTED_ROWS, float, kind='sorted', columnar=columnar)
+    assert _range(indexed, *args) == _range(plain, *args)
+
+
+def test_incomparable_bound_reports_first_row():
+    plain, indexed = _pair(SORTED_ROWS, float, kind='sorted')
+    assert _range(indexed, 'a') == _range(plain, 'a')
+    assert 'range failed at row 0' in _range(indexed, 'a')
+    assert _compare(indexed, 'gr', 'x') == _compare(plain, 'gr', 'x')
+    assert 'gr failed at row 0' in _compare(indexed, 'gr', 'x')
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_sorted_index_follows_writes_and_type_changes(columnar):
+    plain, indexed = _pair([['10', 1], ['9', 2], [None, 3]], str, kind='sorted', columnar=columnar)
+    assert _compare(indexed, 'gr', '5') == _compare(plain, 'gr', '5') == [False, True, False]
+    for table in (plain, indexed):
+        table.set_column_types({'k': int}, by_number=False)
+    assert _compare(indexed, 'gr', 5) == _compare(plain, 'gr', 5) == [True, True, False]
+    for table in (plain, indexed):
+        table.set_values([1, None, 7], 'k')
+    assert _range(indexed, 2, 8) == _range(plain, 2, 8) == [2]
+
+
+@pytest.mark.parametrize('rows', [[], [[None, 1], [NAN, 2]]])
+def test_sorted_index_without_values(rows):
+    plain, indexed = _pair(rows, float, kind='sorted')
+    assert _range(indexed, 0.0, 1.0) == _range(plain, 0.0, 1.0) == []
+    assert _compare(indexed, 'le', 1.0) == _compare(plain, 'le', 1.0)
+    assert _range(indexed, 'a') == _range(plain, 'a')
@@ -0,0 +1,90 @@
+# tests/test_instrument.py
+import pytest
+
+import instrument
+import io_csv
+from table import Table, TableError
+
+
+@pytest.fixture(autouse=True)
+def _off():
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def _table(columnar=False):
+    return Table(columns=['a', 'b'], rows=[[1, 2.0], [None, 0.0], [3, None]],
+                 types={'a': int, 'b': float}, columnar=columnar)
+
+
+def _outcome(call):
+    try:
+        return repr(call())
+    except TableError as e:
+        return type(e), str(e)
+
+
+CALLS = [
+    lambda t: t.add('a', 'b'),
+    lambda t: list(t.gr('b', 0.5)),
+    lambda t: t.div('a', 'b'),
+    lambda t: list(t.filter_rows(t.eq('a', 3)).iter_rows()),
+    lambda t: t.get_rows_by_number(0, 1).get_values('b'),
+]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('call', CALLS)
+def test_instrumented_results_match_plain_calls(columnar, call):
+    expected = _outcome(lambda: call(_table(columnar)))
+    instrument.enable(memory=True)
+    with instrument.profile():
+        assert _outcome(lambda: call(_table(columnar))) == expected
+
+
+def test_records_only_outermost_calls(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    io_csv.save_table(_table(), path)
+    records = []
+    instrument.enable()
+    instrument.add_hook(records.append)
+    try:
+        table = io_csv.load_table(path)
+        table.add('a', 'b', 'c')
+        with pytest.raises(TableError, match='div failed at row 0'):
+            table.div('b', 0.0)
+    finally:
+        instrument.remove_hook(records.append)
+    assert [(r.name, r.rows, r.failed, r.bytes) for r in records] == [
+        ('io_csv.load_table', 3, False, None), ('Table.add', 3, False, None), ('Table.div', None, True, None)]
+    stats = instrument.snapshot()
+    assert set(stats) == {'io_csv.load_table', 'Table.add', 'Table.div'}
+    assert stats['Table.div']['errors'] == 1 and stats['Table.div']['rows'] == 0
+    assert stats['Table.add']['seconds'] == stats['Table.add']['max_seconds'] > 0
+
+
+def test_profile_counts_only_its_block():
+    _table().get_values('a')
+    with instrument.profile(memory=True) as stats:
+        assert not instrument.is_enabled()
+        _table().get_values('a')
+    _table().get_values('a')
+    snapshot = stats.snapshot()
+    assert snapshot['Table.get_values']['calls'] == 1
+    assert snapshot['Table.__init__']['calls'] == 1 and snapshot['Table.__init__']['rows'] == 3
+    assert snapshot['Table.get_values']['bytes'] is not None
+    assert instrument.snapshot() == {}
+
+
+def test_disabled_instrumentation_records_nothing():
+    records = []
+    instrument.add_hook(records.append)
+    try:
+        _table().add('a', 'b')
+        instrument.enable()
+        instrument.disable()
+        _table().add('a', 'b')
+    finally:
+        instrument.remove_hook(records.append)
+    assert records == [] and instrument.snapshot() == {}
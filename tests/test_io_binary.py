@@ -0,0 +1,87 @@
+# tests/test_io_binary.py
+import pytest
+
+import io_binary
+from table import Table, TableError
+
+NAN = float('nan')
+
+
+def _table(columnar, n_rows=5):
+    data = {
+        'i': [1, None, -3, 2 ** 62, 0],
+        'f': [0.5, NAN, None, -1e300, 2.0],
+        'b': [True, None, False, True, False],
+        's': ['x', '', None, 'юникод', 'a,b\n"c"'],
+        'big': [2 ** 70, None, 1, -2 ** 64, 5],
+        'mixed': [1, 'a', None, 2.5, [1]],
+    }
+    types = {'i': int, 'f': float, 'b': bool, 's': str, 'big': int, 'mixed': str}
+    return Table.from_columns(list(data), [values[:n_rows] for values in data.values()],
+                              types=types, columnar=columnar)
+
+
+def _rows(table):
+    # repr() keeps NaN comparable
+    return repr(list(table.iter_rows()))
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('n_rows', [0, 1, 5])
+def test_round_trip_matches_source(tmp_path, columnar, n_rows):
+    table = _table(columnar, n_rows)
+    path = str(tmp_path / 'table.bin')
+    io_binary.save_table(table, path)
+    loaded = io_binary.load_table(path)
+    assert loaded.columnar
+    assert loaded.columns == table.columns
+    assert loaded.get_column_types() == table.get_column_types()
+    assert loaded.get_column_types(by_number=False) == table.get_column_types(by_number=False)
+    assert loaded.row_count() == n_rows
+    assert _rows(loaded) == _rows(table)
+
+
+def test_numeric_columns_are_mapped_in_place(tmp_path):
+    path = str(tmp_path / 'table.bin')
+    io_binary.save_table(_table(True), path)
+    loaded = io_binary.load_table(path)
+    buffer = loaded.get_column_buffer('i')
+    assert buffer.typecode == 'q' and isinstance(buffer.data, memoryview)
+    assert isinstance(loaded.get_column_buffer('s').data, io_binary.Utf8Column)
+
+
+def test_loaded_table_computes_like_source(tmp_path):
+    table = _table(True)
+    path = str(tmp_path / 'table.bin')
+    io_binary.save_table(table, path)
+    loaded = io_binary.load_table(path)
+    assert repr(loaded.mul('i', 'f')) == repr(table.mul('i', 'f'))
+    assert list(loaded.gr('f', 0.0)) == list(table.gr('f', 0.0))
+    assert list(loaded.eq('s', '')) == list(table.eq('s', ''))
+    assert _rows(loaded.get_rows_by_number(1, 3)) == _rows(table.get_rows_by_number(1, 3))
+    with pytest.raises(TableError) as loaded_error:
+        loaded.div('i', 'b')
+    with pytest.raises(TableError) as table_error:
+        table.div('i', 'b')
+    assert str(loaded_error.value) == str(table_error.value)
+
+
+def test_writes_to_loaded_table_leave_file_unchanged(tmp_path):
+    path = str(tmp_path / 'table.bin')
+    io_binary.save_table(_table(True), path)
+    loaded = io_binary.load_table(path)
+    loaded.set_values([9, 8, 7, 6, 5], 'i')
+    loaded.set_values(['p', None, 'q', 'r', 's'], 's')
+    assert loaded.get_values('i') == [9, 8, 7, 6, 5]
+    again = io_binary.load_table(path)
+    assert again.get_values('i') == [1, None, -3, 2 ** 62, 0]
+    assert again.get_values('s') == ['x', '', None, 'юникод', 'a,b\n"c"']
+
+
+def test_load_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        io_binary.load_table(str(tmp_path / 'missing.bin'))
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a table file')
+    with pytest.raises(IOError, match='not a binary table file'):
+        io_binary.load_table(str(path))
@@ -0,0 +1,284 @@
+# tests/test_io_csv.py
+import csv
+import io
+import re
+
+import pytest
+
+import io_binary
+import io_csv
+from table import Table, TableError
+
+
+def test_sampled_types_widen_columns_empty_in_sample(tmp_path):
+    path = tmp_path / 'sparse.csv'
+    scores = {500: '7', 900: '9'}
+    lines = ['id,score'] + [f"{i},{scores.get(i, '')}" for i in range(1000)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    sampled = io_csv.load_table(str(path), sample_rows=2)
+    full = io_csv.load_table(str(path))
+    assert sampled.types == full.types
+    assert sampled.types[1] is int
+    assert sampled.get_values('score') == full.get_values('score')
+
+
+def test_detect_types_matches_load_table(tmp_path):
+    path = tmp_path / 'mixed.csv'
+    lines = ['i,f,b,s,e'] + [f"{i},{i / 2},{'true' if i % 2 else 'false'},{'x' if i == 150_001 else i}," for i in range(150_002)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    table = io_csv.load_table(str(path))
+    # The column without values gets no type
+    assert io_csv.detect_types(str(path)) == {idx: table._type_for(idx) for idx in range(4)}
+    assert io_csv.detect_types(str(path), usecols=['s', 'f']) == {0: str, 1: float}
+
+
+def _small_ids(row):
+    return int(row[0]) < 3
+
+
+def _write_ids(path, n_rows):
+    path.write_text('id,name\n' + ''.join(f"{i},n{i}\n" for i in range(n_rows)), encoding='utf-8')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_failing_where_raises_table_error(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(io_csv, '_PARALLEL_MIN_BYTES', 0)
+    path = tmp_path / 'ids.csv'
+    _write_ids(path, 10)
+    path.write_text(path.read_text(encoding='utf-8') + 'x,bad\n', encoding='utf-8')
+    with pytest.raises(TableError, match='where failed at') as error:
+        io_csv.load_table(str(path), where=_small_ids, workers=workers)
+    if workers == 1:
+        assert 'data row 10' in str(error.value)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('usecols, error', [(['id', 'zz'], KeyError), ([5], IndexError)])
+def test_bad_usecols_raise_column_errors(tmp_path, monkeypatch, workers, usecols, error):
+    monkeypatch.setattr(io_csv, '_PARALLEL_MIN_BYTES', 0)
+    path = tmp_path / 'ids.csv'
+    _write_ids(path, 10)
+    with pytest.raises(error):
+        io_csv.load_table(str(path), usecols=usecols, workers=workers)
+    with pytest.raises(error):
+        next(io_csv.iter_tables(str(path), usecols=usecols))
+
+
+def test_iter_tables_types_match_load_table_when_later_rows_widen(tmp_path):
+    path = tmp_path / 'late.csv'
+    lines = ['n,flag'] + [f"{i},{'true' if i % 2 else 'false'}" for i in range(30_000)] + ['0.017,maybe']
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    loaded = io_csv.load_table(str(path))
+    chunks = list(io_csv.iter_tables(str(path), chunk_rows=7_000))
+    assert len(chunks) == 5
+    for chunk in chunks:
+        assert [chunk._type_for(idx) for idx in range(2)] == [float, str]
+    assert [v for chunk in chunks for v in chunk.get_values('n')] == loaded.get_values('n')
+
+
+def test_iter_tables_unknown_type_column_raises_key_error(tmp_path):
+    path = tmp_path / 'ids.csv'
+    _write_ids(path, 3)
+    with pytest.raises(KeyError, match="'zz' not found"):
+        next(io_csv.iter_tables(str(path), types={'zz': int}))
+
+
+def _records(n_rows):
+    # Quoted cells with delimiters, doubled quotes and newlines; later rows widen int -> float and bool -> str
+    records = ['id,note,x,flag\r\n']
+    for i in range(n_rows):
+        note = f'"line {i}\nnext, ""q""\r\nend"' if i % 3 == 0 else ('' if i % 3 == 1 else f'plain {i}')
+        x = '' if i % 5 == 0 else (f'{i}.5' if i == n_rows - 2 else str(i))
+        flag = 'maybe' if i == n_rows - 1 else ('true' if i % 2 else 'false')
+        records.append(f'{i},{note},{x},{flag}\r\n' if i % 2 else f'{i},{note},{x},{flag}\n')
+    return records
+
+
+@pytest.mark.parametrize('block', [5, 64, 1 << 20])
+def test_record_ends_never_split_quoted_newlines(tmp_path, monkeypatch, block):
+    monkeypatch.setattr(io_csv, '_SCAN_BLOCK', block)
+    records = _records(12)
+    path = tmp_path / 'quoted.csv'
+    path.write_bytes(''.join(records).encode('utf-8'))
+    ends, offset = [], 0
+    for record in records:
+        offset += len(record.encode('utf-8'))
+        ends.append(offset)
+    with open(path, 'rb') as f:
+        for target in range(offset + 1):
+            expected = next((end for end in ends if end > target), offset)
+            assert io_csv._record_ends(f, 0, [target]) == [expected]
+        assert io_csv._record_ends(f, 0, list(range(0, offset, 7))) == [
+            next((end for end in ends if end > t), offset) for t in range(0, offset, 7)]
+
+
+@pytest.mark.parametrize('has_header', [True, False])
+@pytest.mark.parametrize('usecols', [None, ['flag', 'note', 'x']])
+@pytest.mark.parametrize('n_rows', [0, 1, 40])
+def test_parallel_load_matches_serial(tmp_path, monkeypatch, has_header, usecols, n_rows):
+    monkeypatch.setattr(io_csv, '_PARALLEL_MIN_BYTES', 0)
+    monkeypatch.setattr(io_csv, '_PART_BYTES', 97)
+    monkeypatch.setattr(io_csv, '_SCAN_BLOCK', 13)
+    if usecols is not None and not has_header:
+        usecols = [3, 1, 2]
+    path = tmp_path / 'quoted.csv'
+    path.write_bytes(''.join(_records(n_rows)).encode('utf-8'))
+    serial = io_csv.load_table(str(path), has_header=has_header, usecols=usecols)
+    parallel = io_csv.load_table(str(path), has_header=has_header, usecols=usecols, workers=2, columnar=True)
+    assert parallel.columnar
+    assert list(parallel.columns) == list(serial.columns)
+    assert parallel.get_column_types() == serial.get_column_types()
+    assert list(parallel.iter_rows()) == list(serial.iter_rows())
+
+
+def test_parallel_load_of_empty_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(io_csv, '_PARALLEL_MIN_BYTES', 0)
+    path = tmp_path / 'empty.csv'
+    path.write_text('', encoding='utf-8')
+    table = io_csv.load_table(str(path), workers=2)
+    assert list(table.columns) == [] and table.row_count() == 0
+
+
+def _csv_reference(table, delimiter=',', has_header=True):
+    # csv.writer row by row, None -> empty cell
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer, delimiter=delimiter)
+    if has_header:
+        writer.writerow(table.columns)
+    for row in table.iter_rows():
+        writer.writerow(['' if value is None else str(value) for value in row])
+    return buffer.getvalue()
+
+
+def _save_table(columnar, rows):
+    return Table(columns=['id', 'text', 'x', 'flag'], rows=rows,
+                 types={'id': int, 'text': str, 'x': float, 'flag': bool}, columnar=columnar)
+
+
+SAVE_ROWS = [[1, 'plain', 0.5, True], [None, 'a,b', float('nan'), None], [-2, 'say "hi"', None, False],
+             [2 ** 70, 'line\nbreak\r', 1e-300, True], [0, '', -0.0, None], [5, 'a;b\tc', 2.0, False]]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('rows', [SAVE_ROWS, SAVE_ROWS[:1], SAVE_ROWS[4:5], []])
+@pytest.mark.parametrize('chunk_rows, workers', [(io_csv.DEFAULT_CHUNK_ROWS, 1), (1, 1), (4, 1), (2, 2)])
+@pytest.mark.parametrize('delimiter, has_header', [(',', True), (';', False), ('\t', True)])
+def test_save_table_matches_csv_writer(tmp_path, columnar, rows, chunk_rows, workers, delimiter, has_header):
+    table = _save_table(columnar, rows)
+    path = tmp_path / 'out.csv'
+    io_csv.save_table(table, str(path), delimiter=delimiter, has_header=has_header,
+                      chunk_rows=chunk_rows, workers=workers)
+    assert path.read_bytes().decode('utf-8') == _csv_reference(table, delimiter, has_header)
+
+
+@pytest.mark.parametrize('values', [['', None, 'x'], [None], ['a'], ['', '']])
+def test_save_single_column_quotes_empty_fields_like_csv_writer(tmp_path, values):
+    table = Table(columns=['s'], rows=[[v] for v in values])
+    path = tmp_path / 'out.csv'
+    io_csv.save_table(table, str(path))
+    assert path.read_bytes().decode('utf-8') == _csv_reference(table)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_save_table_parts_and_mapped_columns(tmp_path, workers):
+    source = tmp_path / 'src.csv'
+    io_csv.save_table(_save_table(False, SAVE_ROWS * 5), str(source))
+    loaded = io_csv.load_table(str(source), columnar=True)
+    expected = _csv_reference(loaded).encode('utf-8')
+    parts = tmp_path / 'parts.csv'
+    io_csv.save_table(io_csv.iter_tables(str(source), chunk_rows=7), str(parts), chunk_rows=3, workers=workers)
+    assert parts.read_bytes() == expected
+
+    binary = str(tmp_path / 'table.bin')
+    io_binary.save_table(loaded, binary)
+    mapped = tmp_path / 'mapped.csv'
+    io_csv.save_table(io_binary.load_table(binary), str(mapped), chunk_rows=4, workers=workers)
+    assert mapped.read_bytes() == expected
+
+    empty = tmp_path / 'empty.csv'
+    io_csv.save_table(iter([]), str(empty), workers=workers)
+    assert empty.read_bytes() == b''
+
+
+def test_save_table_argument_errors(tmp_path):
+    table = _save_table(False, SAVE_ROWS)
+    with pytest.raises(ValueError, match='chunk_rows must be positive'):
+        io_csv.save_table(table, str(tmp_path / 'out.csv'), chunk_rows=0)
+    with pytest.raises(ValueError, match='workers must be positive'):
+        io_csv.save_table(table, str(tmp_path / 'out.csv'), workers=0)
+
+
+def _no_marker(row):
+    return 'x' not in row
+
+
+def _write_marked(path, n_rows):
+    # 'x' cells sit in rows that _no_marker drops; without them column a is int
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'a', 'b', 'c'])
+        for i in range(n_rows):
+            a = 'x' if i % 7 == 3 else ('' if i % 5 == 0 else str(i))
+            c = 'x' if i % 11 == 4 else f" note {i},\n{'x' * (i % 3)} "
+            writer.writerow([i, a, 'true' if i % 2 else f'{i}.5', c])
+
+
+def _filtered_reference(tmp_path, src, usecols, where):
+    # The file cut down to the projected, kept rows by csv.reader and written out, then loaded
+    with open(src, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    header = rows[0]
+    positions = [c if isinstance(c, int) else header.index(c) for c in (range(len(header)) if usecols is None else usecols)]
+    dst = tmp_path / 'reference.csv'
+    with open(dst, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([header[p] for p in positions])
+        for row in rows[1:]:
+            values = [row[p].strip() or None for p in positions]
+            if where is None or where(list(values)):
+                writer.writerow(['' if v is None else v for v in values])
+    return io_csv.load_table(str(dst))
+
+
+@pytest.mark.parametrize('usecols', [None, ['c', 'a'], [2, 0]])
+@pytest.mark.parametrize('where', [None, _no_marker])
+@pytest.mark.parametrize('n_rows', [0, 1, 60])
+def test_usecols_and_where_match_filtered_file(tmp_path, monkeypatch, usecols, where, n_rows):
+    monkeypatch.setattr(io_csv, '_PARALLEL_MIN_BYTES', 0)
+    monkeypatch.setattr(io_csv, '_PART_BYTES', 200)
+    src = tmp_path / 'marked.csv'
+    _write_marked(src, n_rows)
+    expected = _filtered_reference(tmp_path, src, usecols, where)
+    results = [io_csv.load_table(str(src), usecols=usecols, where=where),
+               io_csv.load_table(str(src), usecols=usecols, where=where, sample_rows=3),
+               io_csv.load_table(str(src), usecols=usecols, where=where, workers=2, columnar=True)]
+    for result in results:
+        assert list(result.columns) == list(expected.columns)
+        assert result.get_column_types() == expected.get_column_types()
+        assert list(result.iter_rows()) == list(expected.iter_rows())
+    chunks = list(io_csv.iter_tables(str(src), chunk_rows=9, usecols=usecols, where=where))
+    assert [row for chunk in chunks for row in chunk.iter_rows()] == list(expected.iter_rows())
+    if n_rows == 60 and where is not None and usecols != [2, 0]:
+        assert expected.get_column_types()[list(expected.columns).index('a')] is int
+
+
+def _fails_on_40(row):
+    if row[0] == '40':
+        raise ValueError('bad row')
+    return True
+
+
+def test_parallel_where_error_names_the_failing_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(io_csv, '_PARALLEL_MIN_BYTES', 0)
+    monkeypatch.setattr(io_csv, '_PART_BYTES', 200)
+    src = tmp_path / 'marked.csv'
+    _write_marked(src, 60)
+    with pytest.raises(TableError, match='where failed at data row 40: bad row'):
+        io_csv.load_table(str(src), where=_fails_on_40)
+    with pytest.raises(TableError, match='where failed at row') as error:
+        io_csv.load_table(str(src), where=_fails_on_40, workers=2)
+    row, start = map(int, re.search(r'at row (\d+) of the part starting at byte (\d+)', str(error.value)).groups())
+    with open(src, 'rb') as f:
+        f.seek(start)
+        records = list(csv.reader(io.StringIO(f.read().decode('utf-8'), newline='')))
+    assert records[row][0] == '40'
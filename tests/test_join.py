@@ -0,0 +1,103 @@
+# tests/test_join.py
+import pytest
+
+import join
+from table import Table, TableError
+
+NAN = float('nan')
+
+
+def _reference(left, right, on, how, suffix='_right'):
+    # Nested loops over the rows: pairs in left row order, then right rows without a pair
+    left_keys = list(zip(*[left.get_values(c) for c in on]))
+    right_keys = list(zip(*[right.get_values(c) for c in on]))
+    left_rows, right_rows = list(left.iter_rows()), list(right.iter_rows())
+    left_on = [left.columns.index(c) for c in on]
+    right_on = [right.columns.index(c) for c in on]
+    left_rest = [i for i in range(len(left.columns)) if i not in left_on]
+    right_rest = [i for i in range(len(right.columns)) if i not in right_on]
+
+    def row(i, j):
+        keys = [left_rows[i][c] for c in left_on] if i is not None else [right_rows[j][c] for c in right_on]
+        return (keys + [None if i is None else left_rows[i][c] for c in left_rest]
+                + [None if j is None else right_rows[j][c] for c in right_rest])
+
+    rows, matched = [], set()
+    for i, key in enumerate(left_keys):
+        # Compared value by value: a NaN key equals nothing, not even itself
+        pairs = [j for j, other in enumerate(right_keys)
+                 if None not in key and all(a == b for a, b in zip(key, other))]
+        rows.extend(row(i, j) for j in pairs)
+        matched.update(pairs)
+        if not pairs and how in ('left', 'outer'):
+            rows.append(row(i, None))
+    if how == 'outer':
+        rows.extend(row(None, j) for j in range(len(right_rows)) if j not in matched)
+    names = [left.columns[c] for c in left_on] + [left.columns[c] for c in left_rest]
+    names += [right.columns[c] + suffix if right.columns[c] in names else right.columns[c] for c in right_rest]
+    return names, repr(rows)
+
+
+def _join(left, right, on, how):
+    result = left.join(right, on, how=how)
+    return list(result.columns), repr(list(result.iter_rows()))
+
+
+LEFT = [[3, 'x', 1.5], [1, 'y', None], [None, 'z', 2.0], [2, 'x', NAN], [1, 'w', 0.0], [5, 'v', 1.0]]
+RIGHT = [[1, 'x', 10], [2, None, 20], [1, 'y', 30], [4, 'x', 40], [None, 'z', 50], [3, 'x', 60]]
+
+
+def _left(rows, columnar=False):
+    return Table(columns=['k', 's', 'v'], rows=rows, types={'k': int, 's': str, 'v': float}, columnar=columnar)
+
+
+def _right(rows, columnar=False):
+    return Table(columns=['k', 's', 'v'], rows=rows, types={'k': int, 's': str, 'v': int}, columnar=columnar)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('how', ['inner', 'left', 'outer'])
+@pytest.mark.parametrize('on', [['k'], ['k', 's']])
+@pytest.mark.parametrize('left_rows, right_rows', [(LEFT, RIGHT), (LEFT, RIGHT[:2]), (LEFT[:2], RIGHT),
+                                                   ([], RIGHT), (LEFT, []), ([], [])])
+def test_hash_join_matches_nested_loops(columnar, how, on, left_rows, right_rows):
+    left, right = _left(left_rows, columnar), _right(right_rows, columnar)
+    assert _join(left, right, on, how) == _reference(left, right, on, how)
+
+
+@pytest.mark.parametrize('how', ['inner', 'left', 'outer'])
+@pytest.mark.parametrize('on', [['k'], ['k', 's']])
+def test_merge_join_of_sorted_tables_matches_nested_loops(monkeypatch, how, on):
+    left = _left([row for row in LEFT if row[0] is not None and row[1] is not None]).sort_by(on)
+    right = _right([row for row in RIGHT if row[0] is not None and row[1] is not None]).sort_by(on)
+    calls = []
+    merge = join._merge_join
+    monkeypatch.setattr(join, '_merge_join', lambda *args: calls.append(how) or merge(*args))
+    assert _join(left, right, on, how) == _reference(left, right, on, how)
+    assert calls == [how]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('on', [['v'], ['k', 'v']])
+def test_nan_keys_never_match(columnar, on):
+    left = _left([[1, 'a', NAN], [2, 'b', 1.0]], columnar)
+    right = _left([[1, 'c', NAN], [2, 'd', 1.0]], columnar)
+    for how in ('inner', 'left', 'outer'):
+        assert _join(left, right, on, how) == _reference(left, right, on, how)
+    assert left.join(right, on).row_count() == 1
+
+
+def test_keys_of_different_types_fall_back_to_hash_join():
+    left = Table(columns=['k', 'a'], rows=[[1, 'p'], [2, 'q']], types={'k': int})
+    right = Table(columns=['k', 'b'], rows=[['1', 'r'], ['2', 's']], types={'k': str})
+    assert _join(left, right, ['k'], 'outer') == _reference(left, right, ['k'], 'outer')
+
+
+def test_join_errors():
+    left, right = _left(LEFT), _right(RIGHT)
+    with pytest.raises(ValueError, match="Unknown join kind 'cross'"):
+        left.join(right, 'k', how='cross')
+    with pytest.raises(TableError, match='at least one key column'):
+        left.join(right, [])
+    with pytest.raises(KeyError):
+        left.join(right, 'missing')
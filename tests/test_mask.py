@@ -0,0 +1,76 @@
+# tests/test_mask.py
+import operator
+import pickle
+
+import pytest
+
+from mask import Mask
+from table import Table, TableError
+
+A = [True, False, True, True, False, False, True, False, True]
+B = [False, False, True, False, True, False, True, True, False]
+
+
+@pytest.mark.parametrize('a, b', [(A, B), ([], []), ([True], [False]), (A * 40, B * 40)])
+@pytest.mark.parametrize('op', [operator.and_, operator.or_, operator.xor])
+def test_bitwise_ops_match_list_of_bool(a, b, op):
+    expected = [bool(op(x, y)) for x, y in zip(a, b)]
+    assert list(op(Mask(a), Mask(b))) == expected
+    assert list(op(Mask(a), b)) == expected
+    assert list(op(a, Mask(b))) == expected
+    assert list(~Mask(a)) == [not x for x in a]
+
+
+@pytest.mark.parametrize('values', [A, [], [0, 2, None, 'x', ''], b'\x00\x05\x01'])
+def test_list_behaviour(values):
+    expected = [bool(v) for v in values]
+    mask = Mask(values)
+    assert len(mask) == len(expected)
+    assert mask == expected and mask == tuple(expected) and mask == Mask(expected)
+    assert repr(mask) == repr(expected)
+    assert mask.to_list() == expected
+    assert mask.count() == mask.count(True) == expected.count(True)
+    assert mask.count(False) == expected.count(False)
+    assert list(mask.nonzero()) == [i for i, v in enumerate(expected) if v]
+    assert list(mask[1:]) == expected[1:] and list(mask[::-2]) == expected[::-2]
+    if expected:
+        assert mask[-1] is expected[-1] and mask[0] is expected[0]
+    assert pickle.loads(pickle.dumps(mask)) == mask
+    assert Mask.concat([mask, Mask(A)]) == expected + A
+
+
+def test_length_mismatch():
+    with pytest.raises(ValueError, match='Masks of different lengths: 9 and 2'):
+        Mask(A) & [True, False]
+    assert Mask(A) != [True]
+
+
+def _rows(table):
+    return repr(list(table.iter_rows()))
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_comparisons_and_filtering_match_list_of_bool(columnar):
+    rows = [[i if i % 3 else None, float(i % 4)] for i in range(12)]
+    table = Table(columns=['a', 'b'], rows=rows, types={'a': int, 'b': float}, columnar=columnar)
+    gr = table.gr('a', 4)
+    assert isinstance(gr, Mask)
+    assert gr == [row[0] is not None and row[0] > 4 for row in rows]
+    both = gr & table.le('b', 1.0) | ~table.ne('a', 2)
+    # None compares False in ne as well, so ~ne is true for the rows without a value
+    expected = [(x and y) or not z for x, y, z in zip(list(gr), list(table.le('b', 1.0)), list(table.ne('a', 2)))]
+    assert expected == [(r[0] is not None and r[0] > 4 and r[1] <= 1.0) or r[0] is None or r[0] == 2 for r in rows]
+    assert both == expected
+    assert _rows(table.filter_rows(both)) == _rows(table.filter_rows(expected))
+    assert _rows(table.filter_rows(both, copy_table=True)) == _rows(table.filter_rows(list(both)))
+    assert table.filter_rows(~Mask([True] * 12)).row_count() == 0
+    with pytest.raises(TableError, match="Boolean list length 3 doesn't match rows count 12"):
+        table.filter_rows(Mask([True] * 3))
+    with pytest.raises(TableError, match="Boolean list length 3 doesn't match rows count 12"):
+        table.filter_rows([True] * 3)
+
+
+def test_empty_table_masks():
+    table = Table(columns=['a'], rows=[], types={'a': int})
+    mask = table.gr('a', 1)
+    assert mask == [] and (mask | []) == [] and table.filter_rows(mask).row_count() == 0
@@ -0,0 +1,75 @@
+# tests/test_parallel.py
+import pytest
+
+import parallel
+from table import Table, TableError, col, lit
+
+NAN = float('nan')
+
+
+def _table(columnar, n_rows=11):
+    rows = [[i if i % 4 else None, i / 2 if i % 3 else NAN, str(i)] for i in range(n_rows)]
+    return Table(columns=['a', 'b', 's'], rows=rows, types={'a': int, 'b': float, 's': str}, columnar=columnar)
+
+
+def _state(table):
+    # repr() keeps NaN comparable
+    return list(table.columns), table.get_column_types(), repr(list(table.iter_rows()))
+
+
+def _run(table, ops, workers):
+    try:
+        results = table.compute_many(ops, workers=workers)
+    except (TableError, ValueError) as e:
+        return (type(e), str(e)), _state(table)
+    return repr([list(r) if r is not None else None for r in results]), _state(table)
+
+
+OPS = [
+    [('add', 'a', 'b', 'c'), ('mul', 'c', lit(2)), ('gr', 'c', 3.0), ('sub', 'c', col('a'), 'c'), ('le', 'b', 2)],
+    [('div', 'b', 'a', 'd'), ('eq', 'd', 0.5), ('ne', 'a', lit(0)), ('add', 'd', 1.5, 'b')],
+    [('mul', 'a', lit(1.5), 'a'), ('ls', 'a', 'b')],
+    [('div', 'a', lit(0))],
+    [('add', 'a', 1, 'c'), ('div', 'b', 'c', 'd'), ('gr', 's', lit(5))],
+    [('add', 'a', 'b', 'c'), ('add', 's', lit(1), 'c')],
+    [],
+]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('workers', [2, 3])
+@pytest.mark.parametrize('ops', OPS)
+@pytest.mark.parametrize('n_rows', [11, 2, 0])
+def test_parallel_matches_sequential_calls(monkeypatch, columnar, workers, ops, n_rows):
+    monkeypatch.setattr(parallel, '_PARALLEL_MIN_ROWS', 0)
+    expected = _run(_table(columnar, n_rows), ops, 1)
+    assert _run(_table(columnar, n_rows), ops, workers) == expected
+
+
+def test_row_errors_are_numbered_from_the_table_start(monkeypatch):
+    monkeypatch.setattr(parallel, '_PARALLEL_MIN_ROWS', 0)
+    ops = [('add', 'a', lit(1), 'c'), ('div', 'c', 'b')]
+    tables = [_table(False), _table(False)]
+    for table in tables:
+        # Row 8 has no value in a, so the first failing row is 9, in the last of three parts
+        table.set_values([1.0] * 8 + [0.0] * 3, 'b')
+    expected = _run(tables[0], ops, 1)
+    assert expected[0] == (TableError, 'div failed at row 9: Division by zero')
+    assert _run(tables[1], ops, 3) == expected
+    # The operation before the failing one has been written
+    assert tables[1].get_values('c')[:2] == [None, 2.0]
+
+
+def test_operation_errors(monkeypatch):
+    monkeypatch.setattr(parallel, '_PARALLEL_MIN_ROWS', 0)
+    table = _table(False)
+    with pytest.raises(ValueError, match="Unknown operation 'pow'"):
+        table.compute_many([('pow', 'a', 2)], workers=2)
+    with pytest.raises(ValueError, match="Comparison 'gr' takes no result column"):
+        table.compute_many([('gr', 'a', 2, 'c')], workers=2)
+    with pytest.raises(ValueError, match='Operation must be'):
+        table.compute_many([('add', 'a')], workers=2)
+    with pytest.raises(ValueError, match='workers must be positive'):
+        table.compute_many([], workers=0)
+    with pytest.raises(KeyError):
+        table.compute_many([('add', 'missing', 1)], workers=2)
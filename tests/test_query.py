@@ -0,0 +1,112 @@
+# tests/test_query.py
+import pytest
+
+import vectorized
+from query import _Planner
+from table import Table, TableError, col, lit
+
+
+def _table():
+    return Table(columns=['a', 'b', 'a'], rows=[[1, 2, 10], [3, 4, 30], [5, 6, 50]],
+                 types={'a': int, 'b': int})
+
+
+def test_query_resolves_operands_like_table():
+    table = _table()
+    expected = _table()
+    expected.add('a', 1, 'c')
+    expected.add('b', lit(2), 'd')
+    expected.mul('c', col('d'), 'e')
+    expected = expected.filter_rows(expected.gr('e', 20))
+
+    result = table.query().add('a', 1, 'c').add('b', lit(2), 'd').mul('c', col('d'), 'e').gr('e', 20).collect()
+    assert result.columns == expected.columns
+    assert list(result.iter_rows()) == list(expected.iter_rows())
+
+
+@pytest.mark.parametrize('column, error', [('missing', KeyError), (7, IndexError), (1.5, TypeError)])
+def test_query_rejects_columns_like_table(column, error):
+    with pytest.raises(error) as table_error:
+        _table().add('a', col(column), 'c')
+    with pytest.raises(error) as query_error:
+        _table().query().add('a', col(column), 'c').collect()
+    assert str(query_error.value) == str(table_error.value)
+
+
+NAN = float('nan')
+
+
+def _sequential(table, steps):
+    # The same steps as Table calls one after another: every filter drops rows at once
+    for op_name, col_a, operand, result_column in steps:
+        if result_column is None:
+            table = table.filter_rows(getattr(table, op_name)(col_a, operand))
+        else:
+            getattr(table, op_name)(col_a, operand, result_column)
+    return table
+
+
+def _state(table):
+    # repr() keeps NaN comparable
+    return list(table.columns), table.get_column_types(), repr(list(table.iter_rows()))
+
+
+def _query(table, steps):
+    query = table.query()
+    for op_name, col_a, operand, result_column in steps:
+        if result_column is None:
+            getattr(query, op_name)(col_a, operand)
+        else:
+            getattr(query, op_name)(col_a, operand, result_column)
+    return query.collect()
+
+
+def _numbers(columnar, n_rows=12):
+    rows = [[i if i % 5 else None, i / 4 if i % 3 else NAN, i % 4 == 0] for i in range(n_rows)]
+    return Table(columns=['a', 'b', 'f'], rows=rows, types={'a': int, 'b': float, 'f': bool}, columnar=columnar)
+
+
+STEPS = [
+    [('add', 'a', 'b', 'c'), ('gr', 'b', 0.5, None), ('mul', 'c', lit(2), 'd'), ('ls', 'c', 8.0, None),
+     ('ne', 'a', lit(7), None)],
+    [('gr', 'a', lit(2), None), ('sub', 'b', 'a', 'b'), ('ge', 'b', -6.0, None), ('eq', 'f', lit(False), None)],
+    [('div', 'a', 'b', 'c'), ('le', 'c', 4.0, None)],
+    [('mul', 'b', 'b', 'b'), ('mul', 'b', lit(0.5), 'b'), ('gr', 'b', 1.0, None)],
+    [('eq', 'a', lit(999), None), ('add', 'a', 'b', 'c')],
+]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('steps', STEPS)
+@pytest.mark.parametrize('n_rows', [12, 0])
+def test_query_matches_sequential_calls(monkeypatch, columnar, steps, n_rows):
+    expected = _state(_sequential(_numbers(columnar, n_rows), steps))
+    assert _state(_query(_numbers(columnar, n_rows), steps)) == expected
+    monkeypatch.setattr(vectorized, 'np', None)
+    assert _state(_query(_numbers(columnar, n_rows), steps)) == expected
+
+
+def test_planner_moves_filters_ahead_of_arithmetic_they_do_not_read():
+    plan, n_new = _Planner(_numbers(False)).plan(STEPS[0])
+    assert [step for _, _, _, step in plan] == [STEPS[0][i] for i in (1, 0, 3, 4, 2)]
+    assert n_new == 2
+    plan, _ = _Planner(_numbers(False)).plan(STEPS[1])
+    # A filter never moves ahead of an earlier one, nor of the arithmetic that writes its column
+    assert [step for _, _, _, step in plan] == STEPS[1]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_arithmetic_runs_only_for_rows_passing_earlier_filters(columnar):
+    table = _numbers(columnar)
+    table.set_values([1.0] * 6 + [0.0] * 6, 'b')
+    # div fails from row 6 on, but the filter, moved ahead of it, keeps only rows 1-4
+    result = _query(table, [('div', 'a', 'b', 'c'), ('ls', 'a', lit(5), None)])
+    assert result.get_values('c') == [1.0, 2.0, 3.0, 4.0]
+    with pytest.raises(TableError) as query_error:
+        _query(table, [('div', 'a', 'b', 'c'), ('gr', 'a', lit(5), None)])
+    with pytest.raises(TableError) as table_error:
+        _sequential(table, [('gr', 'a', lit(5), None), ('div', 'a', 'b', 'c')])
+    assert str(table_error.value).startswith('div failed at row 0')
+    if not columnar:
+        # The row loop names the row of the source table
+        assert str(query_error.value).startswith('div failed at row 6')
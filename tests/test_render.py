@@ -0,0 +1,147 @@
+# tests/test_render.py
+import io
+
+import pytest
+
+import io_text
+import render
+from table import Table
+
+NAN = float('nan')
+
+
+def _reference(names, rows, widths=None):
+    # The renderer cell by cell and line by line; widths by all cells unless given
+    rows = [[render.NONE_TEXT if v is None else str(v) for v in (list(row) + [None] * len(names))[:len(names)]]
+            for row in rows]
+    if widths is None:
+        widths = [max([len(str(name))] + [len(row[i]) for row in rows]) for i, name in enumerate(names)]
+    lines = [" | ".join(str(name).ljust(w) for name, w in zip(names, widths)),
+             "-+-".join('-' * w for w in widths)]
+    lines += [" | ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows]
+    return "\n".join(lines) + "\n"
+
+
+ROWS = [[1, 'short', 2.5, True], [None, 'a much longer cell', NAN, None], [-300, '', None, False],
+        [2 ** 70, 'юникод', 1e-9, True]]
+
+
+def _table(columnar, rows=ROWS):
+    return Table(columns=['id', 'text', 'x', 'flag'], rows=rows,
+                 types={'id': int, 'text': str, 'x': float, 'flag': bool}, columnar=columnar)
+
+
+def _render(table, **kwargs):
+    out = io.StringIO()
+    render.write_table(table, out, **kwargs)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('rows', [ROWS, ROWS[:1], []])
+def test_print_table_and_io_text_match_reference(tmp_path, capsys, columnar, rows):
+    table = _table(columnar, rows)
+    expected = _reference(table.columns, list(table.iter_rows()))
+    table.print_table()
+    assert capsys.readouterr().out == expected
+    path = tmp_path / 'table.txt'
+    io_text.save_table(table, str(path))
+    assert path.read_text(encoding='utf-8') == expected
+    for chunk_rows in (1, 3):
+        assert _render(table, chunk_rows=chunk_rows) == expected
+
+
+def test_short_rows_and_empty_columns(capsys):
+    table = Table(columns=['a', 'b', 'c'], rows=[[1, 2, 3], [4, 5, 6]])
+    del table.rows[1][1:]
+    assert _render(table) == _reference(['a', 'b', 'c'], [[1, 2, 3], [4]])
+    Table().print_table()
+    assert capsys.readouterr().out == "Empty table\n"
+    assert _render(Table(), widths=[]) == "Empty table\n"
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('chunk_rows', [1, 2, 10])
+def test_streaming_widths_match_reference(columnar, chunk_rows):
+    table = _table(columnar)
+    rows = list(table.iter_rows())
+    assert _render(table, widths=[3, 5, 4, 5], chunk_rows=chunk_rows) == _reference(table.columns, rows,
+                                                                                   [3, 5, 4, 5])
+    widths = [max(len(name), len(cell)) for name, cell in zip(table.columns, ['1', 'short', '2.5', 'True'])]
+    assert _render(table, sample_rows=1, chunk_rows=chunk_rows) == _reference(table.columns, rows, widths)
+    assert _render(table, sample_rows=10, chunk_rows=chunk_rows) == _reference(table.columns, rows)
+
+
+def test_render_errors(tmp_path):
+    table = _table(False)
+    with pytest.raises(ValueError, match='chunk_rows must be positive'):
+        _render(table, chunk_rows=0)
+    with pytest.raises(ValueError, match='Got 2 widths for 4 columns'):
+        _render(table, widths=[1, 2])
+    with pytest.raises(IOError, match='Got 2 widths for 4 columns'):
+        io_text.save_table(table, str(tmp_path / 'table.txt'), widths=[1, 2])
+
+
+def _preview_reference(table, max_rows=None, max_col_width=None):
+    # The whole table rendered, then cut down to the first and last rows and clipped
+    names, rows = list(table.columns), list(table.iter_rows())
+    truncated = max_rows is not None and len(rows) > max_rows
+    if truncated:
+        n_tail = max_rows // 2
+        shown = rows[:max_rows - n_tail] + [[render.ELLIPSIS] * len(names)] + rows[len(rows) - n_tail:]
+    else:
+        shown = rows
+    if max_col_width is not None:
+        def clip(value):
+            text = render.NONE_TEXT if value is None else str(value)
+            return text if len(text) <= max_col_width else text[:max_col_width - 1] + render.CLIP_MARK
+        names = [clip(name) for name in names]
+        shown = [[clip(value) for value in row] for row in shown]
+    footer = f"[{len(rows)} rows x {len(names)} columns]\n" if truncated else ""
+    return _reference(names, shown) + footer
+
+
+def _print(capsys, table, *args):
+    table.print_table(*args)
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('max_rows', [None, 0, 1, 2, 3, 4, 10])
+@pytest.mark.parametrize('max_col_width', [None, 1, 3, 100])
+def test_preview_matches_reference(capsys, columnar, max_rows, max_col_width):
+    table = _table(columnar)
+    expected = _preview_reference(table, max_rows, max_col_width)
+    assert _print(capsys, table, max_rows, max_col_width) == expected
+    out = io.StringIO()
+    render.write_preview(table, out, max_rows, max_col_width)
+    assert out.getvalue() == expected
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_preview_without_truncation_matches_print_table(capsys, columnar):
+    table = _table(columnar)
+    assert _print(capsys, table, 4) == _print(capsys, table)
+    assert _print(capsys, table, None, 100) == _print(capsys, table)
+    empty = _table(columnar, [])
+    assert _print(capsys, empty, 0, 2) == _preview_reference(empty, 0, 2)
+    assert _print(capsys, Table(), 2) == "Empty table\n"
+
+
+def test_preview_reads_only_shown_rows(capsys, monkeypatch):
+    table = _table(False, [[i, f"text {i}", None, None] for i in range(1000)])
+    taken = []
+    take = Table._take
+    monkeypatch.setattr(Table, '_take', lambda self, positions, *args: taken.append(positions) or take(
+        self, positions, *args))
+    lines = _print(capsys, table, 3).splitlines()
+    assert taken == [[0, 1, 999]]
+    assert lines[-1] == '[1000 rows x 4 columns]' and lines[4].startswith('...')
+
+
+def test_preview_errors():
+    table = _table(False)
+    with pytest.raises(ValueError, match='max_rows must be non-negative'):
+        table.print_table(-1)
+    with pytest.raises(ValueError, match='max_col_width must be positive'):
+        table.print_table(None, 0)
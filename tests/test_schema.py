@@ -0,0 +1,26 @@
+# tests/test_schema.py
+import pickle
+
+import schema
+from schema import ColumnNames, ColumnTypes
+from table import Table
+
+
+def test_unpickled_schema_takes_fresh_versions():
+    names, types = ColumnNames(['a', 'b', 'a']), ColumnTypes({0: int})
+    restored_names, restored_types = pickle.loads(pickle.dumps((names, types)))
+    assert restored_names == names and restored_names.version != names.version
+    assert restored_names.position('a') == 0 and restored_names.position('b') == 1
+    assert restored_types == types and restored_types.version != types.version
+
+
+def test_unpickled_table_resolves_reassigned_types(monkeypatch):
+    table = Table(columns=['a'], rows=[['1']])
+    assert table.get_values('a') == ['1']
+    restored = pickle.loads(pickle.dumps(table))
+    # A new process counts versions from 1 again, so new types may get the version
+    # the pickled table had cached its resolved types for
+    monkeypatch.setattr(schema, '_versions', iter([table.types.version]))
+    restored.types = {'a': int}
+    assert restored._type_for('a') is int
+    assert restored.get_values('a') == [1]
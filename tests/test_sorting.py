@@ -0,0 +1,32 @@
+# tests/test_sorting.py
+import io_csv
+from sorting import sort_csv, sort_table
+
+
+def _write(path, lines):
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def test_sort_csv_widens_key_type_contradicted_by_later_run(tmp_path):
+    src, dst = tmp_path / 'src.csv', tmp_path / 'dst.csv'
+    _write(src, ['k,v', '3,007', '1,1e3', '2,1.50', '10,a', '1.5,x', '0,y'])
+    sort_csv(str(src), str(dst), 'k', run_rows=2)
+    assert dst.read_text(encoding='utf-8').splitlines() == [
+        'k,v', '0,y', '1,1e3', '1.5,x', '2,1.50', '3,007', '10,a']
+    assert io_csv.load_table(str(dst)).types == io_csv.load_table(str(src)).types
+
+
+def test_sort_csv_keeps_cell_text_of_single_run(tmp_path):
+    src, dst = tmp_path / 'src.csv', tmp_path / 'dst.csv'
+    _write(src, ['k,v', 'b,1.50', 'a,', 'c,007'])
+    sort_csv(str(src), str(dst), 'k', descending=True)
+    assert dst.read_text(encoding='utf-8').splitlines() == ['k,v', 'c,007', 'b,1.50', 'a,']
+
+
+def test_sort_csv_matches_sort_table_across_runs(tmp_path):
+    src, dst = tmp_path / 'src.csv', tmp_path / 'dst.csv'
+    rows = [f"{(i * 37) % 11},{i % 3},{i}" for i in range(50)]
+    _write(src, ['a,b,n'] + rows)
+    sort_csv(str(src), str(dst), ['b', 'a'], descending=[True, False], run_rows=7)
+    expected = sort_table(io_csv.load_table(str(src)), ['b', 'a'], descending=[True, False])
+    assert list(io_csv.load_table(str(dst)).iter_rows()) == list(expected.iter_rows())
@@ -0,0 +1,45 @@
+# tests/test_storage.py
+import copy
+import gc
+import pickle
+
+import pytest
+
+from storage import ColumnStore, RowStore
+from table import Table
+
+
+def _table(columnar):
+    return Table.from_columns(['a', 'b', 'c'], [[1, None, 3, 4], [0.5, 1.5, None, 3.5], ['w', 'x', 'y', None]],
+                              types={'a': int, 'b': float, 'c': str}, columnar=columnar)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_tables_pickle_after_slicing(columnar):
+    table = _table(columnar)
+    page = table.get_rows_by_number(1, 2)
+
+    restored = pickle.loads(pickle.dumps(table))
+    assert list(restored.iter_rows()) == list(table.iter_rows())
+
+    restored_page = pickle.loads(pickle.dumps(page))
+    assert isinstance(restored_page._store, ColumnStore if columnar else RowStore)
+    assert list(restored_page.iter_rows()) == [[None, 1.5, 'x'], [3, None, 'y']]
+    restored_page.set_values([7, 8], 'a')
+    assert table.get_values('a') == [1, None, 3, 4]
+
+    assert list(copy.deepcopy(page).iter_rows()) == list(page.iter_rows())
+
+    del page, restored_page
+    gc.collect()
+    assert pickle.loads(pickle.dumps(table)).row_count() == 4
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_page_is_independent_of_writes(columnar):
+    table = _table(columnar)
+    page = table.get_rows_by_number(0, 1)
+    table.set_values([9, 9, 9, 9], 'a')
+    assert page.get_values('a') == [1, None]
+    page.set_values(['p', 'q'], 'c')
+    assert table.get_values('c') == ['w', 'x', 'y', None]
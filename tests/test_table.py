@@ -0,0 +1,74 @@
+# tests/test_table.py
+import pytest
+
+from table import ColumnTypeError, Table, TableError
+
+
+def test_rows_setter_keeps_columnar_storage():
+    table = Table(columns=['a', 'b'], rows=[[1, 2.0], [3, 4.0]], types={'a': int, 'b': float}, columnar=True)
+    table.rows = [[5, 6.0], [7, 8.0], [9, 10.0]]
+    assert table.columnar
+    assert table.get_column_buffer('a').typecode == 'q'
+    assert table.get_values('b') == [6.0, 8.0, 10.0]
+
+
+def test_rows_setter_keeps_row_storage():
+    table = Table(columns=['a'], rows=[[1]], types={'a': int})
+    table.rows = [[2], [3]]
+    assert not table.columnar
+    assert table.get_values('a') == [2, 3]
+
+
+NAN = float('nan')
+
+
+def _per_cell(table, values, to_type):
+    # The reference: _convert_value cell by cell, reporting the first failing row
+    result = []
+    for i, value in enumerate(values):
+        try:
+            result.append(table._convert_value(value, to_type))
+        except ColumnTypeError as e:
+            return f"Row {i}: {e}"
+    return repr(result)
+
+
+def _bulk(table, values, to_type):
+    try:
+        return repr(table._convert_values(values, to_type))
+    except ColumnTypeError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize('to_type', [int, float, bool, str])
+@pytest.mark.parametrize('values', [
+    [],
+    [None, None],
+    ['1', ' 2 ', None, '-3', '+4'],
+    ['1.5', '2e3', 'nan', None, '-inf'],
+    [1, 2.7, None, True, NAN],
+    [' True', 'false ', 'YES', None, 'n', '0'],
+    ['1', 'x', None, '2'],
+    ['true', 'maybe'],
+    [b'1', None],
+    [1, 'a', 2.5, None, [1]],
+])
+def test_bulk_conversion_matches_per_cell(values, to_type):
+    table = Table(columns=['a'], rows=[])
+    assert _bulk(table, values, to_type) == _per_cell(table, values, to_type)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_column_conversion_reports_first_failing_row(columnar):
+    table = Table(columns=['a', 'b'], rows=[['1', 1], [None, 2], ['2.5', 3], ['x', 4]],
+                  types={'b': int}, columnar=columnar)
+    with pytest.raises(ColumnTypeError, match='Row 2, column a:'):
+        table.set_column_types({'a': int}, by_number=False)
+    with pytest.raises(ColumnTypeError, match='Row 3, column 0:'):
+        table.set_column_types({0: float})
+    assert table.get_values('a') == ['1', None, '2.5', 'x']
+    with pytest.raises(ColumnTypeError, match='^Row 1: '):
+        table.set_values([1, 'y', 3, 4], 'b')
+    table.types = {'a': float, 'b': int}
+    with pytest.raises(TableError, match='gr failed at row 3'):
+        table.gr('a', 1.0)
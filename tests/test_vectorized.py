@@ -0,0 +1,91 @@
+# tests/test_vectorized.py
+import pytest
+
+import vectorized
+from table import Table, TableError, lit
+
+pytestmark = pytest.mark.skipif(not vectorized.available(), reason='NumPy is not installed')
+
+NAN = float('nan')
+BIG = 2 ** 53 + 1
+
+
+def _table(columnar, rows=None):
+    if rows is None:
+        rows = [[1, 0.5, BIG], [None, 2.0, 3], [3, NAN, None], [4, 0.0, -BIG], [-5, None, 7]]
+    return Table(columns=['a', 'b', 'c'], rows=rows, types={'a': int, 'b': float, 'c': int}, columnar=columnar)
+
+
+def _run(table, method, *args):
+    try:
+        result = getattr(table, method)(*args)
+    except TableError as e:
+        return 'error', str(e)
+    # repr() keeps NaN comparable
+    return repr(list(result))
+
+
+def _paths(monkeypatch, method, *args, rows=None):
+    fast = _run(_table(True, rows), method, *args)
+    row_store = _run(_table(False, rows), method, *args)
+    monkeypatch.setattr(vectorized, 'np', None)
+    columnar_loop = _run(_table(True, rows), method, *args)
+    return fast, row_store, columnar_loop
+
+
+@pytest.mark.parametrize('method', ['add', 'sub', 'mul', 'div'])
+@pytest.mark.parametrize('operand', ['b', 'c', lit(2), 0.25, -3])
+def test_arithmetic_matches_row_loop(monkeypatch, method, operand):
+    fast, row_store, columnar_loop = _paths(monkeypatch, method, 'a', operand)
+    assert fast == row_store == columnar_loop
+
+
+@pytest.mark.parametrize('method', ['eq', 'gr', 'ls', 'ge', 'le', 'ne'])
+@pytest.mark.parametrize('column, operand', [('a', 'b'), ('a', 'c'), ('c', 'b'), ('a', lit(2)), ('a', 3.0),
+                                             ('b', NAN), ('c', float(BIG)), ('a', lit(2 ** 70)), ('a', None)])
+def test_comparisons_match_row_loop(monkeypatch, method, column, operand):
+    fast, row_store, columnar_loop = _paths(monkeypatch, method, column, operand)
+    assert fast == row_store == columnar_loop
+
+
+@pytest.mark.parametrize('operand', ['b', lit(0), 0.0])
+def test_division_by_zero_reports_first_row(monkeypatch, operand):
+    fast, row_store, columnar_loop = _paths(monkeypatch, 'div', 'a', operand)
+    assert fast == row_store == columnar_loop
+    assert fast[0] == 'error'
+    assert 'div failed at row 3' in fast[1] if operand == 'b' else 'div failed at row 0' in fast[1]
+
+
+def test_unconvertible_scalar_reports_first_row_with_value(monkeypatch):
+    rows = [[None, 1.0, 1], [2, 1.0, 1]]
+    fast, row_store, columnar_loop = _paths(monkeypatch, 'add', 'a', 'x1', rows=rows)
+    assert fast == row_store == columnar_loop
+    assert fast[0] == 'error' and 'add failed at row 1' in fast[1]
+
+
+@pytest.mark.parametrize('method, operand', [('add', 'b'), ('div', lit(0)), ('gr', 'c'), ('eq', lit(1))])
+def test_empty_tables_match_row_loop(monkeypatch, method, operand):
+    fast, row_store, columnar_loop = _paths(monkeypatch, method, 'a', operand, rows=[])
+    assert fast == row_store == columnar_loop == '[]'
+
+
+@pytest.mark.parametrize('rows', [[[None, None, None], [None, None, None]], []])
+def test_result_column_types_match_row_loop(monkeypatch, rows):
+    def stored(table):
+        table.mul('a', 'b', 'd')
+        return table.types['d'], repr(table.get_values('d'))
+
+    fast = stored(_table(True, rows))
+    monkeypatch.setattr(vectorized, 'np', None)
+    assert fast == stored(_table(False, rows)) == stored(_table(True, rows))
+
+
+def test_typed_columns_take_numpy_path(monkeypatch):
+    calls = []
+    for name in ('binary_op', 'compare'):
+        original = getattr(vectorized, name)
+        monkeypatch.setattr(vectorized, name, lambda *args, _f=original: calls.append(args[0]) or _f(*args))
+    table = _table(True)
+    table.mul('a', 'b')
+    table.ge('a', 'c')
+    assert calls == ['mul', 'ge']
@@ -0,0 +1,239 @@
+# vectorized.py
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mask import Mask
+from storage import Column
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: Table falls back to the pure Python loops
+    np = None
+
+# Largest integer magnitude that float64 represents exactly
+_EXACT_INT = 2 ** 53
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+_DTYPES = {'q': 'int64', 'd': 'float64', 'b': 'int8'}
+
+_ARITHMETIC = {
+    'add': 'add',
+    'sub': 'subtract',
+    'mul': 'multiply',
+    'div': 'true_divide',
+}
+
+_COMPARISONS = {
+    'eq': 'equal',
+    'gr': 'greater',
+    'ls': 'less',
+    'ge': 'greater_equal',
+    'le': 'less_equal',
+    'ne': 'not_equal',
+}
+
+
+class VectorizedError(Exception):
+    """
+    Ошибка в строке row_index, которую Table превращает в TableError
+    с тем же текстом, что и построчный вариант операции.
+    """
+    def __init__(self, row_index: int, cause: Exception):
+        super().__init__(str(cause))
+        self.row_index = row_index
+        self.cause = cause
+
+
+def available() -> bool:
+    return np is not None
+
+
+def as_arrays(column: Column) -> Tuple[Any, Optional[Any]]:
+    """
+    Представляет типизированный Column как (значения, маска None) без копирования буферов.
+    """
+    dtype = _DTYPES[column.typecode]
+    if not len(column):
+        return np.empty(0, dtype=dtype), None
+    values = np.frombuffer(column.data, dtype=dtype)
+    nulls = np.frombuffer(column.nulls, dtype=bool) if column.nulls is not None else None
+    return values, nulls
+
+
+def _merge_nulls(nulls_a, nulls_b):
+    if nulls_a is None:
+        return nulls_b
+    if nulls_b is None:
+        return nulls_a
+    return nulls_a | nulls_b
+
+
+def _first_valid_row(nulls, n: int) -> Optional[int]:
+    if nulls is None:
+        return 0 if n else None
+    valid = np.flatnonzero(~nulls)
+    return int(valid[0]) if len(valid) else None
+
+
+def _exceeds_float_precision(values) -> bool:
+    return values.dtype == np.int64 and len(values) and int(np.abs(values).max()) > _EXACT_INT
+
+
+def binary_op(op_name: str, col_a: Column, col_b: Optional[Column], scalar: Any = None) -> Optional[Column]:
+    """
+    Арифметика над столбцами в одном вызове NumPy.
+    - возвращает Column типа float с картой None, как построчный вариант
+    - возвращает None, если операцию нельзя векторизовать
+    - деление на ноль в непустой строке -> VectorizedError с номером первой такой строки
+    """
+    ufunc_name = _ARITHMETIC.get(op_name)
+    if ufunc_name is None:
+        return None
+
+    values_a, nulls_a = as_arrays(col_a)
+    n = len(values_a)
+    if col_b is not None:
+        values_b, nulls_b = as_arrays(col_b)
+        nulls = _merge_nulls(nulls_a, nulls_b)
+        right = values_b.astype(np.float64)
+    else:
+        nulls = nulls_a
+        try:
+            right = float(scalar)
+        except Exception as e:
+            row = _first_valid_row(nulls, n)
+            if row is not None:
+                raise VectorizedError(row, e) from e
+            right = 0.0
+
+    left = values_a.astype(np.float64)
+    if op_name == 'div':
+        zero = right == 0
+        if col_b is not None:
+            if nulls is not None:
+                zero &= ~nulls
+            zero_rows = np.flatnonzero(zero)
+            if len(zero_rows):
+                raise VectorizedError(int(zero_rows[0]), ZeroDivisionError("Division by zero"))
+        elif zero:
+            row = _first_valid_row(nulls, n)
+            if row is not None:
+                raise VectorizedError(row, ZeroDivisionError("Division by zero"))
+
+    with np.errstate(all='ignore'):
+        result = getattr(np, ufunc_name)(left, right)
+    if nulls is not None:
+        result[nulls] = 0.0
+
+    data = array('d')
+    data.frombytes(memoryview(result).cast('B'))
+    null_map = bytearray(memoryview(nulls).cast('B')) if nulls is not None and nulls.any() else None
+    return Column('d', data, null_map)
+
+
+def compare(op_name: str, col_a: Column, col_b: Optional[Column], scalar: Any = None) -> Optional[Mask]:
+    """
+    Сравнение столбца со столбцом или числом в одном вызове NumPy.
+    - None в любой из сторон даёт False
+    - возвращает None, если операцию нельзя векторизовать без потери точности
+    """
+    ufunc_name = _COMPARISONS.get(op_name)
+    if ufunc_name is None:
+        return None
+
+    values_a, nulls = as_arrays(col_a)
+    if col_b is not None:
+        right, nulls_b = as_arrays(col_b)
+        nulls = _merge_nulls(nulls, nulls_b)
+        if values_a.dtype != right.dtype and np.float64 in (values_a.dtype, right.dtype):
+            if _exceeds_float_precision(values_a) or _exceeds_float_precision(right):
+                return None
+    else:
+        if not isinstance(scalar, (int, float)):
+            return None
+        if isinstance(scalar, int) and not isinstance(scalar, bool):
+            if not _INT64_MIN <= scalar <= _INT64_MAX:
+                return None
+        if isinstance(scalar, float) and _exceeds_float_precision(values_a):
+            return None
+        right = scalar
+
+    with np.errstate(all='ignore'):
+        result = getattr(np, ufunc_name)(values_a, right)
+    if nulls is not None:
+        result &= ~nulls
+    # A NumPy bool array is already one 0/1 byte per row
+    return Mask._wrap(bytearray(result.tobytes()))
+
+
+def group_aggregates(column: Column, group_ids: Sequence[int], n_groups: int,
+                     aggs: Iterable[str]) -> Optional[Dict[str, List[Any]]]:
+    """
+    Агрегаты sum/mean/min/max/count столбца по группам; group_ids — номер группы каждой строки.
+    - None пропускаются; у группы без значений count = 0, остальные агрегаты None
+    - возвращает None, если результат может разойтись с построчным (NaN, выход за int64)
+    """
+    values, nulls = as_arrays(column)
+    ids = np.asarray(group_ids, dtype=np.intp)
+    if nulls is not None:
+        valid = ~nulls
+        values, ids = values[valid], ids[valid]
+    if values.dtype == np.float64 and np.isnan(values).any():
+        return None
+
+    aggs = set(aggs)
+    counts = np.bincount(ids, minlength=n_groups).tolist()
+    empty = [count == 0 for count in counts]
+    result: Dict[str, List[Any]] = {'count': counts}
+
+    if aggs & {'sum', 'mean'}:
+        if values.dtype == np.float64:
+            sums = np.bincount(ids, weights=values, minlength=n_groups).tolist()
+        else:
+            wide = values.astype(np.int64)
+            if len(wide) and max(-int(wide.min()), int(wide.max())) * len(wide) > _INT64_MAX:
+                return None
+            total = np.zeros(n_groups, dtype=np.int64)
+            np.add.at(total, ids, wide)
+            sums = total.tolist()
+        result['sum'] = [None if e else s for s, e in zip(sums, empty)]
+        result['mean'] = [None if e else s / c for s, c, e in zip(sums, counts, empty)]
+
+    for name, ufunc in (('min', np.minimum), ('max', np.maximum)):
+        if name not in aggs:
+            continue
+        if values.dtype == np.float64:
+            start = np.inf if name == 'min' else -np.inf
+        else:
+            info = np.iinfo(values.dtype)
+            start = info.max if name == 'min' else info.min
+        extreme = np.full(n_groups, start, dtype=values.dtype)
+        ufunc.at(extreme, ids, values)
+        extremes = extreme.tolist()
+        if column.typecode == 'b':
+            extremes = list(map(bool, extremes))
+        result[name] = [None if e else v for v, e in zip(extremes, empty)]
+    return result
+
+
+def sort_positions(column: Column, order: Sequence[int], descending: bool = False) -> List[int]:
+    """
+    Стабильно переставляет номера строк order по значениям column; None и NaN — в конце.
+    """
+    values, nulls = as_arrays(column)
+    order = np.asarray(order, dtype=np.intp)
+    keys = values[order]
+    missing = nulls[order] if nulls is not None else None
+    if keys.dtype == np.float64:
+        nan = np.isnan(keys)
+        missing = nan if missing is None else missing | nan
+    tail = order[:0]
+    if missing is not None and missing.any():
+        tail = order[missing]
+        order, keys = order[~missing], keys[~missing]
+    if descending:
+        # Stable descending order: ascending order of the reversed keys, read backwards
+        ranks = (len(keys) - 1 - np.argsort(keys[::-1], kind='stable'))[::-1]
+    else:
+        ranks = np.argsort(keys, kind='stable')
+    return np.concatenate([order[ranks], tail]).tolist()